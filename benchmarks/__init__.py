@@ -0,0 +1,59 @@
+import os
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Game, Deck, card_lookup
+from hearthbreaker.sim import DeckList
+
+_DECK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def deck_lists():
+    """
+    Load the example and zoo decks which the benchmarks play games with
+
+    :rtype: list[hearthbreaker.sim.DeckList]
+    """
+    return [DeckList.from_file(os.path.join(_DECK_DIR, "example.hsdeck")),
+            DeckList.from_file(os.path.join(_DECK_DIR, "zoo.hsdeck"))]
+
+
+def middle_game(seed, turns):
+    """
+    Play a game between the example and zoo decks with random agents for ``turns`` turns, and return it
+
+    :param int seed: The seed for the game's random numbers
+    :param int turns: The number of turns to play
+    :rtype: hearthbreaker.game_objects.Game
+    """
+    game = Game([deck_list.create_deck() for deck_list in deck_lists()], [RandomAgent(), RandomAgent()], seed)
+    game.pre_game()
+    game.current_player = game.players[1]
+    for turn in range(turns):
+        game.play_single_turn()
+        if game.game_ended:
+            break
+    return game
+
+
+#: A board of minions with auras which affect each other and the minions next to them
+AURA_BOARD = ["Dire Wolf Alpha", "Raid Leader", "Stormwind Champion", "Flametongue Totem", "Murloc Warleader",
+              "Dire Wolf Alpha"]
+
+
+def board_game(minions):
+    """
+    Create a game where both players have the given minions on the board, after the first turn
+
+    :param list[str] minions: The names of the minions to put on each player's board
+    :rtype: hearthbreaker.game_objects.Game
+    """
+    decks = [Deck([card_lookup("Bloodfen Raptor") for i in range(0, 30)], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+    game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 0)
+    game.pre_game()
+    game.current_player = game.players[1]
+    game.play_single_turn()
+    for player in game.players:
+        for index, name in enumerate(minions):
+            card_lookup(name).summon(player, game, index)
+    return game
@@ -0,0 +1,185 @@
+import argparse
+import datetime
+import importlib
+import json
+import multiprocessing
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+import timeit
+
+import benchmarks
+
+__doc__ = """
+Runs the benchmark modules in this package, and writes their results as JSON along with a description of the machine
+and commit they were run on, so that results can be compared across commits.
+
+Each module has a ``run`` function returning a dictionary of results, and a ``UNIT`` saying what they are measured
+in.  With ``--repeat``, each module is run several times and the median of each result is kept.
+
+Running the benchmarks
+~~~~~~~~~~~~~~~~~~~~~~
+
+From the command line: ::
+
+    python -m benchmarks --output before.json
+    # ... change the engine ...
+    python -m benchmarks --output after.json --compare before.json
+    python -m benchmarks games copying --repeat 5
+"""
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def module_names():
+    """
+    Find the names of the benchmark modules in this package
+
+    :rtype: list[str]
+    """
+    return sorted(name for finder, name, is_package in pkgutil.iter_modules(benchmarks.__path__)
+                  if not name.startswith("_"))
+
+
+def _git(*args):
+    try:
+        return subprocess.check_output(("git",) + args, cwd=_ROOT, stderr=subprocess.DEVNULL).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """
+    Describe the machine, interpreter and commit the benchmarks are being run on
+
+    :rtype: dict
+    """
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "modified": bool(status) if status is not None else None,
+        "time": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def run_module(name, repeat=1):
+    """
+    Run a benchmark module
+
+    :param str name: The name of the module, within this package
+    :param int repeat: The number of times to run the module.  The median of each result is kept.
+    :return: The unit of the results, the results by benchmark name, and the time taken to run the module in seconds
+    :rtype: dict
+    """
+    module = importlib.import_module("benchmarks." + name)
+    start_time = timeit.default_timer()
+    runs = [module.run() for i in range(repeat)]
+    return {
+        "unit": module.UNIT,
+        "results": dict((result, _median([values[result] for values in runs])) for result in runs[0]),
+        "duration": timeit.default_timer() - start_time,
+    }
+
+
+def run_all(names, repeat=1, callback=None):
+    """
+    Run a set of benchmark modules
+
+    :param list[str] names: The names of the modules to run
+    :param int repeat: The number of times to run each module
+    :param function callback: If present, called with the name of each module and its results once it has run
+    :return: The environment the benchmarks were run in, and the results of each module by its name
+    :rtype: dict
+    """
+    results = {"environment": environment(), "benchmarks": {}}
+    for name in names:
+        results["benchmarks"][name] = run_module(name, repeat)
+        if callback:
+            callback(name, results["benchmarks"][name])
+    return results
+
+
+def compare(old, new):
+    """
+    Compare two sets of results from :func:`run_all`
+
+    :param dict old: The results to compare against
+    :param dict new: The new results
+    :return: The lines of a table with the change in each result found in both, as a percentage of the old result.
+             Positive changes are improvements, whether the unit is a time, a size or a rate.
+    :rtype: list[str]
+    """
+    lines = []
+    for module_name, module in sorted(new["benchmarks"].items()):
+        old_module = old["benchmarks"].get(module_name)
+        if old_module is None or old_module["unit"] != module["unit"]:
+            continue
+        higher_is_better = module["unit"].endswith("/s")
+        for name, value in sorted(module["results"].items()):
+            old_value = old_module["results"].get(name)
+            if not old_value or not value:
+                continue
+            if higher_is_better:
+                change = value / old_value - 1
+            else:
+                change = old_value / value - 1
+            lines.append("{0:<45} {1:>12.4g} {2:>12.4g} {3:>+8.1%}".format(module_name + "." + name, old_value,
+                                                                           value, change))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Run the benchmarks, and write their results as JSON")
+    parser.add_argument("modules", nargs="*", metavar="MODULE",
+                        help="The benchmark modules to run (default: all of them), from: " + ", ".join(
+                            module_names()))
+    parser.add_argument("-o", "--output", default=None,
+                        help="The file to write the results to (default: standard output)")
+    parser.add_argument("-r", "--repeat", type=int, default=1,
+                        help="The number of times to run each module, keeping the median of each result")
+    parser.add_argument("-c", "--compare", default=None, metavar="FILE",
+                        help="Results from an earlier run to compare these results with")
+    args = parser.parse_args(argv)
+
+    for name in args.modules:
+        if name not in module_names():
+            parser.error("Unknown benchmark module {0}".format(name))
+
+    def print_progress(name, module):
+        sys.stderr.write("{0:<12} {1:6.1f}s\n".format(name, module["duration"]))
+
+    results = run_all(args.modules or module_names(), args.repeat, print_progress)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if args.compare is not None:
+        with open(args.compare) as old_file:
+            old = json.load(old_file)
+        sys.stderr.write("{0:<45} {1:>12} {2:>12} {3:>8}\n".format("benchmark", "old", "new", "change"))
+        for line in compare(old, results):
+            sys.stderr.write(line + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import timeit
+
+from benchmarks import middle_game
+from hearthbreaker.agents.trade_agent import TradeAgent
+
+__doc__ = """
+Benchmarks for how long :class:`hearthbreaker.agents.trade_agent.TradeAgent` takes to decide on and play out a turn,
+from fixed positions in the middle of a game.
+
+Run with ``python -m benchmarks.agents``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def trade_agent_turn(turns, number=20, positions=5):
+    """
+    Time a :class:`TradeAgent` playing a turn, after the given number of turns have been played with random agents
+
+    :param int turns: The number of turns to play before the agent's turn
+    :param int number: The number of times to play the turn from each position
+    :param int positions: The number of positions to play from
+    """
+    total = 0.0
+    played = 0
+    for seed in range(positions):
+        game = middle_game(seed, turns)
+        if game.game_ended:
+            continue
+        for i in range(number):
+            position = game.copy()
+            position._start_turn()
+            agent = position.current_player.agent = TradeAgent()
+            agent.set_game(position)
+            start_time = timeit.default_timer()
+            agent.do_turn(position.current_player)
+            total += timeit.default_timer() - start_time
+            played += 1
+    return total / played
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "trade_agent_turn_3": trade_agent_turn(3),
+        "trade_agent_turn_8": trade_agent_turn(8),
+        "trade_agent_turn_12": trade_agent_turn(12),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}ms".format(name, seconds * 1000))
@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+import timeit
+
+from benchmarks import deck_lists
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.game_objects import Game
+from hearthbreaker.replay import ReplayArchive, record
+
+__doc__ = """
+Benchmarks for :class:`hearthbreaker.replay.ReplayArchive`, measuring how quickly replays can be added to an archive,
+indexed when it is opened, and read back in a random order.
+
+Run with ``python -m benchmarks.archive``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def _replays(count):
+    replays = []
+    for seed in range(count):
+        game = Game([deck_list.create_deck() for deck_list in deck_lists()], [RandomAgent(), RandomAgent()], seed)
+        replays.append(record(game))
+        game.start()
+    return replays
+
+
+def archive_times(replay_count=20, copies=50, reads=200):
+    """
+    Time adding replays to an archive, opening it again, and reading replays at random from it
+
+    :param int replay_count: The number of different games to play
+    :param int copies: The number of times each game is added to the archive
+    :param int reads: The number of replays to read
+    :return: The time taken to add a replay, the time taken to open the archive divided by the number of replays in
+             it, and the time taken to read a replay, in seconds
+    :rtype: (float, float, float)
+    """
+    replays = _replays(replay_count)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "benchmark.hsarchive")
+        with ReplayArchive(filename) as archive:
+            def append():
+                for index, replay in enumerate(replays * copies):
+                    archive.append(replay, ("example", "zoo"), index % 2)
+            append_time = timeit.timeit(append, number=1) / (replay_count * copies)
+
+        start = timeit.default_timer()
+        archive = ReplayArchive(filename)
+        open_time = (timeit.default_timer() - start) / len(archive)
+        try:
+            game_ids = [random.randrange(len(archive)) for index in range(reads)]
+            read_time = timeit.timeit(lambda: [archive.get(game_id) for game_id in game_ids], number=1) / reads
+        finally:
+            archive.close()
+    return append_time, open_time, read_time
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    append_time, open_time, read_time = archive_times()
+    return {
+        "append_replay": append_time,
+        "index_replay_on_open": open_time,
+        "read_random_replay": read_time,
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
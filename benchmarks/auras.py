@@ -0,0 +1,78 @@
+import timeit
+
+from benchmarks import board_game, AURA_BOARD
+from hearthbreaker.game_objects import card_lookup
+from hearthbreaker.tags.base import Aura
+
+__doc__ = """
+Benchmarks for keeping auras up to date, which happens whenever a temporary buff wears off or a minion enters or
+leaves the board.
+
+Run with ``python -m benchmarks.auras``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def expire_buffs(minions, number=500):
+    """
+    Time giving each of the current player's minions +2 attack for the turn, and then ending the turn so that the
+    buffs wear off
+    """
+    game = board_game(minions)
+    player = game.current_player
+
+    def buff_and_expire():
+        for minion in player.minions:
+            minion.change_temp_attack(2)
+        player.trigger("turn_ended")
+
+    return timeit.timeit(buff_and_expire, number=number) / number
+
+
+def _summon_and_remove(game):
+    player = game.current_player
+    card_lookup("Chillwind Yeti").summon(player, game, 3)
+    player.minions[3].remove_from_board()
+
+
+def summon_and_remove(minions, number=500):
+    """
+    Time summoning a minion into the middle of the current player's board and then removing it again
+    """
+    game = board_game(minions)
+    return timeit.timeit(lambda: _summon_and_remove(game), number=number) / number
+
+
+def matches_per_summon_and_remove(minions):
+    """
+    Count the number of times auras are checked against a minion while summoning a minion into the middle of the
+    current player's board and then removing it again
+    """
+    game = board_game(minions)
+    start = Aura.match_count
+    _summon_and_remove(game)
+    return Aura.match_count - start
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "expire_buffs_with_auras": expire_buffs(["Dire Wolf Alpha", "Raid Leader", "Stormwind Champion",
+                                                 "Dire Wolf Alpha", "Raid Leader", "Stormwind Champion",
+                                                 "Dire Wolf Alpha"]),
+        "expire_buffs_without_auras": expire_buffs(["Chillwind Yeti"] * 7),
+        "summon_and_remove_with_auras": summon_and_remove(AURA_BOARD),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
+    print("{0:<30} {1:8d}".format("matches_per_summon_and_remove", matches_per_summon_and_remove(AURA_BOARD)))
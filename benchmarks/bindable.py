@@ -0,0 +1,87 @@
+import timeit
+
+from hearthbreaker.game_objects import Bindable
+
+__doc__ = """
+Micro-benchmarks for :class:`hearthbreaker.game_objects.Bindable`, the event system that every game event is
+dispatched through.
+
+Run with ``python -m benchmarks.bindable``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def _handler(*args):
+    pass
+
+
+def trigger_unbound(number=200000):
+    """
+    Time triggering an event which has no handlers bound to it, which is the case for most events in a game
+    """
+    target = Bindable()
+    target.bind("other_event", _handler)
+    return timeit.timeit(lambda: target.trigger("damaged", 1, None), number=number) / number
+
+
+def trigger_bound(handler_count, number=100000):
+    """
+    Time triggering an event with ``handler_count`` handlers bound to it
+    """
+    target = Bindable()
+    for i in range(handler_count):
+        target.bind("damaged", _handler)
+    return timeit.timeit(lambda: target.trigger("damaged", 1, None), number=number) / number
+
+
+def bind_once_and_trigger(number=100000):
+    """
+    Time binding a handler once, and then triggering it, as happens with every minion death
+    """
+    target = Bindable()
+    target.bind("died", _handler)
+
+    def bind_and_trigger():
+        target.bind_once("died", _handler)
+        target.trigger("died", None)
+
+    return timeit.timeit(bind_and_trigger, number=number) / number
+
+
+def bind_and_unbind(handler_count, number=100000):
+    """
+    Time binding and then unbinding a handler on an event with ``handler_count`` other handlers bound to it
+    """
+    target = Bindable()
+    for i in range(handler_count):
+        target.bind("turn_ended", lambda: None)
+
+    def bind_and_unbind_handler():
+        target.bind("turn_ended", _handler)
+        target.unbind("turn_ended", _handler)
+
+    return timeit.timeit(bind_and_unbind_handler, number=number) / number
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "trigger_unbound": trigger_unbound(),
+        "trigger_1_handler": trigger_bound(1),
+        "trigger_5_handlers": trigger_bound(5),
+        "trigger_20_handlers": trigger_bound(20),
+        "bind_once_and_trigger": bind_once_and_trigger(),
+        "bind_and_unbind_5_handlers": bind_and_unbind(5),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
@@ -0,0 +1,46 @@
+import timeit
+
+from benchmarks import middle_game
+from hearthbreaker.constants import MINION_TYPE
+from hearthbreaker.tags.base import CardQuery
+from hearthbreaker.tags.condition import IsMinion, ManaCost, MinionIsType, IsWeapon
+
+__doc__ = """
+Benchmarks for generating random cards from the collection, as cards such as Webspinner, Lord Jaraxxus's summons and
+Unstable Ghoul's neighbours do.
+
+Run with ``python -m benchmarks.cards``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def random_card(conditions, number=200):
+    """
+    Time choosing a random card which meets the given conditions from the collection
+    """
+    game = middle_game(0, 4)
+    query = CardQuery(conditions=conditions)
+    player = game.current_player
+    return timeit.timeit(lambda: query.get_card(player), number=number) / number
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "random_minion": random_card([IsMinion()]),
+        "random_two_mana_minion": random_card([ManaCost(2), IsMinion()]),
+        "random_beast": random_card([MinionIsType(MINION_TYPE.BEAST)]),
+        "random_weapon": random_card([IsWeapon()]),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
@@ -0,0 +1,67 @@
+import copy
+import timeit
+
+from benchmarks import middle_game
+
+__doc__ = """
+Benchmarks for :meth:`hearthbreaker.game_objects.Game.copy`, which search agents call for every position they look at,
+from fixed positions at several points in a game.
+
+Run with ``python -m benchmarks.copying``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def copy_game(turns, number=200, positions=5):
+    """
+    Time copying a game, after the given number of turns have been played
+
+    :param int turns: The number of turns to play before copying
+    :param int number: The number of copies to make of each position
+    :param int positions: The number of positions to copy
+    """
+    total = 0.0
+    for seed in range(positions):
+        game = middle_game(seed, turns)
+        total += timeit.timeit(game.copy, number=number)
+    return total / (number * positions)
+
+
+def deep_copy_tags(turns, number=200, positions=5):
+    """
+    Time deep copying the effects, auras and deathrattles of the minions on the board, which is what copying a game
+    used to involve, for comparison with :func:`copy_game`
+
+    :param int turns: The number of turns to play before copying
+    :param int number: The number of copies to make of each position
+    :param int positions: The number of positions to copy
+    """
+    total = 0.0
+    for seed in range(positions):
+        game = middle_game(seed, turns)
+        tags = [tag for player in game.players for minion in player.minions
+                for tag in minion.effects + minion.auras + minion.deathrattle]
+        total += timeit.timeit(lambda: [copy.deepcopy(tag) for tag in tags], number=number)
+    return total / (number * positions)
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "copy_at_start": copy_game(0),
+        "copy_after_6_turns": copy_game(6),
+        "copy_after_12_turns": copy_game(12),
+        "deep_copy_tags_after_12_turns": deep_copy_tags(12),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
@@ -0,0 +1,66 @@
+import timeit
+
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Game, Deck, card_lookup
+
+__doc__ = """
+Benchmarks for drawing cards, both on their own and in games between decks built around Gadgetzan Auctioneer and
+Northshire Cleric, which draw a card for each spell cast or minion healed.
+
+Run with ``python -m benchmarks.draw``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+_DRAW_DECK = ["Northshire Cleric", "Gadgetzan Auctioneer", "Power Word: Shield", "Circle of Healing", "Inner Fire",
+              "Holy Nova", "Loot Hoarder", "Novice Engineer", "Arcane Intellect", "Chillwind Yeti"]
+
+
+def _draw_decks():
+    return [Deck([card_lookup(name) for name in _DRAW_DECK * 3], CHARACTER_CLASS.PRIEST) for i in range(0, 2)]
+
+
+def draw_deck(number=500):
+    """
+    Time drawing every card from a thirty card deck
+    """
+    game = Game(_draw_decks(), [RandomAgent(), RandomAgent()], 0)
+    cards = [card_lookup(name) for name in _DRAW_DECK * 3]
+
+    def draw():
+        deck = Deck(cards, CHARACTER_CLASS.PRIEST)
+        while deck.can_draw():
+            deck.draw(game)
+
+    return timeit.timeit(draw, number=number) / number
+
+
+def draw_heavy_games(games=20):
+    """
+    Time playing games between two decks built to draw cards, with random agents
+    """
+    def play():
+        for seed in range(games):
+            Game(_draw_decks(), [RandomAgent(), RandomAgent()], seed).start()
+
+    return timeit.timeit(play, number=1) / games
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "draw_deck": draw_deck(),
+        "draw_heavy_game": draw_heavy_games(),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:10.3f}us".format(name, seconds * 1000000))
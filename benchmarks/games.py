@@ -0,0 +1,52 @@
+import timeit
+
+from benchmarks import deck_lists
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.game_objects import Game
+
+__doc__ = """
+Benchmarks for playing whole games with random agents, between each pairing of the example deck (a mage deck of
+mid-range minions and spells) and the zoo deck (a warlock deck of cheap minions).
+
+Run with ``python -m benchmarks.games``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def random_games(first, second, games=50):
+    """
+    Time playing games between two decks with random agents, each game with a different fixed seed
+
+    :param int first: The index of the first player's deck in :func:`benchmarks.deck_lists`
+    :param int second: The index of the second player's deck
+    :param int games: The number of games to play
+    """
+    decks = deck_lists()
+    total = 0.0
+    for seed in range(games):
+        game = Game([decks[first].create_deck(), decks[second].create_deck()], [RandomAgent(), RandomAgent()], seed)
+        start_time = timeit.default_timer()
+        game.start()
+        total += timeit.default_timer() - start_time
+    return total / games
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "example_mirror": random_games(0, 0),
+        "zoo_mirror": random_games(1, 1),
+        "example_vs_zoo": random_games(0, 1),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:10.3f}ms".format(name, seconds * 1000))
@@ -0,0 +1,87 @@
+import json
+import timeit
+import unittest
+
+from benchmarks import middle_game, board_game, AURA_BOARD
+from hearthbreaker.game_objects import Game
+
+__doc__ = """
+Benchmarks for loading games from JSON, as the serialization tests and replays do.  Most of the time goes into
+creating the tags on each minion and player again.
+
+The games loaded are those saved by the serialization tests in ``tests/serialization_tests.py``, along with games
+part of the way through and a board full of auras.
+
+Run with ``python -m benchmarks.loading``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "loads/s"
+
+
+def _save_object(o):
+    return o.__to_json__()
+
+
+def _save_game(game):
+    return json.loads(json.dumps(game, default=_save_object)), [player.agent for player in game.players]
+
+
+def serialization_fixtures():
+    """
+    Save each game which the serialization tests load.  Those tests run the copying tests, but copy each game by
+    saving it to JSON and loading it again, so the games are found by running the copying tests and saving each game
+    as it is copied.
+
+    :return: The JSON for each game, already parsed, and the agents to load it with
+    :rtype: list[(dict, list)]
+    """
+    import tests.copy_tests
+
+    saved = []
+    old_copy = Game.copy
+
+    def saving_copy(game):
+        saved.append(_save_game(game))
+        return old_copy(game)
+
+    suite = unittest.TestSuite([unittest.defaultTestLoader.loadTestsFromTestCase(test_case)
+                                for test_case in [tests.copy_tests.TestGameCopying,
+                                                  tests.copy_tests.TestMinionCopying]])
+    Game.copy = saving_copy
+    try:
+        suite.run(unittest.TestResult())
+    finally:
+        Game.copy = old_copy
+    return saved
+
+
+def loads_per_second(saved, number=20):
+    """
+    Find the rate at which games can be loaded from JSON which has already been parsed
+
+    :param list saved: The JSON for each game to load, and the agents to load it with
+    :param int number: The number of times to load each game
+    """
+    seconds = timeit.timeit(lambda: [Game.__from_json__(game_json, agents) for game_json, agents in saved],
+                            number=number)
+    return number * len(saved) / seconds
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the number of games loaded per second
+    :rtype: dict
+    """
+    return {
+        "serialization_tests": loads_per_second(serialization_fixtures()),
+        "middle_games": loads_per_second([_save_game(middle_game(seed, 8)) for seed in range(5)]),
+        "aura_board": loads_per_second([_save_game(board_game(AURA_BOARD))]),
+    }
+
+
+if __name__ == "__main__":
+    for name, rate in sorted(run().items()):
+        print("{0:<30} {1:8.1f} loads/s".format(name, rate))
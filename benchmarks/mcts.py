@@ -0,0 +1,59 @@
+from benchmarks import middle_game
+from hearthbreaker.agents.mcts_agent import MCTSAgent
+
+__doc__ = """
+Benchmarks for :class:`hearthbreaker.agents.mcts_agent.MCTSAgent`, measuring how many playouts it can run per second
+from positions in the middle of a game.
+
+Run with ``python -m benchmarks.mcts``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "playouts/s"
+
+
+def playouts_per_second(rollout_turns, iterations=50, positions=5, processes=1):
+    """
+    Find the rate at which an :class:`MCTSAgent` runs playouts, over several mid-game positions
+
+    :param int rollout_turns: The number of turns after the current one to play in each playout, or None to play
+                              each game to the end
+    :param int iterations: The number of playouts to run before each move
+    :param int positions: The number of positions to search from
+    :param int processes: The number of processes to search in, or None for one per CPU
+    """
+    agent = MCTSAgent(iterations=iterations, rollout_turns=rollout_turns, processes=processes)
+    try:
+        for seed in range(positions):
+            game = middle_game(seed, 8)
+            if game.game_ended:
+                continue
+            agent.set_game(game)
+            game._start_turn()
+            agent.do_turn(game.current_player)
+    finally:
+        agent.close()
+    if agent.search_time == 0:
+        return 0.0
+    return agent.playouts / agent.search_time
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the number of playouts run per second
+    :rtype: dict
+    """
+    return {
+        "full_playouts": playouts_per_second(None),
+        "full_playouts_all_cpus": playouts_per_second(None, iterations=200, processes=None),
+        "rollout_4_turns": playouts_per_second(4),
+        "rollout_1_turn": playouts_per_second(1),
+        "rollout_0_turns": playouts_per_second(0),
+    }
+
+
+if __name__ == "__main__":
+    for name, rate in sorted(run().items()):
+        print("{0:<30} {1:8.1f} playouts/s".format(name, rate))
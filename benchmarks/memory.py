@@ -0,0 +1,54 @@
+import gc
+import tracemalloc
+
+from benchmarks import middle_game
+
+__doc__ = """
+Measures how much memory copies of a game take up, which limits how many positions a search agent can keep alive at
+once.
+
+Run with ``python -m benchmarks.memory``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "bytes"
+
+
+def bytes_per_copy(turns, copies=200, positions=5):
+    """
+    Find the average number of bytes allocated for a copy of a game, after the given number of turns have been played
+
+    :param int turns: The number of turns to play before copying
+    :param int copies: The number of copies to make of each position
+    :param int positions: The number of positions to copy
+    """
+    total = 0
+    for seed in range(positions):
+        game = middle_game(seed, turns)
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        kept = [game.copy() for i in range(copies)]
+        total += tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+        del kept
+    return total / (copies * positions)
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the number of bytes taken by a single copy
+    :rtype: dict
+    """
+    return {
+        "copy_at_start": bytes_per_copy(0),
+        "copy_after_6_turns": bytes_per_copy(6),
+        "copy_after_12_turns": bytes_per_copy(12),
+    }
+
+
+if __name__ == "__main__":
+    for name, size in sorted(run().items()):
+        print("{0:<30} {1:10.0f} bytes".format(name, size))
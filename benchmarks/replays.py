@@ -0,0 +1,61 @@
+import glob
+import os
+import timeit
+
+from hearthbreaker.verify import load_replay, play_replay
+
+__doc__ = """
+Benchmarks for playing back the replays in ``tests/replays``, which exercises the replay agent and the game's random
+numbers being read back from the replay rather than drawn.
+
+Run with ``python -m benchmarks.replays``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+_REPLAY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "replays")
+
+
+def _replay_files():
+    """
+    Find the replays in ``tests/replays`` which can be played back
+
+    :return: The name of each replay file, by the name of the file without its extension
+    :rtype: dict
+    """
+    filenames = {}
+    for filename in sorted(glob.glob(os.path.join(_REPLAY_DIR, "*.hsreplay"))):
+        try:
+            play_replay(load_replay(filename))
+        except Exception:
+            continue
+        filenames[os.path.splitext(os.path.basename(filename))[0]] = filename
+    return filenames
+
+
+def play_back(filename, number=20):
+    """
+    Time playing a replay back to its end, not counting the time taken to read it
+    """
+    # A replay can only be played back once, so each one is read ahead of time
+    replays = [load_replay(filename) for i in range(number)]
+    start_time = timeit.default_timer()
+    for replay in replays:
+        play_replay(replay)
+    return (timeit.default_timer() - start_time) / number
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return dict(("play_back_" + name, play_back(filename)) for name, filename in _replay_files().items())
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}ms".format(name, seconds * 1000))
@@ -0,0 +1,84 @@
+import json
+import timeit
+
+from benchmarks import middle_game
+from hearthbreaker.game_objects import Game
+from hearthbreaker.serialization import snapshot
+
+__doc__ = """
+Benchmarks comparing the binary snapshot format in :mod:`hearthbreaker.serialization.snapshot` with JSON, for saving
+and loading games in the middle of play.
+
+Run with ``python -m benchmarks.snapshot``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def _save_object(o):
+    return o.__to_json__()
+
+
+def _json_dump(game):
+    return json.dumps(game, default=_save_object).encode("utf-8")
+
+
+def _json_load(data, agents):
+    return Game.__from_json__(json.loads(data.decode("utf-8")), agents)
+
+
+_FORMATS = {
+    "json": (_json_dump, _json_load),
+    "snapshot": (snapshot.serialize, snapshot.deserialize),
+}
+
+
+def _games(positions=5):
+    return [middle_game(seed, 8) for seed in range(positions)]
+
+
+def save_and_load(format_name, number=20):
+    """
+    Time saving and then loading games in the given format
+
+    :param str format_name: Either "json" or "snapshot"
+    :return: The time taken to save a game, and to load it, in seconds
+    :rtype: (float, float)
+    """
+    dump, load = _FORMATS[format_name]
+    games = _games()
+    saved = [dump(game) for game in games]
+    agents = [player.agent for player in games[0].players]
+    save_time = timeit.timeit(lambda: [dump(game) for game in games], number=number)
+    load_time = timeit.timeit(lambda: [load(data, agents) for data in saved], number=number)
+    return save_time / (number * len(games)), load_time / (number * len(games))
+
+
+def saved_size(format_name):
+    """
+    Find the average number of bytes a game takes up in the given format
+    """
+    dump = _FORMATS[format_name][0]
+    games = _games()
+    return sum([len(dump(game)) for game in games]) // len(games)
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    results = {}
+    for format_name in sorted(_FORMATS):
+        results[format_name + "_save"], results[format_name + "_load"] = save_and_load(format_name)
+    return results
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
+    for format_name in sorted(_FORMATS):
+        print("{0:<30} {1:8d} bytes".format(format_name + "_size", saved_size(format_name)))
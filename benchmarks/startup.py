@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+import timeit
+
+from hearthbreaker.game_objects import card_lookup
+
+__doc__ = """
+Benchmarks for loading the engine and looking up cards.  Loading is timed in a new interpreter each time, since
+modules are only loaded once per process.
+
+Run with ``python -m benchmarks.startup``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+_LOAD_SCRIPT = """
+import json, timeit
+start = timeit.default_timer()
+import hearthbreaker.game_objects
+imported = timeit.default_timer()
+hearthbreaker.game_objects.card_lookup("Fireball")
+print(json.dumps([imported - start, timeit.default_timer() - imported]))
+"""
+
+
+def load_times(runs=5):
+    """
+    Find the average time taken to import :mod:`hearthbreaker.game_objects`, and then to look up the first card
+
+    :param int runs: The number of new interpreters to start
+    :return: The import time and the first lookup time, in seconds
+    :rtype: (float, float)
+    """
+    totals = [0.0, 0.0]
+    for run in range(runs):
+        output = subprocess.check_output([sys.executable, "-W", "ignore", "-c", _LOAD_SCRIPT])
+        for index, seconds in enumerate(json.loads(output.decode())):
+            totals[index] += seconds
+    return totals[0] / runs, totals[1] / runs
+
+
+def lookup_deck(number=200):
+    """
+    Time looking up thirty cards, as is done to build a deck
+    """
+    names = ["Fireball", "Chillwind Yeti", "Abusive Sergeant", "Fiery War Axe", "Mirror Entity", "Leper Gnome"] * 5
+    return timeit.timeit(lambda: [card_lookup(name) for name in names], number=number) / number
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    import_time, first_lookup_time = load_times()
+    return {
+        "import_game_objects": import_time,
+        "first_card_lookup": first_lookup_time,
+        "lookup_deck": lookup_deck(),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:10.3f}ms".format(name, seconds * 1000))
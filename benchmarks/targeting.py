@@ -0,0 +1,68 @@
+import timeit
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Game, Deck, card_lookup
+
+__doc__ = """
+Benchmarks for finding the targets of cards in hand, which agents such as
+:class:`hearthbreaker.agents.basic_agents.RandomAgent` do for every card in hand before each move they make.
+
+Run with ``python -m benchmarks.targeting``
+"""
+
+#: The unit of the values returned by :func:`run`
+UNIT = "seconds"
+
+
+def _full_board_game(hand):
+    """
+    Create a game where the current player has six minions on the board and the given cards in their hand, and
+    their opponent has seven minions
+    """
+    decks = [Deck([card_lookup("Bloodfen Raptor") for i in range(0, 30)], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+    game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 0)
+    game.pre_game()
+    game.current_player = game.players[1]
+    game.play_single_turn()
+    for index in range(0, 7):
+        card_lookup("Chillwind Yeti").summon(game.other_player, game, index)
+    for index in range(0, 6):
+        card_lookup("Chillwind Yeti").summon(game.current_player, game, index)
+    game.current_player.hand = [card_lookup(name) for name in hand]
+    game.current_player.mana = 10
+    return game
+
+
+def check_hand(hand, number=2000):
+    """
+    Time checking whether each card in a hand can be used, with a nearly full board
+    """
+    game = _full_board_game(hand)
+    player = game.current_player
+
+    def check():
+        for card in player.hand:
+            card.can_use(player, game)
+
+    return timeit.timeit(check, number=number) / number
+
+
+def run():
+    """
+    Run all of the benchmarks in this module
+
+    :return: A dictionary mapping benchmark names to the time taken for a single operation, in seconds
+    :rtype: dict
+    """
+    return {
+        "check_hand_of_spells": check_hand(["Fireball", "Frostbolt", "Polymorph", "Arcane Shot", "Moonfire"] * 2),
+        "check_hand_of_battlecries": check_hand(["Elven Archer", "Shattered Sun Cleric", "Ironbeak Owl",
+                                                 "Abusive Sergeant", "Dark Iron Dwarf"] * 2),
+        "check_hand_of_minions": check_hand(["Chillwind Yeti", "Bloodfen Raptor"] * 5),
+    }
+
+
+if __name__ == "__main__":
+    for name, seconds in sorted(run().items()):
+        print("{0:<30} {1:8.3f}us".format(name, seconds * 1000000))
@@ -1,11 +1,33 @@
 import abc
 import copy
-
-import random
+import timeit
 
 
 class Agent(metaclass=abc.ABCMeta):
 
+    def set_game(self, game):
+        """
+        Called by a :class:`hearthbreaker.game_objects.Game` when it is created with this agent.  Agents which make
+        random decisions should draw their random numbers from the game's ``random_generator``, so that the game can
+        be reproduced from its seed.
+
+        :param hearthbreaker.game_objects.Game game: The game this agent is playing in
+        """
+        self.game = game
+
+    def copy(self, new_game):
+        """
+        Make a copy of this agent to play in a copy of its game, such as the ones made by
+        :meth:`hearthbreaker.game_objects.Game.copy`.  The copy draws its random numbers from the new game and reads
+        its time limits, so playing the copy doesn't change how the original game plays out.
+
+        :param hearthbreaker.game_objects.Game new_game: The game the copy will play in
+        :rtype: Agent
+        """
+        new_agent = copy.copy(self)
+        new_agent.set_game(new_game)
+        return new_agent
+
     @abc.abstractmethod
     def do_card_check(self, cards):
         pass
@@ -27,6 +49,49 @@ class Agent(metaclass=abc.ABCMeta):
         pass
 
 
+class AnytimeAgent(Agent, metaclass=abc.ABCMeta):
+    """
+    An agent which can stop searching for its moves at any time, and make the best ones it has found so far.  This
+    lets it keep to the time limit for each turn set by the game's
+    :attr:`turn_time_limit <hearthbreaker.game_objects.Game.turn_time_limit>`.
+
+    While searching, an anytime agent should check :meth:`time_left`, and once it runs out, make the moves it has
+    found and end its turn.  The game refuses any move made after the deadline, so an agent which runs over loses the
+    rest of its turn.
+    """
+
+    def time_left(self):
+        """
+        Find how long this agent has left to make its moves this turn
+
+        :return: The number of seconds left, which is negative if time has run out, or None if the turn has no limit
+        :rtype: float
+        """
+        if self.game is None or self.game.turn_deadline is None:
+            return None
+        return self.game.turn_deadline - timeit.default_timer()
+
+    def out_of_time(self):
+        """
+        Check whether this agent has run out of time to make moves this turn
+
+        :rtype: bool
+        """
+        time_left = self.time_left()
+        return time_left is not None and time_left <= 0
+
+    @abc.abstractmethod
+    def statistics(self):
+        """
+        Describe how much work this agent has done searching for moves, over all of the turns it has played
+
+        :return: A dictionary with the number of positions searched under ``"nodes"``, and the number of seconds
+                 spent searching under ``"time"``
+        :rtype: dict
+        """
+        pass
+
+
 class DoNothingAgent(Agent):
     def __init__(self):
         self.game = None
@@ -100,7 +165,7 @@ class RandomAgent(DoNothingAgent):
             else:
                 possible_actions = len(attack_minions) + len(playable_cards)
             if possible_actions > 0:
-                action = random.randint(0, possible_actions - 1)
+                action = self.game.random_generator.randint(0, possible_actions - 1)
                 if player.hero.power.can_use() and action == possible_actions - 1:
                     player.hero.power.use()
                 elif action < len(attack_minions):
@@ -111,10 +176,10 @@ class RandomAgent(DoNothingAgent):
                 return
 
     def choose_target(self, targets):
-        return targets[random.randint(0, len(targets) - 1)]
+        return targets[self.game.random_generator.randint(0, len(targets) - 1)]
 
     def choose_index(self, card, player):
-        return random.randint(0, len(player.minions))
+        return self.game.random_generator.randint(0, len(player.minions))
 
     def choose_option(self, *options):
-        return options[random.randint(0, len(options) - 1)]
+        return options[self.game.random_generator.randint(0, len(options) - 1)]
@@ -0,0 +1,355 @@
+import json
+import math
+import multiprocessing
+import random
+import timeit
+import types
+
+from hearthbreaker.agents.basic_agents import AnytimeAgent, RandomAgent
+from hearthbreaker.constants import ACTION_TYPE
+from hearthbreaker.game_objects import Game
+
+
+def _move_count(actions):
+    """
+    Count the cards, attackers and hero power which the given actions make use of.  Each of these can generally only
+    be used once more this turn, however many positions and targets it has.
+    """
+    return len(set(action[:2] if action[0] != ACTION_TYPE.POWER else action[:1] for action in actions))
+
+
+class _Node:
+    """
+    A decision in the search tree.  The child at each index is reached by choosing the option at that index.
+    """
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.score = 0.0
+
+    def select(self, option_count, exploration, random_generator):
+        """
+        Choose one of ``option_count`` options, either an option which has not been tried yet, or else the child with
+        the best upper confidence bound.
+
+        :return: The index of the chosen option, the child node for it, and whether the child is new
+        :rtype: (int, _Node, bool)
+        """
+        untried = [index for index in range(0, option_count) if index not in self.children]
+        if len(untried) > 0:
+            index = untried[random_generator.randint(0, len(untried) - 1)]
+            child = _Node()
+            self.children[index] = child
+            return index, child, True
+
+        log_visits = math.log(self.visits)
+        best_index = None
+        best_value = -1
+        for index in range(0, option_count):
+            child = self.children[index]
+            value = child.score / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_index = index
+                best_value = value
+        return best_index, self.children[best_index], False
+
+    def most_visited(self, option_count):
+        """
+        Find the option which has been visited the most, out of the first ``option_count`` options
+
+        :return: The index of the option and its node, or None if none of the options have been tried
+        :rtype: (int, _Node)
+        """
+        options = [(child.visits, index) for index, child in self.children.items() if index < option_count]
+        if len(options) == 0:
+            return None
+        visits, index = max(options)
+        return index, self.children[index]
+
+    def merge(self, other):
+        """
+        Add the visits and scores from another tree, built by an independent search from the same position, into
+        this one.
+
+        :param _Node other: The root of the other tree
+        """
+        self.visits += other.visits
+        self.score += other.score
+        for index, other_child in other.children.items():
+            if index not in self.children:
+                self.children[index] = _Node()
+            self.children[index].merge(other_child)
+
+
+class _SearchAgent(RandomAgent):
+    """
+    Plays for the searching player in the simulated games.  Decisions are made by walking down the search tree until
+    a new node is added to it, or there are no more moves to make this turn.  The rest of the game is then played out
+    at random.
+    """
+
+    def __init__(self, exploration):
+        super().__init__()
+        self.exploration = exploration
+        self.path = []
+        self.in_tree = False
+
+    def start_playout(self, root):
+        self.path = [root]
+        self.in_tree = True
+
+    def _choose(self, option_count):
+        if not self.in_tree:
+            return self.game.random_generator.randint(0, option_count - 1)
+        index, child, is_new = self.path[-1].select(option_count, self.exploration, self.game.random_generator)
+        self.path.append(child)
+        if is_new:
+            self.in_tree = False
+        return index
+
+    def do_turn(self, player):
+        game = player.game
+        while self.in_tree and not game.game_ended:
+            actions = game.legal_actions()
+            if len(actions) == 0:
+                break
+            game.apply(actions[self._choose(len(actions))])
+        self.in_tree = False
+        super().do_turn(player)
+
+    def choose_target(self, targets):
+        return targets[self._choose(len(targets))]
+
+    def choose_index(self, card, player):
+        return self._choose(len(player.minions) + 1)
+
+    def choose_option(self, *options):
+        return options[self._choose(len(options))]
+
+
+class MCTSAgent(AnytimeAgent):
+    """
+    An agent which uses Monte Carlo Tree Search to decide what to do on its turn.
+
+    Like :class:`RandomAgent <hearthbreaker.agents.basic_agents.RandomAgent>`, this agent keeps making moves until
+    there are none left.  Before each move, it copies the game and plays out the rest of the game many times, with
+    random agents on both sides.  The decisions made for the rest of its turn (which of the game's
+    :meth:`legal_actions <hearthbreaker.game_objects.Game.legal_actions>` to take next, and any options or later
+    targets to choose for it) form a search tree, which is explored using the UCT algorithm.  The agent then takes the
+    action, and makes the choices for it, which were explored the most.
+
+    The search is bounded by a number of playouts, a time limit, or both.  Each playout can also be cut off after a
+    number of turns, in which case the result is estimated from the health of the two heroes.  If the game limits the
+    time for each turn, the time left is shared between the moves which could still be made, and the agent ends its
+    turn once the time has run out.
+
+    The search can be spread across several worker processes.  The game is serialized and sent to each worker, which
+    runs its own independent search from it.  The trees from each worker are then merged by adding up their visits.
+    The pool of workers is started the first time it is needed, and kept until :meth:`close` is called.
+    """
+
+    def __init__(self, iterations=100, time_limit=None, rollout_turns=None, exploration=math.sqrt(2), processes=1):
+        """
+        :param int iterations: The number of playouts to run before each move, or None for no limit.  When searching
+                               in several processes, the playouts are divided between them.
+        :param float time_limit: The number of seconds to search for before each move, or None for no limit
+        :param int rollout_turns: The number of turns to play after the current one in each playout, or None to play
+                                  until the game ends
+        :param float exploration: The exploration constant for UCT.  Higher values spread the playouts out more
+                                  evenly between moves.
+        :param int processes: The number of worker processes to search in.  If 1 (the default), the search is run in
+                              this process.  If None, one worker per CPU is used.
+        """
+        if iterations is None and time_limit is None:
+            raise ValueError("The search must be limited by a number of iterations, a time limit, or both")
+        self.game = None
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = processes
+        #: The total number of playouts this agent has run
+        self.playouts = 0
+        #: The total number of seconds this agent has spent searching
+        self.search_time = 0.0
+        self._node = None
+        self._pool = None
+
+    def do_card_check(self, cards):
+        return [True, True, True, True]
+
+    def do_turn(self, player):
+        game = player.game
+        actions = game.legal_actions()
+        while len(actions) > 0 and not game.game_ended:
+            time_limit = self.time_limit
+            time_left = self.time_left()
+            if time_left is not None:
+                if time_left <= 0:
+                    break
+                # The time is shared between the cards, attackers and hero power which could still be used
+                share = time_left / _move_count(actions)
+                time_limit = share if time_limit is None else min(time_limit, share)
+            self._node = self.search(player, time_limit)
+            game.apply(actions[self._follow(len(actions))])
+            actions = game.legal_actions()
+        self._node = None
+
+    def search(self, player, time_limit=None):
+        """
+        Search for the best way to continue the given player's turn.
+
+        :param hearthbreaker.game_objects.Player player: The player whose turn it is
+        :param float time_limit: The number of seconds to search for, or None to use the agent's :attr:`time_limit`
+        :return: The root of the search tree
+        """
+        if time_limit is None:
+            time_limit = self.time_limit
+        start_time = timeit.default_timer()
+        player_index = player.game.players.index(player)
+        if self.processes > 1:
+            root = self._parallel_search(player.game, player_index, time_limit)
+        else:
+            root = _search(_search_copy(player.game), player_index, self.iterations, time_limit,
+                           self.rollout_turns, self.exploration)
+
+        self.playouts += root.visits
+        self.search_time += timeit.default_timer() - start_time
+        return root
+
+    def _parallel_search(self, game, player_index, time_limit):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes)
+        game_json = json.dumps(game, default=lambda o: o.__to_json__())
+        turn_state = _turn_state(game)
+        if self.iterations is None:
+            iterations = None
+        else:
+            iterations = max(1, -(-self.iterations // self.processes))
+        tasks = [(game_json, turn_state, player_index, game.random_generator.getrandbits(32), iterations,
+                  time_limit, self.rollout_turns, self.exploration) for i in range(0, self.processes)]
+
+        root = _Node()
+        for worker_root in self._pool.map(_search_task, tasks):
+            root.merge(worker_root)
+        return root
+
+    def statistics(self):
+        return {"nodes": self.playouts, "time": self.search_time}
+
+    def close(self):
+        """
+        Shut down the worker processes used for searching, if any have been started
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _follow(self, option_count):
+        if self._node is not None:
+            choice = self._node.most_visited(option_count)
+            if choice is not None:
+                index, self._node = choice
+                return index
+        self._node = None
+        return self.game.random_generator.randint(0, option_count - 1)
+
+    def choose_target(self, targets):
+        return targets[self._follow(len(targets))]
+
+    def choose_index(self, card, player):
+        return self._follow(len(player.minions) + 1)
+
+    def choose_option(self, *options):
+        return options[self._follow(len(options))]
+
+    def __getstate__(self):
+        # The pool can't be sent to another process, which happens when a game is played in a worker
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+
+def _search(game, player_index, iterations, time_limit, rollout_turns, exploration):
+    """
+    Run playouts from a copy of a game, building up a search tree for the given player.  The game is rolled back to
+    where it started after each playout.
+
+    :return: The root of the search tree.  Its visit count is the number of playouts which were run.
+    :rtype: _Node
+    """
+    start_time = timeit.default_timer()
+    search_player = game.players[player_index]
+    search_agent = _SearchAgent(exploration)
+    search_agent.set_game(game)
+    opponent_agent = RandomAgent()
+    opponent_agent.set_game(game)
+    search_player.agent = search_agent
+    search_player.opponent.agent = opponent_agent
+    checkpoint = game.checkpoint()
+
+    root = _Node()
+    while (iterations is None or root.visits < iterations) and \
+            (time_limit is None or timeit.default_timer() - start_time < time_limit):
+        search_agent.start_playout(root)
+        score = _play_out(game, search_player, rollout_turns)
+        for node in search_agent.path:
+            node.visits += 1
+            node.score += score
+        game.rollback(checkpoint)
+    return root
+
+
+def _search_task(task):
+    game_json, turn_state, player_index, seed, iterations, time_limit, rollout_turns, exploration = task
+    game = Game.__from_json__(json.loads(game_json), [RandomAgent(), RandomAgent()])
+    for player, (power_used, fatigue, cards_played) in zip(game.players, turn_state):
+        player.hero.power.used = power_used
+        player.fatigue = fatigue
+        player.cards_played = cards_played
+    game.random_generator = random.Random(seed)
+    return _search(game, player_index, iterations, time_limit, rollout_turns, exploration)
+
+
+def _turn_state(game):
+    # The parts of each player's state which affect the moves they can make, but which aren't serialized
+    return [(player.hero.power.used, player.fatigue, player.cards_played) for player in game.players]
+
+
+def _play_out(game, player, rollout_turns):
+    player.agent.do_turn(player)
+    game._end_turn()
+    turns = 0
+    while not game.game_ended and (rollout_turns is None or turns < rollout_turns):
+        game.play_single_turn()
+        turns += 1
+    return _score(player)
+
+
+def _search_copy(game):
+    copied_game = game.copy()
+    # A game which is being recorded for a replay has some of its methods replaced with ones that record it, and
+    # which are bound to the original game.  The search must use the game's own methods.
+    for name, value in list(copied_game.__dict__.items()):
+        if isinstance(value, (types.FunctionType, types.MethodType)):
+            del copied_game.__dict__[name]
+    copied_game.random_generator = random.Random(game.random_generator.getrandbits(32))
+    return copied_game
+
+
+def _score(player):
+    hero = player.hero
+    enemy_hero = player.opponent.hero
+    if hero.dead and enemy_hero.dead:
+        return 0.5
+    elif enemy_hero.dead:
+        return 1.0
+    elif hero.dead:
+        return 0.0
+    health = hero.health + hero.armor
+    enemy_health = enemy_hero.health + enemy_hero.armor
+    return health / (health + enemy_health)
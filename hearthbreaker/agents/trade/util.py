@@ -53,16 +53,16 @@ class Util:
         return res.values()
 
     @staticmethod
-    def rand_el(list):
-        i = random.randint(0, len(list) - 1)
+    def rand_el(list, random_generator=random):
+        i = random_generator.randint(0, len(list) - 1)
         return list[i]
 
     @staticmethod
-    def rand_prefer_minion(targets):
+    def rand_prefer_minion(targets, random_generator=random):
         minions = [card for card in filter(lambda c: not isinstance(c, Hero), targets)]
         if len(minions) > 0:
             targets = minions
-        return Util.rand_el(targets)
+        return Util.rand_el(targets, random_generator)
 
     @staticmethod
     def filter_out_one(arr, f):
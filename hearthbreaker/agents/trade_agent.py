@@ -42,6 +42,8 @@ class BattlecryType:
     @staticmethod
     def target_type_for_card(card):
         res = None
+        if not hasattr(card, "create_minion"):  # Spells, weapons and secrets have no battlecry to check
+            return res
         minion = card.create_minion(None)
         if minion:
             if minion.battlecry:
@@ -62,10 +64,10 @@ class ChooseTargetMixin:
 
         targets = self.prune_targets(all_targets, False)
         if len(targets) == 0:
-            return Util.rand_el(all_targets)
+            return Util.rand_el(all_targets, self.game.random_generator)
 
         if not self.current_trade:
-            return Util.rand_prefer_minion(targets)
+            return Util.rand_prefer_minion(targets, self.game.random_generator)
             # raise Exception("No current trade")
 
         for target in targets:
@@ -73,14 +75,14 @@ class ChooseTargetMixin:
                 return target
 
         # raise Exception("Could not find target {}".format(target))
-        return Util.rand_prefer_minion(targets)
+        return Util.rand_prefer_minion(targets, self.game.random_generator)
 
     def choose_target_friendly(self, targets):
         pruned = self.prune_targets(targets, True)
         if len(pruned) == 0:
-            return Util.rand_el(targets)
+            return Util.rand_el(targets, self.game.random_generator)
 
-        return Util.rand_el(pruned)
+        return Util.rand_el(pruned, self.game.random_generator)
 
     def prune_targets(self, targets, get_friendly):
         res = []
@@ -350,7 +350,8 @@ class Starfall(Card):
                                  CHARACTER_CLASS.DRUID, CARD_RARITY.SPECIAL)
 
             def use(self, player, game):
-                targets = hearthbreaker.targeting.find_minion_spell_target(game, lambda t: t.spell_targetable())
+                targets = hearthbreaker.targeting.find_minion_spell_target(game,
+                                                                           hearthbreaker.targeting.is_spell_targetable)
                 target = player.agent.choose_target(targets)
                 target.damage(player.effective_spell_damage(5), self)
 
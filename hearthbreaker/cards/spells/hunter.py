@@ -52,6 +52,7 @@ class Flare(Card):
         super().use(player, game)
         for minion in hearthbreaker.targeting.find_minion_spell_target(game, lambda m: m.stealth):
             minion.stealth = False
+        game.board_version += 1
 
         for secret in game.other_player.secrets:
             secret.deactivate(game.other_player)
@@ -94,3 +94,9 @@ class MINION_TYPE:
     def to_str(minion_number):
         types = dict(zip(MINION_TYPE.__types.values(), MINION_TYPE.__types.keys()))
         return types[minion_number].capitalize()
+
+
+class ACTION_TYPE:
+    PLAY = 1
+    ATTACK = 2
+    POWER = 3
@@ -1,11 +1,17 @@
+import collections
+import collections.abc
 import copy
 import importlib
 import random
 import abc
+import timeit
+import types
 import hearthbreaker.powers
 import hearthbreaker.targeting
 import hearthbreaker.constants
 
+#: Maps the reference name of each card to its class.  The table is filled in the first time a card is looked up, so
+#: that the card modules aren't loaded until they are needed.
 card_table = {}
 
 
@@ -14,7 +20,8 @@ def __create_card_table():
 
     def __card_lookup_rec(card_type):
         subclasses = card_type.__subclasses__()
-        if len(subclasses) is 0:
+        # Only the cards which are part of the game are included, not any defined elsewhere (for example in tests)
+        if len(subclasses) is 0 and card_type.__module__.startswith("hearthbreaker.cards"):
             c = card_type()
             card_table[c.ref_name] = card_type
         for sub_type in subclasses:
@@ -33,7 +40,8 @@ def card_lookup(card_name):
              by that name exists.
     :rtype: hearthbreaker.game_objects.Card
     """
-
+    if len(card_table) == 0:
+        __create_card_table()
     card = card_table[card_name]
     if card is not None:
         return card()
@@ -41,9 +49,118 @@ def card_lookup(card_name):
 
 
 def get_cards():
-    card_list = filter(lambda c: c.rarity != hearthbreaker.constants.CARD_RARITY.SPECIAL,
-                       [card() for card in card_table.values()])
-    return card_list
+    """
+    Create one of each card which can be generated during a game, which is every card apart from the special ones
+
+    :rtype: list[hearthbreaker.game_objects.Card]
+    """
+    return [type(card)() for card in get_collection().cards]
+
+
+def get_collection():
+    """
+    Get the index of the cards which can be generated during a game.  The index is built the first time it is needed.
+
+    :rtype: CardCollection
+    """
+    global _collection
+    if _collection is None:
+        if len(card_table) == 0:
+            __create_card_table()
+        cards = [card_type() for card_type in card_table.values()]
+        _collection = CardCollection([card for card in cards
+                                      if card.rarity != hearthbreaker.constants.CARD_RARITY.SPECIAL])
+    return _collection
+
+
+_collection = None
+
+
+class CardCollection:
+    """
+    An index of a set of cards by their type (whether each is a minion, spell, secret or weapon), character class, mana
+    cost, minion type and rarity.  This means the cards with some combination of those can be found without creating
+    and checking every card.
+
+    The cards in the index are only there to be looked up, and must not be changed or given to a player.  To get a
+    card which can be, create a new one with ``type(card)()``.
+    """
+
+    def __init__(self, cards):
+        """
+        :param list[Card] cards: The cards to index, in the order they should be found in
+        """
+        #: All of the cards in the collection
+        self.cards = tuple(cards)
+        index = {}
+        for card in self.cards:
+            for key in CardCollection.__keys(card):
+                index.setdefault(key, []).append(card)
+        self.__index = dict((key, tuple(cards)) for key, cards in index.items())
+        # The cards matching each combination of keys which has been looked up.  The collection never changes, so
+        # these never need to be found again.
+        self.__found = {}
+
+    @staticmethod
+    def __keys(card):
+        keys = [("is_minion", card.is_minion()), ("is_spell", card.is_spell()), ("is_secret", card.is_secret()),
+                ("is_weapon", card.is_weapon()), ("character_class", card.character_class), ("mana", card.mana),
+                ("rarity", card.rarity)]
+        if card.is_minion():
+            keys.append(("minion_type", card.minion_type))
+        return keys
+
+    def find(self, keys):
+        """
+        Find the cards which match all of the given keys
+
+        :param list keys: Pairs of the name of a property and the value a card must have for it.  The property is one
+                          of ``"is_minion"``, ``"is_spell"``, ``"is_secret"``, ``"is_weapon"``, ``"character_class"``,
+                          ``"mana"``, ``"minion_type"`` or ``"rarity"``.
+        :return: The matching cards, in the same order as :attr:`cards`
+        :rtype: tuple
+        """
+        if len(keys) == 0:
+            return self.cards
+        if len(keys) == 1:
+            return self.__index.get(keys[0], ())
+        combination = frozenset(keys)
+        if combination not in self.__found:
+            matches = sorted((self.__index.get(key, ()) for key in combination), key=len)
+            others = [set(cards) for cards in matches[1:]]
+            self.__found[combination] = tuple(card for card in matches[0] if all(card in other for other in others))
+        return self.__found[combination]
+
+
+class _GlobalRandom:
+    """
+    Draws random numbers from the global :mod:`random` module, so that games which weren't given a seed are still
+    controlled by :func:`random.seed`.  Unlike the module itself, this can be copied along with the game.
+    """
+
+    @staticmethod
+    def randint(lowest, highest):
+        return random.randint(lowest, highest)
+
+    @staticmethod
+    def randrange(*args):
+        return random.randrange(*args)
+
+    @staticmethod
+    def random():
+        return random.random()
+
+    @staticmethod
+    def choice(seq):
+        return random.choice(seq)
+
+    @staticmethod
+    def shuffle(seq):
+        random.shuffle(seq)
+
+    @staticmethod
+    def getrandbits(bits):
+        return random.getrandbits(bits)
 
 
 class GameException(Exception):
@@ -55,6 +172,61 @@ class GameException(Exception):
         super().__init__(message)
 
 
+class TurnTimeout(GameException):
+    """
+    Raised when a move is attempted after the time limit for the turn has run out.  See
+    :meth:`Game.play_single_turn`
+    """
+    pass
+
+
+class _Handler:
+    """
+    A function bound to an event on a :class:`Bindable`
+    """
+    __slots__ = ['function', 'remove', 'active']
+
+    def __init__(self, function, remove):
+        #: The function to call when the event is triggered
+        self.function = function
+        #: True if this handler should be unbound after it is called once
+        self.remove = remove
+        #: True while this handler is being called, so that an event cannot recursively call the same handler
+        self.active = False
+
+
+class _NoEvents(collections.abc.Mapping):
+    """
+    The events of a :class:`Bindable` which has never had a function bound to it.  There is only one instance, which
+    is shared by all of them, and copying it gives back the same instance.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, event):
+        raise KeyError(event)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def copy(self):
+        return {}
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "_NO_EVENTS"
+
+
+_NO_EVENTS = _NoEvents()
+
+
 class Bindable:
     """
     A class which inherits from Bindable has an event structure added to it.
@@ -108,11 +280,14 @@ class Bindable:
     Any class which subclasses this class must be sure to call :meth:`__init__`
     """
 
+    __slots__ = ("events",)
+
     def __init__(self):
         """
         Set up a new :class:`Bindable`.  Must be called by any subclasses.
         """
-        self.events = {}
+        # Most cards never have anything bound to them, so they share an empty mapping until they do
+        self.events = _NO_EVENTS
 
     def bind(self, event, function):
         """
@@ -123,17 +298,7 @@ class Bindable:
                                   ensure its signature matches the parameters called from :meth:`trigger`
         :see: :class:`Bindable`
         """
-
-        class Handler:
-            def __init__(self):
-                self.function = function
-                self.remove = False
-                self.active = False
-
-        if event not in self.events:
-            self.events[event] = []
-
-        self.events[event].append(Handler())
+        self.__add_handler(event, _Handler(function, False))
 
     def bind_once(self, event, function):
         """
@@ -145,17 +310,19 @@ class Bindable:
                                   ensure its signature matches the parameters called from :meth:`trigger`
         :see: :class:`Bindable`
         """
-
-        class Handler:
-            def __init__(self):
-                self.function = function
-                self.remove = True
-                self.active = False
-
-        if event not in self.events:
-            self.events[event] = []
-
-        self.events[event].append(Handler())
+        self.__add_handler(event, _Handler(function, True))
+
+    def __add_handler(self, event, handler):
+        # The handlers for each event are kept in a tuple, which is replaced rather than modified whenever a handler
+        # is added or removed.  This means trigger can loop over the handlers without copying them first, and can
+        # tell whether they have changed by checking if the tuple is still the same one
+        if self.events is _NO_EVENTS:
+            self.events = {}
+        handlers = self.events.get(event)
+        if handlers is None:
+            self.events[event] = (handler,)
+        else:
+            self.events[event] = handlers + (handler,)
 
     def trigger(self, event, *args):
         """
@@ -167,17 +334,25 @@ class Bindable:
         :param list args: The arguments to pass to the bound function
         :see: :class:`Bindable`
         """
-        if event in self.events:
-            for handler in copy.copy(self.events[event]):
-                if not handler.active and event in self.events and handler in self.events[event]:
-                    handler.active = True
-                    handler.function(*args)
-                    handler.active = False
-                    if handler.remove:
-                        self.events[event].remove(handler)
-                        # tidy up the events dict so we don't have entries for events with no handlers
-                        if len(self.events[event]) is 0:
-                            del (self.events[event])
+        handlers = self.events.get(event)
+        if handlers is None:
+            return
+        current = handlers
+        for handler in handlers:
+            if handler.active:
+                continue
+            if current is not handlers:
+                # A handler has been bound or unbound since the event was triggered, so make sure this one is still
+                # bound before calling it
+                current = self.events.get(event)
+                if current is None or handler not in current:
+                    continue
+            handler.active = True
+            handler.function(*args)
+            handler.active = False
+            if handler.remove:
+                self.__remove_handler(event, handler)
+            current = self.events.get(event)
 
     def unbind(self, event, function):
         """
@@ -189,9 +364,18 @@ class Bindable:
         :param function function: The function to unbind.
         """
         if event in self.events:
-            self.events[event] = [handler for handler in self.events[event] if not handler.function == function]
-            if len(self.events[event]) is 0:
-                del (self.events[event])
+            self.__set_handlers(event, [handler for handler in self.events[event] if not handler.function == function])
+
+    def __remove_handler(self, event, handler):
+        if event in self.events:
+            self.__set_handlers(event, [h for h in self.events[event] if h is not handler])
+
+    def __set_handlers(self, event, handlers):
+        if len(handlers) == 0:
+            # tidy up the events dict so we don't have entries for events with no handlers
+            del self.events[event]
+        else:
+            self.events[event] = tuple(handlers)
 
 
 class GameObject:
@@ -200,6 +384,8 @@ class GameObject:
     needing to know about and import the various objects in the game engine
     """
 
+    __slots__ = ()
+
     @staticmethod
     def is_spell():
         """
@@ -261,6 +447,12 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
      This common superclass handles all of the status tags and calculations involved in attacking or being attacked.
     """
 
+    # Characters are created and copied in large numbers when searching, so their attributes are kept in slots rather
+    # than a dictionary for each one
+    __slots__ = ("health", "base_health", "base_attack", "active", "dead", "windfury", "used_windfury", "frozen",
+                 "frozen_this_turn", "player", "immune", "delayed", "stealth", "enraged", "removed", "effects", "born",
+                 "auras", "attack_delta", "health_delta", "enrage", "current_target")
+
     def __init__(self, attack_power, health, enrage=None):
         """
         Create a new Character with the given attack power and health
@@ -344,6 +536,7 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
             self.auras = [aura for aura in filter(
                 lambda a: not isinstance(a.action, Stealth), self.auras)]
             self.stealth = 0
+            self.player.game.board_version += 1
 
     def attack(self):
         """
@@ -362,21 +555,10 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         """
         if not self.can_attack():
             raise GameException("That minion cannot attack")
+        self.player.game.check_turn_time()
 
-        found_taunt = False
-        targets = []
-        for enemy in self.player.game.other_player.minions:
-            if enemy.taunt and enemy.can_be_attacked():
-                found_taunt = True
-            if enemy.can_be_attacked():
-                targets.append(enemy)
-
-        if found_taunt:
-            targets = [target for target in targets if target.taunt]
-        else:
-            targets.append(self.player.game.other_player.hero)
-
-        target = self.choose_target(targets)
+        self.player.game._legal_actions = None
+        target = self.choose_target(self.find_attack_targets())
         self._remove_stealth()
         self.current_target = target
         self.player.trigger("attack", self, target)
@@ -398,6 +580,27 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         self.stealth = False
         self.current_target = None
 
+    def find_attack_targets(self):
+        """
+        Find the characters which this :class:`Character` could attack.  If any of the enemy minions have taunt, only
+        those minions can be attacked.
+
+        :rtype: list[Character]
+        """
+        found_taunt = False
+        targets = []
+        for enemy in self.player.game.other_player.minions:
+            if enemy.taunt and enemy.can_be_attacked():
+                found_taunt = True
+            if enemy.can_be_attacked():
+                targets.append(enemy)
+
+        if found_taunt:
+            targets = [target for target in targets if target.taunt]
+        else:
+            targets.append(self.player.game.other_player.hero)
+        return targets
+
     def choose_target(self, targets):
         """
         Consults the associated player to select a target from a list of targets
@@ -691,10 +894,6 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
             action.unact(self, self)
 
 
-def _is_spell_targetable(target):
-    return target.spell_targetable()
-
-
 class Card(Bindable, GameObject):
     """
     Represents a card in Heathstone.  Every card is implemented as a subclass, either directly or through
@@ -706,8 +905,14 @@ class Card(Bindable, GameObject):
     cause its effect, but not update the game state.
     """
 
+    # Every copy of a game creates the cards in each player's hand and deck again, so the attributes common to all
+    # cards are kept in slots.  Attributes which only some cards use are still kept in each instance's dictionary,
+    # which is only created if one of them is set.
+    __slots__ = ("name", "ref_name", "mana", "character_class", "rarity", "cancel", "targetable", "targets", "target",
+                 "get_targets", "filter_func", "overload", "drawn")
+
     def __init__(self, name, mana, character_class, rarity, target_func=None,
-                 filter_func=_is_spell_targetable, overload=0, ref_name=None):
+                 filter_func=hearthbreaker.targeting.is_spell_targetable, overload=0, ref_name=None):
         """
             Creates a new :class:`Card`.
 
@@ -839,9 +1044,11 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
     :see: :class:`Card`
     :see: :meth:`create_minion`
     """
+    __slots__ = ("minion_type", "battlecry", "choices", "combo")
+
     def __init__(self, name, mana, character_class, rarity, minion_type=hearthbreaker.constants.MINION_TYPE.NONE,
-                 targeting_func=None, filter_func=lambda target: not target.stealth, ref_name=None, battlecry=None,
-                 choices=None, combo=None, overload=0):
+                 targeting_func=None, filter_func=hearthbreaker.targeting.is_not_stealthed, ref_name=None,
+                 battlecry=None, choices=None, combo=None, overload=0):
         """
         All parameters are passed directly to the :meth:`superclass's __init__ method <Card.__init__>`.
 
@@ -997,6 +1204,8 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
 
 
 class SecretCard(Card, metaclass=abc.ABCMeta):
+    __slots__ = ("player",)
+
     def __init__(self, name, mana, character_class, rarity):
         super().__init__(name, mana, character_class, rarity, None)
         self.player = None
@@ -1032,6 +1241,11 @@ class SecretCard(Card, metaclass=abc.ABCMeta):
 
 
 class Minion(Character):
+    # Some tags replace methods on individual minions, so minions still have a dictionary for those
+    __slots__ = ("game", "card", "index", "charge", "taunt", "divine_shield", "can_be_targeted_by_spells", "battlecry",
+                 "deathrattle", "aura_attack", "aura_health", "exhausted", "_effects_to_add", "_auras_to_add",
+                 "__dict__")
+
     def __init__(self, attack, health, battlecry=None,
                  deathrattle=None, taunt=False, charge=False, spell_damage=0, divine_shield=False, stealth=False,
                  windfury=False, spell_targetable=True, effects=None, auras=None, enrage=None):
@@ -1080,15 +1294,19 @@ class Minion(Character):
             self._auras_to_add.append(Aura(SpellDamage(spell_damage), SelfSelector()))
 
     def add_to_board(self, index):
+        # Only auras which depend on the board (such as those for adjacent minions) need to be checked against every
+        # minion before and after this one is added.  The others can only start to affect this minion.
         aura_affects = {}
         for player in self.game.players:
             for aura in player.minion_auras:
-                aura_affects[aura] = set()
-                for minion in self.player.minions:
-                    if aura.match(minion):
-                        aura_affects[aura].add(minion)
+                if aura.selector.match_depends_on_board():
+                    aura_affects[aura] = set()
+                    for minion in self.player.minions:
+                        if aura.match(minion):
+                            aura_affects[aura].add(minion)
         self.game.minion_counter += 1
         self.player.minions.insert(index, self)
+        self.game.board_version += 1
         self.born = self.game.minion_counter
         count = 0
         for minion in self.player.minions:
@@ -1101,6 +1319,10 @@ class Minion(Character):
             self.add_effect(effect)
         for player in self.game.players:
             for aura in player.minion_auras:
+                if aura not in aura_affects:
+                    if aura.match(self):
+                        aura.action.act(aura.target, self)
+                    continue
                 for minion in self.player.minions:
                     is_in = minion in aura_affects[aura]
                     if not is_in and aura.match(minion):
@@ -1128,12 +1350,14 @@ class Minion(Character):
         return super().calculate_max_health() + self.aura_health
 
     def remove_from_board(self):
+        # Auras which don't depend on the board affect the same minions as before, apart from this one
         aura_affects = {}
         for aura in self.player.minion_auras:
-            aura_affects[aura] = set()
-            for minion in self.player.minions:
-                if aura.match(minion):
-                    aura_affects[aura].add(minion)
+            if aura.selector.match_depends_on_board():
+                aura_affects[aura] = set()
+                for minion in self.player.minions:
+                    if aura.match(minion):
+                        aura_affects[aura].add(minion)
         for minion in self.player.minions:
 
             if minion.index > self.index:
@@ -1141,6 +1365,8 @@ class Minion(Character):
         self.game.remove_minion(self, self.player)
         self.removed = True
         for aura in self.player.minion_auras:
+            if aura not in aura_affects:
+                continue
             for minion in self.player.minions:
                 is_in = minion in aura_affects[aura]
                 if not is_in and aura.match(minion):
@@ -1163,6 +1389,7 @@ class Minion(Character):
         self.game.minion_counter += 1
         new_minion.born = self.game.minion_counter
         self.player.minions[self.index] = new_minion
+        self.game.board_version += 1
         for effect in new_minion._effects_to_add:
             new_minion.add_effect(effect)
         for aura in self.player.minion_auras:
@@ -1231,18 +1458,21 @@ class Minion(Character):
     def copy(self, new_owner, new_game=None):
         new_minion = Minion(self.base_attack, self.base_health, self.battlecry)
         new_minion.health = self.base_health - (self.calculate_max_health() - self.health)
-        new_minion.deathrattle = copy.deepcopy(self.deathrattle)
+        new_minion.deathrattle = [deathrattle.copy() for deathrattle in self.deathrattle]
         new_minion.divine_shield = 0
         new_minion.taunt = 0
         new_minion.charge = 0
         new_minion.stealth = 0
         new_minion.enraged = self.enraged
-        new_minion.enrage = copy.deepcopy(self.enrage)
+        new_minion.enrage = [action.copy() for action in self.enrage]
         new_minion.can_be_targeted_by_spells = self.can_be_targeted_by_spells
         new_minion.immune = self.immune
         new_minion.index = self.index
         new_minion.active = self.active
         new_minion.exhausted = self.exhausted
+        new_minion.frozen = self.frozen
+        new_minion.frozen_this_turn = self.frozen_this_turn
+        new_minion.used_windfury = self.used_windfury
         new_minion.born = self.born
         card_type = type(self.card)
         new_minion.card = card_type()
@@ -1252,14 +1482,14 @@ class Minion(Character):
         else:
             new_minion.game = new_owner.game
         new_minion.effects = []
-        new_minion._effects_to_add = [copy.deepcopy(effect) for effect in self.effects]
+        new_minion._effects_to_add = [effect.copy() for effect in self.effects]
         new_minion.auras = []
-        new_minion._auras_to_add = [copy.deepcopy(aura) for aura in self.auras]
+        new_minion._auras_to_add = [aura.copy() for aura in self.auras]
         return new_minion
 
     @staticmethod
     def __from_json__(md, player, game):
-        from hearthbreaker.tags.base import Action, Deathrattle, Effect, Aura
+        from hearthbreaker.tags.base import Action, Deathrattle, Effect, Aura, AuraUntil
         minion = Minion(md['attack'], md['max_health'])
         minion.health = md['max_health'] - md['damage']
         minion.exhausted = md['exhausted']
@@ -1273,7 +1503,12 @@ class Minion(Character):
         minion.game = game
         minion.player = player
         minion._effects_to_add = [Effect.from_json(game, **effect) for effect in md['effects']]
-        minion._auras_to_add = [Aura.from_json(**aura) for aura in md['auras']]
+        minion._auras_to_add = []
+        for aura in md['auras']:
+            if 'until' in aura:
+                minion._auras_to_add.append(AuraUntil.from_json(**aura))
+            else:
+                minion._auras_to_add.append(Aura.from_json(**aura))
         return minion
 
     def bounce(self):
@@ -1317,8 +1552,10 @@ class WeaponCard(Card, metaclass=abc.ABCMeta):
     Represents a :class:`Card` for creating a :class:`Weapon`
     """
 
-    def __init__(self, name, mana, character_class, rarity, target_func=None, filter_func=lambda t: not t.stealth,
-                 overload=0):
+    __slots__ = ()
+
+    def __init__(self, name, mana, character_class, rarity, target_func=None,
+                 filter_func=hearthbreaker.targeting.is_not_stealthed, overload=0):
         """
         Create a new :class:`WeaponCard`
 
@@ -1379,6 +1616,8 @@ class Weapon(Bindable, GameObject):
     attacks is handled by :class:`Hero`, but it can be modified through the use of events.
     """
 
+    __slots__ = ("base_attack", "durability", "battlecry", "deathrattle", "player", "card", "game")
+
     def __init__(self, attack_power, durability, battlecry=None, deathrattle=None):
         """
         Creates a new weapon with the given attack power and durability.  A battlecry and deathrattle can also
@@ -1404,8 +1643,10 @@ class Weapon(Bindable, GameObject):
 
     def copy(self, new_owner):
         new_weapon = copy.copy(self)
-        new_weapon.events = copy.copy(self.events)
+        new_weapon.events = dict(self.events)
         new_weapon.player = new_owner
+        new_weapon.game = new_owner.game
+        new_weapon.card = type(self.card)()
         return new_weapon
 
     def destroy(self):
@@ -1456,9 +1697,12 @@ class Deck:
         for card in cards:
             card.drawn = False
         self.left = 30
+        self.__undrawn = list(cards)
 
     def copy(self):
         def copy_card(card):
+            # Cards which have been drawn still hold the state of the game they were played in, such as their
+            # target, so the copy is given its own instance of each card whether or not it has been drawn
             new_card = type(card)()
             new_card.drawn = card.drawn
             return new_card
@@ -1466,15 +1710,34 @@ class Deck:
         new_deck.cards = [copy_card(card) for card in self.cards]
         new_deck.character_class = self.character_class
         new_deck.left = self.left
+        new_deck.__undrawn = None
         return new_deck
 
     def can_draw(self):
         return self.left > 0
 
+    def undrawn_cards(self):
+        """
+        Get the cards which have not yet been drawn from this deck, in the order they were given to the deck.
+
+        The list is kept up to date as cards are drawn, rather than searched for each time.  Cards can also be taken
+        from the deck by setting their ``drawn`` flag and reducing :attr:`left`, in which case the list is built again
+        from the flags the next time it is needed.
+
+        :return: The undrawn cards.  This list belongs to the deck, and must not be changed.
+        :rtype: [Card]
+        """
+        if self.__undrawn is None or len(self.__undrawn) != self.left:
+            self.__undrawn = [card for card in self.cards if not card.drawn]
+        return self.__undrawn
+
     def draw(self, game):
         if not self.can_draw():
             raise GameException("Cannot draw more than 30 cards")
-        card = game.random_draw(self.cards, lambda c: not c.drawn)
+        undrawn = self.undrawn_cards()
+        # The random number is chosen in the same way as Game.random_draw would choose it from the undrawn cards, so
+        # that games and replays play out the same way as when the whole deck was searched on every draw
+        card = undrawn.pop(game.random_amount(0, len(undrawn) - 1))
         card.drawn = True
         self.left -= 1
         return card
@@ -1486,6 +1749,7 @@ class Deck:
                     raise GameException("Tried to put back a card that hadn't been used yet")
                 self.cards[index].drawn = False
                 self.left += 1
+                self.__undrawn = None
                 return
         raise GameException("Tried to put back a card that didn't come from this deck")
 
@@ -1515,10 +1779,13 @@ class Deck:
         deck.used = used
         deck.left = left
         deck.character_class = character_class
+        deck.__undrawn = None
         return deck
 
 
 class Hero(Character):
+    __slots__ = ("armor", "weapon", "bonus_attack", "character_class", "power")
+
     def __init__(self, character_class, player):
         super().__init__(0, 30)
 
@@ -1542,15 +1809,16 @@ class Hero(Character):
         new_hero.health = self.health
         new_hero.armor = self.armor
         new_hero.bonus_attack = 0
-        new_hero.used_windfury = False
-        new_hero.frozen = False
-        new_hero.frozen_this_turn = False
+        new_hero.used_windfury = self.used_windfury
+        new_hero.frozen = self.frozen
+        new_hero.frozen_this_turn = self.frozen_this_turn
         new_hero.active = self.active
+        new_hero.power.used = self.power.used
         for aura in self.auras:
-            new_aura = copy.deepcopy(aura)
+            new_aura = aura.copy()
             new_hero.add_aura(new_aura)
         for effect in self.effects:
-            new_effect = copy.deepcopy(effect)
+            new_effect = effect.copy()
             new_hero.add_effect(new_effect)
 
         return new_hero
@@ -1580,7 +1848,8 @@ class Hero(Character):
         self.player.game.game_over()
 
     def find_power_target(self):
-        targets = hearthbreaker.targeting.find_spell_target(self.player.game, lambda t: t.spell_targetable())
+        targets = hearthbreaker.targeting.find_spell_target(self.player.game,
+                                                            hearthbreaker.targeting.is_spell_targetable)
         target = self.choose_target(targets)
         self.trigger("found_power_target", target)
         return target
@@ -1665,7 +1934,9 @@ class Player(Bindable):
 
     def copy(self, new_game):
         from hearthbreaker.tags.base import AuraUntil
-        copied_player = Player(self.name, self.deck.copy(), self.agent, new_game)
+        # Agents which can't be copied, such as those playing back a replay, are shared with the original game
+        agent = self.agent.copy(new_game) if hasattr(self.agent, "copy") else self.agent
+        copied_player = Player(self.name, self.deck.copy(), agent, new_game)
 
         copied_player.hero = self.hero.copy(copied_player, new_game)
         copied_player.graveyard = copy.copy(self.graveyard)
@@ -1675,9 +1946,11 @@ class Player(Bindable):
         copied_player.mana = self.mana
         copied_player.max_mana = self.max_mana
         copied_player.overload = self.overload
+        copied_player.fatigue = self.fatigue
+        copied_player.cards_played = self.cards_played
         copied_player.dead_this_turn = copy.copy(self.dead_this_turn)
         for effect in self.effects:
-            effect = copy.copy(effect)
+            effect = effect.copy()
             copied_player.add_effect(effect)
         copied_player.secrets = []
         for secret in self.secrets:
@@ -1685,11 +1958,11 @@ class Player(Bindable):
             new_secret.player = copied_player
             copied_player.secrets.append(new_secret)
         for aura in filter(lambda a: isinstance(a, AuraUntil), self.player_auras):
-            aura = copy.deepcopy(aura)
+            aura = aura.copy()
             aura.target = copied_player.hero
             copied_player.add_aura(aura)
         for aura in filter(lambda a: isinstance(a, AuraUntil), self.minion_auras):
-            aura = copy.deepcopy(aura)
+            aura = aura.copy()
             aura.target = copied_player.hero
             copied_player.add_aura(aura)
         copied_player.effect_count = dict()
@@ -1813,9 +2086,186 @@ class Player(Bindable):
         return player
 
 
+class _ChosenActionAgent:
+    """
+    Stands in for a player's agent while :meth:`Game.apply` takes an action, so that the position and target chosen as
+    part of the action are used the first time they are asked for.  Everything else is passed on to the agent.
+    """
+
+    def __init__(self, agent, position, target):
+        self.agent = agent
+        self.position = position
+        self.target = target
+
+    def choose_target(self, targets):
+        if self.target is not None and self.target in targets:
+            target = self.target
+            self.target = None
+            return target
+        return self.agent.choose_target(targets)
+
+    def choose_index(self, card, player):
+        if self.position >= 0:
+            position = self.position
+            self.position = -1
+            return position
+        return self.agent.choose_index(card, player)
+
+    def __getattr__(self, item):
+        return getattr(self.agent, item)
+
+
+class Checkpoint:
+    """
+    A record of the state of a :class:`Game` at one point in time, which the game can be returned to using
+    :meth:`Game.rollback`.
+
+    The checkpoint saves the attributes of every object which can be reached from the game (its players, characters,
+    cards, decks, effects and so on), along with the contents of the lists, dictionaries and sets they hold.  Rolling
+    back restores all of these in place, so any references to the game's objects remain valid, and objects which have
+    been created since the checkpoint are simply left behind.  A game can be rolled back to the same checkpoint any
+    number of times.
+
+    The game's agents and its random number generator are not part of the checkpoint, so each line of play explored
+    from a checkpoint can be different.  Neither are any objects belonging to another game, such as the minions which
+    died in the game a copy was made from, so rolling back a copy never changes the original.
+    """
+
+    def __init__(self, game):
+        """
+        Record the current state of a game.  Use :meth:`Game.checkpoint` rather than calling this directly.
+
+        :param Game game: The game to record
+        """
+        #: The :class:`Game` this checkpoint was taken from
+        self.game = game
+        self._saved = []
+        skip = [game.random_generator] + [player.agent for player in game.players]
+        seen = set([id(obj) for obj in skip])
+        owned_cards = Checkpoint.__owned_cards(game)
+        to_visit = [game]
+        while len(to_visit) > 0:
+            obj = to_visit.pop()
+            obj_type = type(obj)
+            if obj_type in Checkpoint.__immutable_types or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if Checkpoint.__belongs_elsewhere(obj, game, owned_cards):
+                continue
+            if obj_type is list:
+                self._saved.append((obj, list(obj)))
+                to_visit.extend(obj)
+            elif obj_type is dict:
+                self._saved.append((obj, dict(obj)))
+                to_visit.extend(obj.values())
+            elif obj_type is set:
+                self._saved.append((obj, set(obj)))
+                to_visit.extend(obj)
+            elif obj_type is tuple:
+                to_visit.extend(obj)
+            elif obj_type is types.MethodType:
+                to_visit.append(obj.__self__)
+            elif not isinstance(obj, (type, types.FunctionType, types.BuiltinFunctionType, types.ModuleType)):
+                slots = Checkpoint.__slot_names(obj_type)
+                if hasattr(obj, "__dict__"):
+                    self._saved.append((obj, dict(obj.__dict__)))
+                    to_visit.extend(obj.__dict__.values())
+                if len(slots) > 0:
+                    values = tuple(getattr(obj, slot, Checkpoint.__unset) for slot in slots)
+                    self._saved.append((obj, values))
+                    to_visit.extend(values)
+
+    def restore(self):
+        """
+        Return the game to the state it was in when this checkpoint was taken.  This should only be done between
+        actions, not while cards are being played or characters are attacking.
+        """
+        for obj, state in self._saved:
+            obj_type = type(obj)
+            if obj_type is list:
+                obj[:] = state
+            elif obj_type is dict or obj_type is set:
+                obj.clear()
+                obj.update(state)
+            elif type(state) is dict:
+                obj.__dict__.clear()
+                obj.__dict__.update(state)
+            else:
+                for slot, value in zip(Checkpoint.__slot_names(obj_type), state):
+                    if value is Checkpoint.__unset:
+                        if hasattr(obj, slot):
+                            delattr(obj, slot)
+                    else:
+                        setattr(obj, slot, value)
+
+    @staticmethod
+    def __owned_cards(game):
+        cards = [game.last_spell]
+        for player in game.players:
+            cards.extend(player.deck.cards)
+            cards.extend(player.hand)
+            cards.extend(player.secrets)
+            cards.extend(minion.card for minion in player.minions)
+            if player.hero.weapon is not None:
+                cards.append(player.hero.weapon.card)
+        return set(id(card) for card in cards)
+
+    @staticmethod
+    def __belongs_elsewhere(obj, game, owned_cards):
+        if isinstance(obj, Game):
+            return obj is not game
+        if isinstance(obj, Player):
+            return obj.game is not game
+        if isinstance(obj, Character):
+            player = getattr(obj, "player", None)
+            return player is not None and player.game is not game
+        if isinstance(obj, Card):
+            return id(obj) not in owned_cards
+        return False
+
+    __immutable_types = set([type(None), bool, int, float, str])
+    __unset = object()
+    __slot_cache = {}
+
+    @staticmethod
+    def __slot_names(obj_type):
+        if obj_type not in Checkpoint.__slot_cache:
+            names = []
+            for klass in obj_type.__mro__:
+                slots = klass.__dict__.get("__slots__", [])
+                if isinstance(slots, str):
+                    slots = [slots]
+                for slot in slots:
+                    if slot in ("__dict__", "__weakref__"):
+                        continue
+                    if slot.startswith("__") and not slot.endswith("__"):
+                        slot = "_{0}{1}".format(klass.__name__.lstrip("_"), slot)
+                    names.append(slot)
+            Checkpoint.__slot_cache[obj_type] = names
+        return Checkpoint.__slot_cache[obj_type]
+
+
 class Game(Bindable):
-    def __init__(self, decks, agents):
+    def __init__(self, decks, agents, random_seed=None):
+        """
+        Create a new game between two decks, each played by an agent.
+
+        :param list[Deck] decks: The two decks to play with
+        :param list agents: The agents to play each of the decks.  Each agent is given the game through its
+                            ``set_game`` method
+        :param int random_seed: If present, the game generates its random numbers from its own
+                                :class:`random.Random` seeded with this value, so that it can be reproduced, and so
+                                that it doesn't share its random numbers with other games in the same process.
+                                If None (the default), the game uses the global :mod:`random` module.
+        """
         super().__init__()
+        #: The seed for this game's random numbers, or None if it uses the global random module
+        self.random_seed = random_seed
+        if random_seed is None:
+            #: The source of this game's random numbers, shared with its agents
+            self.random_generator = _GlobalRandom()
+        else:
+            self.random_generator = random.Random(random_seed)
         self.delayed_minions = set()
         self.first_player = self._generate_random_between(0, 1)
         if self.first_player is 0:
@@ -1833,6 +2283,19 @@ class Game(Bindable):
         self.__pre_game_run = False
         self.last_spell = None
         self._has_turn_ended = True
+        self._legal_actions = None
+        #: Incremented whenever a minion is added to or removed from the board, or whether a character can be
+        #: targeted changes, so that lists of targets can be remembered until it changes
+        self.board_version = 0
+        self._target_cache = {}
+        #: The number of seconds each player has to make their moves in a turn, or None (the default) for no limit.
+        #: See :meth:`play_single_turn`
+        self.turn_time_limit = None
+        #: The time the current turn must end by, as a value of :func:`timeit.default_timer`, or None if the turn
+        #: has no time limit
+        self.turn_deadline = None
+        for agent in agents:
+            agent.set_game(self)
 
     def random_draw(self, cards, requirement):
         filtered_cards = [card for card in filter(requirement, cards)]
@@ -1847,7 +2310,7 @@ class Game(Bindable):
         return self._generate_random_between(minimum, maximum)
 
     def _generate_random_between(self, lowest, highest):
-        return random.randint(lowest, highest)
+        return self.random_generator.randint(lowest, highest)
 
     def check_delayed(self):
         sorted_minions = sorted(self.delayed_minions, key=lambda m: m.born)
@@ -1889,20 +2352,55 @@ class Game(Bindable):
 
         self.players[1].hand.append(card_lookup("The Coin"))
 
-    def start(self):
+    def start(self, turns=None):
+        """
+        Play the game from the mulligan until it ends
+
+        :param int turns: The most turns to play, or None to play until the game is over
+        """
         self.pre_game()
         self.current_player = self.players[1]
-        while not self.game_ended:
+        turn = 0
+        while not self.game_ended and (turns is None or turn < turns):
             self.play_single_turn()
+            turn += 1
 
     def play_single_turn(self):
+        """
+        Play the next player's turn.
+
+        If :attr:`turn_time_limit` is set, the player's agent must make its moves before :attr:`turn_deadline`.  Any
+        move attempted after that is refused with a :class:`TurnTimeout`, and the turn ends with the moves made so far.
+        Agents which search for their moves, such as :class:`hearthbreaker.agents.basic_agents.AnytimeAgent`, should
+        check the deadline themselves, as a move is only refused once the agent tries to make it.
+        """
         self._start_turn()
-        self.current_player.agent.do_turn(self.current_player)
+        if self.turn_time_limit is None:
+            self.current_player.agent.do_turn(self.current_player)
+        else:
+            self.turn_deadline = timeit.default_timer() + self.turn_time_limit
+            try:
+                self.current_player.agent.do_turn(self.current_player)
+            except TurnTimeout:
+                pass
+            finally:
+                self.turn_deadline = None
         self._end_turn()
 
+    def check_turn_time(self):
+        """
+        Check that the time limit for the current turn hasn't run out.  Called before each move is made.
+
+        :raises TurnTimeout: If the turn has a time limit, and it has run out
+        """
+        if self.turn_deadline is not None and timeit.default_timer() >= self.turn_deadline:
+            raise TurnTimeout("The time limit for this turn has run out")
+
     def _start_turn(self):
         if not self._has_turn_ended:  # when a game is copied, the turn isn't ended before the next one starts
             self._end_turn()
+        self._legal_actions = None
+        self.board_version += 1
         if self.current_player == self.players[0]:
             self.current_player = self.players[1]
             self.other_player = self.players[0]
@@ -1930,6 +2428,7 @@ class Game(Bindable):
         self.game_ended = True
 
     def _end_turn(self):
+        self._legal_actions = None
         self.current_player.trigger("turn_ended")
         if self.current_player.hero.frozen_this_turn:
             self.current_player.hero.frozen_this_turn = False
@@ -1957,6 +2456,17 @@ class Game(Bindable):
 
     def copy(self):
         copied_game = copy.copy(self)
+        copied_game._legal_actions = None
+        copied_game._target_cache = {}
+        # Copies are used for searching, and their turns aren't timed
+        copied_game.turn_time_limit = None
+        copied_game.turn_deadline = None
+        if isinstance(self.random_generator, random.Random):
+            # The copy draws the same numbers the original would have, without taking them from the original
+            copied_game.random_generator = random.Random()
+            copied_game.random_generator.setstate(self.random_generator.getstate())
+        if self.last_spell is not None:
+            copied_game.last_spell = type(self.last_spell)()
         copied_game.players = [player.copy(copied_game) for player in self.players]
         if self.current_player is self.players[0]:
             copied_game.current_player = copied_game.players[0]
@@ -1982,11 +2492,32 @@ class Game(Bindable):
             secret.activate(copied_game.other_player)
         return copied_game
 
+    def checkpoint(self):
+        """
+        Record the current state of this game, so that it can later be returned to with :meth:`rollback`.  This lets
+        an agent explore many lines of play from the same position without copying the game for each one.
+
+        :rtype: Checkpoint
+        """
+        return Checkpoint(self)
+
+    def rollback(self, checkpoint):
+        """
+        Return this game, in place, to the state it was in when the given checkpoint was taken.
+
+        :param Checkpoint checkpoint: A checkpoint taken from this game with :meth:`checkpoint`
+        """
+        if checkpoint.game is not self:
+            raise GameException("Cannot roll back to a checkpoint from another game")
+        checkpoint.restore()
+
     def play_card(self, card):
         if self.game_ended:
             raise GameException("The game has ended")
         if not card.can_use(self.current_player, self):
             raise GameException("That card cannot be used")
+        self.check_turn_time()
+        self._legal_actions = None
         card_index = self.current_player.hand.index(card)
         self.current_player.hand.pop(card_index)
         self.current_player.mana -= card.mana_cost(self.current_player)
@@ -2002,8 +2533,102 @@ class Game(Bindable):
             self.current_player.cards_played += 1
             self.check_delayed()
 
+    def legal_actions(self):
+        """
+        Find every action the current player could take right now, apart from ending their turn.  Each action is a
+        tuple, starting with a constant from :class:`hearthbreaker.constants.ACTION_TYPE`:
+
+        * ``(ACTION_TYPE.PLAY, card, position, target)`` plays the card at index ``card`` in the player's hand.
+          ``position`` is where a minion is placed on the board, and is -1 for other cards.
+        * ``(ACTION_TYPE.ATTACK, attacker, target)`` attacks with the minion at index ``attacker``, or with the hero
+          if ``attacker`` is -1.
+        * ``(ACTION_TYPE.POWER, target)`` uses the hero power.
+
+        ``target`` is an index into the list of characters the card, attacker or power could target, or -1 if it
+        doesn't take a target.  The actions are found only once for each state of the game, and the targets of each
+        are kept for :meth:`apply`.
+
+        :return: The legal actions, in the order attacks, cards, then the hero power
+        :rtype: list[tuple]
+        """
+        if self._legal_actions is None:
+            self._legal_actions = self._find_legal_actions()
+        return list(self._legal_actions)
+
+    def _find_legal_actions(self):
+        action_type = hearthbreaker.constants.ACTION_TYPE
+        actions = collections.OrderedDict()
+        player = self.current_player
+        if self.game_ended:
+            return actions
+
+        attackers = [(index, minion) for index, minion in enumerate(player.minions) if minion.can_attack()]
+        if player.hero.can_attack():
+            attackers.append((-1, player.hero))
+        for attacker_index, attacker in attackers:
+            for target_index, target in enumerate(attacker.find_attack_targets()):
+                actions[(action_type.ATTACK, attacker_index, target_index)] = (attacker, -1, target)
+
+        for card_index, card in enumerate(player.hand):
+            if not card.can_use(player, self):
+                continue
+            if isinstance(card, MinionCard):
+                positions = range(0, len(player.minions) + 1)
+            else:
+                positions = [-1]
+            if card.targetable and card.targets is not None:
+                targets = list(enumerate(card.targets))
+            else:
+                targets = [(-1, None)]
+            for position in positions:
+                for target_index, target in targets:
+                    actions[(action_type.PLAY, card_index, position, target_index)] = (card, position, target)
+
+        if player.hero.power.can_use():
+            power_targets = player.hero.power.find_targets()
+            if power_targets is None:
+                actions[(action_type.POWER, -1)] = (player.hero.power, -1, None)
+            else:
+                for target_index, target in enumerate(power_targets):
+                    actions[(action_type.POWER, target_index)] = (player.hero.power, -1, target)
+        return actions
+
+    def apply(self, action):
+        """
+        Take one of the actions returned by :meth:`legal_actions` for the current player.  The target and position in
+        the action are used in place of asking the player's agent.  Any other choices, such as the option for a card
+        with Choose One, or the target of a battlecry which chooses its target after the minion is played, are still
+        made by the agent.
+
+        :param tuple action: The action to take
+        :raises GameException: If the action is not legal
+        """
+        if self._legal_actions is None or action not in self._legal_actions:
+            self._legal_actions = self._find_legal_actions()
+        if action not in self._legal_actions:
+            raise GameException("{0} is not a legal action".format(action))
+        subject, position, target = self._legal_actions[action]
+        self._legal_actions = None
+
+        player = self.current_player
+        agent = player.agent
+        player.agent = self._chosen_action_agent(agent, position, target)
+        try:
+            if action[0] == hearthbreaker.constants.ACTION_TYPE.PLAY:
+                self.play_card(subject)
+            elif action[0] == hearthbreaker.constants.ACTION_TYPE.ATTACK:
+                subject.attack()
+            else:
+                subject.use()
+        finally:
+            player.agent = agent
+
+    def _chosen_action_agent(self, agent, position, target):
+        return _ChosenActionAgent(agent, position, target)
+
     def remove_minion(self, minion, player):
         player.minions.remove(minion)
+        self.board_version += 1
         player.trigger("minion_removed", minion)
 
     def __to_json__(self):
@@ -2024,10 +2649,17 @@ class Game(Bindable):
         new_game.minion_counter = d["current_sequence_id"]
         new_game.delayed_minions = set()
         new_game.game_ended = False
-        new_game.random_func = random.randint
+        new_game.random_seed = None
+        new_game.random_generator = _GlobalRandom()
         new_game.events = {}
         new_game.players = [Player.__from_json__(pd, new_game, None) for pd in d["players"]]
         new_game._has_turn_ended = False
+        new_game._legal_actions = None
+        new_game.board_version = 0
+        new_game._target_cache = {}
+        new_game.last_spell = None
+        new_game.turn_time_limit = None
+        new_game.turn_deadline = None
         if d["active_player"] == 1:
             new_game.current_player = new_game.players[0]
             new_game.other_player = new_game.players[1]
@@ -2042,6 +2674,7 @@ class Game(Bindable):
         index = 0
         for player in new_game.players:
             player.agent = agents[index]
+            player.agent.set_game(new_game)
             for effect_json in d['players'][index]['effects']:
                 player.add_effect(Effect.from_json(new_game, **effect_json))
             player.player_auras = []
@@ -2065,5 +2698,3 @@ class Game(Bindable):
                     minion.enraged = True
             index += 1
         return new_game
-
-__create_card_table()
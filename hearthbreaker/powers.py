@@ -1,5 +1,6 @@
 import hearthbreaker.constants
 import hearthbreaker.game_objects
+import hearthbreaker.targeting
 
 
 def powers(character_class):
@@ -24,6 +25,9 @@ def powers(character_class):
 
 
 class Power:
+    #: Whether the player chooses a character for this power to be used on
+    targeted = False
+
     def __init__(self, hero):
         self.hero = hero
         self.used = False
@@ -31,8 +35,21 @@ class Power:
     def can_use(self):
         return not self.used and self.hero.player.mana >= 2
 
+    def find_targets(self):
+        """
+        Find the characters this power could be used on
+
+        :return: A list of characters, or None if this power doesn't take a target
+        """
+        if not self.targeted:
+            return None
+        return hearthbreaker.targeting.find_spell_target(self.hero.player.game,
+                                                         hearthbreaker.targeting.is_spell_targetable)
+
     def use(self):
         if self.can_use():
+            self.hero.player.game.check_turn_time()
+            self.hero.player.game._legal_actions = None
             self.hero.player.trigger("used_power")
             self.hero.player.mana -= 2
             self.used = True
@@ -58,6 +75,8 @@ class HunterPower(Power):
 
 
 class MagePower(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -69,6 +88,8 @@ class MagePower(Power):
 
 
 class PriestPower(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -86,6 +107,8 @@ class PriestPower(Power):
 
 # Special power the priest can obtain via the card Shadowform
 class MindSpike(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -100,6 +123,8 @@ class MindSpike(Power):
 
 # Special power the priest can obtain via the card Shadowform
 class MindShatter(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -0,0 +1,194 @@
+import collections
+import timeit
+
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Bindable, Game, Character, Minion
+
+__doc__ = """
+Measures which events, cards and actions games spend their time in.
+
+While a :class:`Profiler` is enabled, the methods of the engine listed below are wrapped so that each call is counted
+and timed.  Each call is recorded under a label made of the kind of call and the name of the event, card or action it
+was for:
+
+* ``event:<event name>`` for :meth:`hearthbreaker.game_objects.Bindable.trigger`
+* ``play_card:<card name>`` for :meth:`hearthbreaker.game_objects.Game.play_card`
+* ``attack:<card name>`` for :meth:`hearthbreaker.game_objects.Character.attack`, and the methods overriding it
+* ``add_to_board:<card name>`` for :meth:`hearthbreaker.game_objects.Minion.add_to_board`
+* ``act:<action class>`` for the ``act`` method of each :class:`hearthbreaker.tags.base.Action`
+
+The original methods are put back when the profiler is disabled, so the engine carries no cost at all for profiling
+when it isn't in use.
+
+Profiling games
+~~~~~~~~~~~~~~~
+
+From the command line, a batch of games can be profiled with: ::
+
+    python -m hearthbreaker.sim example.hsdeck zoo.hsdeck --games 100 --profile games.folded
+
+which prints the most expensive calls, and writes the time spent in each stack of calls in the collapsed format read
+by flame graph tools such as ``flamegraph.pl``.
+
+Or as a library: ::
+
+    with Profiler() as profiler:
+        game.start()
+    print(profiler.report(limit=20))
+"""
+
+#: The number of calls to a label, the total time spent in them in seconds, and the time spent in them but not in the
+#: profiled calls they made
+CallStats = collections.namedtuple("CallStats", ["calls", "total_time", "own_time"])
+
+_enabled = None
+
+
+def _subclasses(cls):
+    found = [cls]
+    for subclass in cls.__subclasses__():
+        found.extend(_subclasses(subclass))
+    return found
+
+
+def _card_name(character, args):
+    if isinstance(character, Minion):
+        return character.card.name
+    return "Hero ({0})".format(CHARACTER_CLASS.to_str(character.character_class))
+
+
+def _targets():
+    """
+    Find the methods to wrap, as the class each is defined on, its name, the kind of call it is and a function
+    naming what each call is for
+    """
+    # Actions are defined along with the tags, which may not have been loaded yet
+    from hearthbreaker.tags.base import Action
+    import hearthbreaker.tags.action  # noqa
+
+    targets = [(Bindable, "trigger", "event", lambda obj, args: args[0]),
+               (Game, "play_card", "play_card", lambda obj, args: args[0].name),
+               (Minion, "add_to_board", "add_to_board", _card_name)]
+    for cls in _subclasses(Character):
+        if "attack" in cls.__dict__:
+            targets.append((cls, "attack", "attack", _card_name))
+    for cls in _subclasses(Action):
+        if "act" in cls.__dict__ and not getattr(cls.__dict__["act"], "__isabstractmethod__", False):
+            targets.append((cls, "act", "act", lambda obj, args: type(obj).__name__))
+    return targets
+
+
+class Profiler:
+    """
+    Counts and times calls to the main methods of the engine, by event, card and action.  Only one profiler can be
+    enabled at a time.
+    """
+
+    def __init__(self):
+        #: The :class:`CallStats` for each label
+        self.stats = {}
+        #: The time spent in each stack of labels, not counting the calls made from the last one
+        self.stacks = collections.Counter()
+        self.__stack = []
+        self.__originals = []
+
+    def enable(self):
+        """
+        Start recording calls, by wrapping the methods of the engine
+        """
+        global _enabled
+        if _enabled is not None:
+            raise RuntimeError("Another profiler is already enabled")
+        _enabled = self
+        for cls, method_name, kind, name in _targets():
+            method = cls.__dict__[method_name]
+            self.__originals.append((cls, method_name, method))
+            setattr(cls, method_name, self.__wrap(method, kind, name))
+
+    def disable(self):
+        """
+        Stop recording calls, and put back the methods which were wrapped
+        """
+        global _enabled
+        if _enabled is not self:
+            return
+        for cls, method_name, method in reversed(self.__originals):
+            setattr(cls, method_name, method)
+        self.__originals = []
+        _enabled = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    def __wrap(self, method, kind, name):
+        call = self.__call
+
+        def wrapper(obj, *args, **kwargs):
+            return call(kind + ":" + str(name(obj, args)), method, obj, args, kwargs)
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def __call(self, label, method, obj, args, kwargs):
+        stack = self.__stack
+        if stack and stack[-1][1] is obj and stack[-1][0] == label:
+            # A method calling the one it overrides is part of the same call
+            return method(obj, *args, **kwargs)
+        frame = [label, obj, 0.0]
+        stack.append(frame)
+        start_time = timeit.default_timer()
+        try:
+            return method(obj, *args, **kwargs)
+        finally:
+            elapsed = timeit.default_timer() - start_time
+            stack.pop()
+            own_time = elapsed - frame[2]
+            if stack:
+                stack[-1][2] += elapsed
+            stats = self.stats.get(label)
+            if stats is None:
+                self.stats[label] = CallStats(1, elapsed, own_time)
+            else:
+                self.stats[label] = CallStats(stats.calls + 1, stats.total_time + elapsed, stats.own_time + own_time)
+            self.stacks[";".join([outer[0] for outer in stack] + [label])] += own_time
+
+    def report(self, sort="total_time", limit=None):
+        """
+        Describe the recorded calls as a table, with the most expensive first
+
+        :param str sort: The column to sort by, one of ``"calls"``, ``"total_time"`` or ``"own_time"``
+        :param int limit: The most labels to include, or None to include them all
+        :rtype: str
+        """
+        rows = sorted(self.stats.items(), key=lambda item: (-getattr(item[1], sort), item[0]))
+        if limit is not None:
+            rows = rows[:limit]
+        lines = ["{0:>10} {1:>12} {2:>12} {3:>14}  {4}".format("calls", "total (ms)", "own (ms)", "per call (us)",
+                                                               "label")]
+        for label, stats in rows:
+            lines.append("{0:>10} {1:>12.2f} {2:>12.2f} {3:>14.2f}  {4}".format(
+                stats.calls, stats.total_time * 1000, stats.own_time * 1000,
+                stats.total_time / stats.calls * 1000000, label))
+        return "\n".join(lines)
+
+    def write_collapsed(self, file):
+        """
+        Write the time spent in each stack of calls in the collapsed format used for flame graphs, with one stack on
+        each line followed by the time spent in it, in microseconds
+
+        :param file: An IO object, opened for writing
+        :type file: :class:`io.TextIOBase`
+        """
+        for stack, seconds in sorted(self.stacks.items()):
+            microseconds = int(round(seconds * 1000000))
+            if microseconds > 0:
+                file.write("{0} {1}\n".format(stack, microseconds))
+
+    def __str__(self):
+        return self.report()
@@ -1,5 +1,12 @@
+import collections
+import gzip
+import io
+import mmap
+import os
 import re
 import json
+import struct
+import zlib
 
 import hearthbreaker
 import hearthbreaker.constants
@@ -37,6 +44,18 @@ For example: ::
     replay.read_json("my_replay.hsreplay") # load the replay (this can be combined with the previous line)
     game = playback(replay)                # create a game associated with the replay
     game.start()                           # play the recorded game
+
+Large numbers of replays
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Replays can also be written with one move per line, after a line holding the header, by :meth:`Replay.write_lines`.
+Files in this format whose names end in ``.gz`` are compressed with gzip.  A :class:`ReplayReader` reads these files
+one move at a time, so even very long replays can be read without holding all of their moves in memory: ::
+
+    replay.write_lines("my_replay.hsreplay.gz")
+    with ReplayReader("my_replay.hsreplay.gz") as reader:
+        for move in reader.moves():
+            print(move.to_output_string())
 """
 
 
@@ -60,6 +79,8 @@ class Replay:
         self.decks = []
         self.keeps = []
         self.random = []
+        #: The seed of the recorded game's random numbers, or None if it didn't have one
+        self.random_seed = None
         if filename is not None:
             self.read_json(filename)
 
@@ -183,6 +204,8 @@ class Replay:
                     break
         else:
             found_random = True
+        if self.random_seed is not None:
+            writer.write("seed({0})\n".format(self.random_seed))
         if not found_random:
             writer.write("random()\n")
         else:
@@ -222,16 +245,8 @@ class Replay:
         else:
             writer = file
 
-        header_cards = [{"cards": [card.name for card in self.__shorten_deck(deck.cards)],
-                         "class": CHARACTER_CLASS.to_str(deck.character_class)} for deck in self.decks]
-
-        header = {
-            'decks': header_cards,
-            'keep': self.keeps,
-            'random': self.random,
-        }
-        json.dump({'header': header, 'moves': self._moves}, writer, default=lambda o: o.__to_json__(), indent=2,
-                  sort_keys=True)
+        json.dump({'header': self._header(), 'moves': self._moves}, writer, default=lambda o: o.__to_json__(),
+                  indent=2, sort_keys=True)
         if was_filename:
             writer.close()
 
@@ -252,20 +267,83 @@ class Replay:
             file = open(file, 'r')
 
         jd = json.load(file)
+        self._load_header(jd['header'])
+        self._moves = [Move.from_json(**js) for js in jd['moves']]
+        if was_filename:
+            file.close()
+
+    def write_lines(self, file):
+        """
+        Write a replay in the line format.  This holds the same information as the complete json format (see
+        :meth:`write_json`), but the header is written on the first line, and each move on a line of its own after it.
+        This lets the moves be read back one at a time by a :class:`ReplayReader`.
+
+        :param file: Either a string or an IO object.  If a string, then it is assumed to be a filename describing
+                     where a replay file should be written, which will be compressed with gzip if the name ends in
+                     ``.gz``.  If an IO object, then the IO object should be opened for writing.
+        :type file: :class:`str` or :class:`io.TextIOBase`
+        """
+        was_filename = False
+        if 'write' not in dir(file):
+            was_filename = True
+            writer = _open_replay(file, 'w')
+        else:
+            writer = file
+
+        writer.write(json.dumps(self._header(), sort_keys=True))
+        writer.write("\n")
+        for move in self._moves:
+            writer.write(json.dumps(move, default=lambda o: o.__to_json__(), sort_keys=True))
+            writer.write("\n")
+        if was_filename:
+            writer.close()
+
+    def read_lines(self, file):
+        """
+        Read a replay in the line format (see :meth:`write_lines`).  To read the moves one at a time instead of all
+        at once, use a :class:`ReplayReader`.
+
+        :param file: Either a string or an IO object.  If a string, then it is assumed to be a filename describing
+                     where a replay file is found, which will be decompressed with gzip if the name ends in ``.gz``.
+                     If an IO object, then the IO object should be opened for reading.
+        :type file: :class:`str` or :class:`io.TextIOBase`
+        """
+        with ReplayReader(file) as reader:
+            self._load_header(reader.header)
+            self._moves = list(reader.moves())
+
+    def _header(self):
+        """
+        Create the header of the complete json format, describing the decks and what happened before the first turn
+        """
+        header_cards = [{"cards": [card.name for card in self.__shorten_deck(deck.cards)],
+                         "class": CHARACTER_CLASS.to_str(deck.character_class)} for deck in self.decks]
+
+        header = {
+            'decks': header_cards,
+            'keep': self.keeps,
+            'random': self.random,
+        }
+        if self.random_seed is not None:
+            header['seed'] = self.random_seed
+        return header
+
+    def _load_header(self, header):
+        """
+        Load the decks and what happened before the first turn from the header of the complete json format
+        """
         self.decks = []
-        for deck in jd['header']['decks']:
+        for deck in header['decks']:
             deck_size = len(deck['cards'])
             cards = [hearthbreaker.game_objects.card_lookup(deck['cards'][index % deck_size]) for index in range(0, 30)]
             self.decks.append(
                 hearthbreaker.game_objects.Deck(cards, CHARACTER_CLASS.from_str(deck['class'])))
 
-        self.random = jd['header']['random']
-        self.keeps = jd['header']['keep']
+        self.random = header['random']
+        self.keeps = header['keep']
+        self.random_seed = header.get('seed')
         if len(self.keeps) == 0:
             self.keeps = [[0, 1, 2], [0, 1, 2, 3]]
-        self._moves = [Move.from_json(**js) for js in jd['moves']]
-        if was_filename:
-            file.close()
 
     def read(self, file):
         """
@@ -337,6 +415,9 @@ class Replay:
                 self.decks.append(
                     hearthbreaker.game_objects.Deck(cards, hearthbreaker.constants.CHARACTER_CLASS.from_str(args[0])))
 
+            elif move == 'seed':
+                self.random_seed = int(args[0])
+
             elif move == 'keep':
                 if len(self.keeps) > 1:
                     raise Exception("Maximum of two keep directives per file")
@@ -350,6 +431,272 @@ class Replay:
             self.keeps = [[0, 1, 2], [0, 1, 2, 3]]
 
 
+class ReplayReader:
+    """
+    Reads a replay in the line format (see :meth:`Replay.write_lines`) one move at a time.  Only the move being read
+    is kept in memory, so replays of any length can be read.
+
+    The reader should be closed when it is no longer needed, which can be done by using it in a ``with`` statement.
+    """
+    def __init__(self, file):
+        """
+        Open a replay and read its header
+
+        :param file: Either a string or an IO object.  If a string, then it is assumed to be a filename describing
+                     where a replay file is found, which will be decompressed with gzip if the name ends in ``.gz``.
+                     If an IO object, then the IO object should be opened for reading.
+        :type file: :class:`str` or :class:`io.TextIOBase`
+        """
+        if 'read' not in dir(file):
+            self.__was_filename = True
+            self.__file = _open_replay(file, 'r')
+        else:
+            self.__was_filename = False
+            self.__file = file
+        line = self.__file.readline()
+        if not line.strip():
+            self.close()
+            raise ValueError("The replay has no header")
+        #: The header of the replay, in the same form as in the complete json format
+        self.header = json.loads(line)
+
+    def moves(self):
+        """
+        Read the moves of the replay, in the order they were made.  The moves can only be read once.
+
+        :rtype: an iterator over :class:`hearthbreaker.serialization.move.Move`
+        """
+        for line in self.__file:
+            if line.strip():
+                yield Move.from_json(**json.loads(line))
+
+    def close(self):
+        """
+        Close the replay file, if it was opened by this reader
+        """
+        if self.__was_filename:
+            self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReplayArchive:
+    """
+    Holds many replays in a single file, along with the names of the decks in each game and which of them won.
+
+    Each replay is stored in the line format (see :meth:`Replay.write_lines`), compressed with zlib, after a short
+    record giving its length, deck names and winner.  When the archive is opened, these records are read to build an
+    index, without reading the replays themselves.  Any replay can then be read from the memory-mapped file by its
+    position in the archive, and the replays of a particular matchup or winner can be found from the index.
+
+    Replays are numbered from 0 in the order they were added.
+
+    If writing to the archive was interrupted, the last record may be incomplete.  Such an archive can only be opened
+    with ``repair=True``, which cuts the incomplete record off the end of the file.
+    """
+    MAGIC = b"HBRA\x01"
+    # The length of the compressed replay, the lengths of the two deck names, and the index of the winning deck, which
+    # is -1 for a draw
+    _RECORD = struct.Struct("<IHHb")
+
+    def __init__(self, filename, repair=False):
+        """
+        Open an archive, creating it if it doesn't exist yet
+
+        :param str filename: The name of the archive file
+        :param bool repair: If True, remove an incomplete record from the end of the archive, rather than refusing to
+                            open it
+        :raises ValueError: If the file isn't a replay archive, or ends with an incomplete record and ``repair`` is
+                            False
+        """
+        self.__file = open(filename, 'a+b')
+        self.__file.seek(0, os.SEEK_END)
+        if self.__file.tell() == 0:
+            self.__file.write(ReplayArchive.MAGIC)
+            self.__file.flush()
+        self.__map = None
+        self.__offsets = []
+        self.__deck_names = []
+        self.__winners = []
+        self.__by_decks = collections.defaultdict(list)
+        self.__by_winner = collections.defaultdict(list)
+        self.__read_index(repair)
+
+    def __read_index(self, repair):
+        data = self.__mapped()
+        if data[:len(ReplayArchive.MAGIC)] != ReplayArchive.MAGIC:
+            self.close()
+            raise ValueError("Not a replay archive")
+        pos = len(ReplayArchive.MAGIC)
+        while pos < len(data):
+            if pos + ReplayArchive._RECORD.size > len(data):
+                self.__remove_incomplete_record(pos, repair)
+                return
+            length, first_length, second_length, winner = ReplayArchive._RECORD.unpack_from(data, pos)
+            names_pos = pos + ReplayArchive._RECORD.size
+            offset = names_pos + first_length + second_length
+            if offset + length > len(data):
+                self.__remove_incomplete_record(pos, repair)
+                return
+            first_name = data[names_pos:names_pos + first_length].decode("utf-8")
+            second_name = data[names_pos + first_length:offset].decode("utf-8")
+            self.__add_to_index(offset, length, (first_name, second_name), None if winner < 0 else winner)
+            pos = offset + length
+
+    def __remove_incomplete_record(self, pos, repair):
+        """
+        Deal with a record at the end of the archive which runs past the end of the file, by cutting it off if the
+        archive is being repaired, or refusing to open the archive otherwise
+        """
+        if not repair:
+            filename = self.__file.name
+            self.close()
+            raise ValueError("The replay archive {0} ends with an incomplete record at byte {1}.  Open it with "
+                             "repair=True to remove the record.".format(filename, pos))
+        self.__map.close()
+        self.__map = None
+        self.__file.truncate(pos)
+
+    def __add_to_index(self, offset, length, deck_names, winner):
+        game_id = len(self.__offsets)
+        self.__offsets.append((offset, length))
+        self.__deck_names.append(deck_names)
+        self.__winners.append(winner)
+        self.__by_decks[deck_names].append(game_id)
+        self.__by_winner[winner].append(game_id)
+
+    def __mapped(self):
+        """
+        Map the whole file into memory, mapping it again if replays have been added since it was last mapped
+        """
+        self.__file.flush()
+        size = os.fstat(self.__file.fileno()).st_size
+        if self.__map is None or len(self.__map) != size:
+            if self.__map is not None:
+                self.__map.close()
+            self.__map = mmap.mmap(self.__file.fileno(), size, access=mmap.ACCESS_READ)
+        return self.__map
+
+    def append(self, replay, deck_names, winner=None):
+        """
+        Add a replay to the end of the archive
+
+        :param Replay replay: The replay to add
+        :param deck_names: The names of the decks the two players used
+        :type deck_names: (str, str)
+        :param int winner: The index of the winning deck, or None if the game was a draw
+        :return: The number of the replay in the archive
+        :rtype: int
+        """
+        output = io.StringIO()
+        replay.write_lines(output)
+        compressed = zlib.compress(output.getvalue().encode("utf-8"))
+        first_name, second_name = [name.encode("utf-8") for name in deck_names]
+        self.__file.seek(0, os.SEEK_END)
+        self.__file.write(ReplayArchive._RECORD.pack(len(compressed), len(first_name), len(second_name),
+                                                     -1 if winner is None else winner))
+        self.__file.write(first_name)
+        self.__file.write(second_name)
+        offset = self.__file.tell()
+        self.__file.write(compressed)
+        self.__add_to_index(offset, len(compressed), tuple(deck_names), winner)
+        return len(self.__offsets) - 1
+
+    def reader(self, game_id):
+        """
+        Open a replay in the archive, to read its moves one at a time
+
+        :param int game_id: The number of the replay
+        :rtype: ReplayReader
+        """
+        return ReplayReader(self.__read(game_id))
+
+    def get(self, game_id):
+        """
+        Read a replay from the archive
+
+        :param int game_id: The number of the replay
+        :rtype: Replay
+        """
+        replay = Replay()
+        replay.read_lines(self.__read(game_id))
+        return replay
+
+    def __read(self, game_id):
+        offset, length = self.__offsets[game_id]
+        data = zlib.decompress(self.__mapped()[offset:offset + length])
+        return io.StringIO(data.decode("utf-8"))
+
+    def deck_names(self, game_id):
+        """
+        Find the names of the decks used in a replay
+
+        :param int game_id: The number of the replay
+        :rtype: (str, str)
+        """
+        return self.__deck_names[game_id]
+
+    def winner(self, game_id):
+        """
+        Find which deck won the game in a replay
+
+        :param int game_id: The number of the replay
+        :return: The index of the winning deck, or None if the game was a draw
+        :rtype: int
+        """
+        return self.__winners[game_id]
+
+    def find(self, deck_names=None, winner=-1):
+        """
+        Find the replays of games between the given decks, or with the given winner, or both
+
+        :param deck_names: The names of the decks, in the order the players used them, or None for any decks
+        :type deck_names: (str, str)
+        :param int winner: The index of the winning deck, None for draws, or -1 (the default) for any result
+        :return: The numbers of the matching replays, in the order they were added
+        :rtype: list[int]
+        """
+        if deck_names is None and winner == -1:
+            return list(range(len(self.__offsets)))
+        elif deck_names is None:
+            return list(self.__by_winner.get(winner, []))
+        games = self.__by_decks.get(tuple(deck_names), [])
+        if winner == -1:
+            return list(games)
+        return [game_id for game_id in games if self.__winners[game_id] == winner]
+
+    def close(self):
+        """
+        Close the archive file
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__file.close()
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _open_replay(filename, mode):
+    """
+    Open a replay file for reading or writing text, compressing it with gzip if its name ends in ``.gz``
+    """
+    if filename.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(filename, mode + 'b'), encoding="utf-8")
+    return open(filename, mode)
+
+
 def record(game):
     """
     Ready a game for recording.  This function must be called before the game is played.
@@ -393,6 +740,7 @@ def record(game):
 
     replay = hearthbreaker.replay.Replay()
     replay.random.append(game.first_player)
+    replay.random_seed = game.random_seed
 
     game.players[0].agent = RecordingAgent(game.players[0].agent)
     game.players[1].agent = RecordingAgent(game.players[1].agent)
@@ -414,6 +762,7 @@ def record(game):
     _old_generate_random_between = game._generate_random_between
     _old_start_turn = game._start_turn
     _old_end_turn = game._end_turn
+    _old_chosen_action_agent = game._chosen_action_agent
 
     def random_choice(choice):
         result = _old_random_choice(choice)
@@ -434,10 +783,17 @@ def record(game):
         replay._moves.append(TurnStartMove())
         _old_start_turn()
 
+    def _chosen_action_agent(agent, position, target):
+        # The position and target chosen as part of an action are recorded as though the agent had chosen them
+        if isinstance(agent, RecordingAgent):
+            return RecordingAgent(_old_chosen_action_agent(agent.agent, position, target))
+        return _old_chosen_action_agent(agent, position, target)
+
     game.random_choice = random_choice
     game._generate_random_between = _generate_random_between
     game._end_turn = _end_turn
     game._start_turn = _start_turn
+    game._chosen_action_agent = _chosen_action_agent
 
     return replay
 
@@ -537,5 +893,5 @@ def playback(replay):
     game._start_turn = _start_turn
     game.pre_game = pre_game
 
-    game.__init__(replay.decks, [ReplayAgent(), ReplayAgent()])
+    game.__init__(replay.decks, [ReplayAgent(), ReplayAgent()], replay.random_seed)
     return game
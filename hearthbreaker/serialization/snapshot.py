@@ -0,0 +1,314 @@
+import struct
+
+from hearthbreaker.game_objects import Game
+
+__doc__ = """
+A compact binary format for game states.
+
+A snapshot holds the same information as the JSON written by
+:func:`hearthbreaker.serialization.serialization.serialize`, and is loaded back through the same ``__from_json__``
+methods, but is around a third of the size.  Every string, such as a card name or the name of a tag, is stored once in
+a string table and referred to by its position there.  Lists and dictionaries which appear more than once, such as the
+same effect on several minions, are stored once in a table of their own.  Small numbers and the first strings in the
+table take only a single byte.
+
+A snapshot is laid out as::
+
+    magic, version
+    number of strings, then for each: length, UTF-8 bytes
+    number of shared values, then for each: length, encoded value
+    encoded state
+
+Lengths, counts and indices are stored as unsigned LEB128 numbers.
+"""
+
+MAGIC = b"HBS"
+VERSION = 1
+
+# A single byte starts each value.  The bytes below _SMALL_INT_END are numbers in themselves, and those from
+# _SMALL_STRING onwards are indices into the string table
+_SMALL_INT_END = 0x80
+_NONE = 0x80
+_FALSE = 0x81
+_TRUE = 0x82
+_INT = 0x83
+_NEGATIVE_INT = 0x84
+_FLOAT = 0x85
+_STRING = 0x86
+_LIST = 0x87
+_DICT = 0x88
+_SHARED = 0x89
+_SMALL_STRING = 0xa0
+_SMALL_STRING_COUNT = 0x100 - _SMALL_STRING
+
+# Lists and dictionaries which encode to fewer bytes than this are written out each time they appear, as a
+# reference to a shared value would save little or nothing
+_MIN_SHARED_LENGTH = 12
+
+_float = struct.Struct("<d")
+_SMALL_UINTS = [bytes((number,)) for number in range(0, 0x80)]
+
+
+def _uint(number):
+    """
+    Encode a non-negative number as unsigned LEB128
+    """
+    if number < 0x80:
+        return _SMALL_UINTS[number]
+    encoded = bytearray()
+    while number >= 0x80:
+        encoded.append((number & 0x7f) | 0x80)
+        number >>= 7
+    encoded.append(number)
+    return bytes(encoded)
+
+
+def _read_uint(data, pos):
+    number = data[pos]
+    pos += 1
+    if number < 0x80:
+        return number, pos
+    number &= 0x7f
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings = {}
+        self.string_codes = {}
+        self.key_codes = {}
+        self.shared = {}
+        self.out = bytearray()
+
+    def string(self, string):
+        """
+        Add a new string to the string table, and find the bytes which refer to it
+        """
+        index = self.strings[string] = len(self.strings)
+        if index < _SMALL_STRING_COUNT:
+            code = bytes((_SMALL_STRING + index,))
+        else:
+            code = bytes((_STRING,)) + _uint(index)
+        self.string_codes[string] = code
+        return code
+
+    def key(self, key):
+        """
+        Find the bytes which refer to the given dictionary key, which is always a position in the string table
+        """
+        if not isinstance(key, str):
+            raise TypeError("Keys must be strings, not {0}".format(type(key).__name__))
+        if key not in self.strings:
+            self.string(key)
+        code = self.key_codes[key] = _uint(self.strings[key])
+        return code
+
+    def encode(self, value):
+        """
+        Add the encoded value to the end of the output
+        """
+        out = self.out
+        value_type = type(value)
+        if value_type is str:
+            code = self.string_codes.get(value)
+            out += code if code is not None else self.string(value)
+            return
+        elif value_type is int:
+            if 0 <= value < _SMALL_INT_END:
+                out.append(value)
+            elif value >= 0:
+                out.append(_INT)
+                out += _uint(value)
+            else:
+                out.append(_NEGATIVE_INT)
+                out += _uint(-value - 1)
+            return
+        elif value is None:
+            out.append(_NONE)
+            return
+        elif value_type is bool:
+            out.append(_TRUE if value else _FALSE)
+            return
+
+        start = len(out)
+        if value_type is list or value_type is tuple:
+            out.append(_LIST)
+            out += _uint(len(value))
+            encode = self.encode
+            for item in value:
+                encode(item)
+        elif value_type is dict:
+            out.append(_DICT)
+            out += _uint(len(value))
+            encode = self.encode
+            key_codes = self.key_codes
+            for key, item in value.items():
+                code = key_codes.get(key)
+                out += code if code is not None else self.key(key)
+                encode(item)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _float.pack(value)
+            return
+        elif isinstance(value, (str, int)):
+            # Subclasses of the basic types, such as enumerations, are written out as the basic type
+            self.encode(str(value) if isinstance(value, str) else int(value))
+            return
+        elif isinstance(value, (list, tuple, dict)):
+            self.encode(dict(value) if isinstance(value, dict) else list(value))
+            return
+        else:
+            self.encode(value.__to_json__())
+            return
+
+        if len(out) - start < _MIN_SHARED_LENGTH:
+            return
+        # Shared values are numbered in the order they are finished, so each one only refers to values before it
+        encoded = bytes(out[start:])
+        index = self.shared.get(encoded)
+        if index is None:
+            index = self.shared[encoded] = len(self.shared)
+        del out[start:]
+        out.append(_SHARED)
+        out += _uint(index)
+
+
+class _Decoder:
+    def __init__(self, data):
+        self.data = data
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a game snapshot")
+        version, pos = _read_uint(data, len(MAGIC))
+        if version != VERSION:
+            raise ValueError("Unsupported snapshot version {0}".format(version))
+
+        count, pos = _read_uint(data, pos)
+        self.strings = []
+        for index in range(count):
+            length, pos = _read_uint(data, pos)
+            self.strings.append(str(data[pos:pos + length], "utf-8"))
+            pos += length
+
+        count, pos = _read_uint(data, pos)
+        self.shared = []
+        for index in range(count):
+            length, pos = _read_uint(data, pos)
+            self.shared.append(pos)
+            pos += length
+        self.start = pos
+
+    def decode(self, pos):
+        """
+        Decode the value starting at the given position
+
+        :return: The value, and the position after it
+        """
+        data = self.data
+        tag = data[pos]
+        pos += 1
+        if tag < _SMALL_INT_END:
+            return tag, pos
+        elif tag >= _SMALL_STRING:
+            return self.strings[tag - _SMALL_STRING], pos
+        elif tag == _DICT:
+            length, pos = _read_uint(data, pos)
+            strings = self.strings
+            value = {}
+            for index in range(length):
+                key = data[pos]
+                if key < 0x80:
+                    pos += 1
+                else:
+                    key, pos = _read_uint(data, pos)
+                value[strings[key]], pos = self.decode(pos)
+            return value, pos
+        elif tag == _SHARED:
+            index, pos = _read_uint(data, pos)
+            # Shared values are decoded again each time they are used, so that nothing loaded from them is shared
+            return self.decode(self.shared[index])[0], pos
+        elif tag == _LIST:
+            length, pos = _read_uint(data, pos)
+            value = []
+            for index in range(length):
+                item, pos = self.decode(pos)
+                value.append(item)
+            return value, pos
+        elif tag == _STRING:
+            index, pos = _read_uint(data, pos)
+            return self.strings[index], pos
+        elif tag == _NONE:
+            return None, pos
+        elif tag == _FALSE:
+            return False, pos
+        elif tag == _TRUE:
+            return True, pos
+        elif tag == _INT:
+            return _read_uint(data, pos)
+        elif tag == _NEGATIVE_INT:
+            value, pos = _read_uint(data, pos)
+            return -value - 1, pos
+        elif tag == _FLOAT:
+            return _float.unpack_from(data, pos)[0], pos + _float.size
+        raise ValueError("Unknown value type {0:#x} at position {1}".format(tag, pos - 1))
+
+
+def encode(value):
+    """
+    Encode a value as a snapshot.  The value can be anything which could be written as JSON, and may contain objects
+    with a ``__to_json__`` method, which are encoded as the value that method returns.
+
+    :param value: The value to encode
+    :rtype: bytes
+    """
+    encoder = _Encoder()
+    encoder.encode(value)
+    parts = [MAGIC, _uint(VERSION), _uint(len(encoder.strings))]
+    for string in encoder.strings:
+        encoded = string.encode("utf-8")
+        parts.append(_uint(len(encoded)))
+        parts.append(encoded)
+    parts.append(_uint(len(encoder.shared)))
+    for encoded in encoder.shared:
+        parts.append(_uint(len(encoded)))
+        parts.append(encoded)
+    parts.append(encoder.out)
+    return b"".join(parts)
+
+
+def decode(data):
+    """
+    Decode a value from a snapshot.  The value is the same as would be found by writing the encoded value to JSON and
+    reading it back, so tuples are read as lists.
+
+    :param bytes data: The snapshot
+    """
+    decoder = _Decoder(memoryview(data))
+    return decoder.decode(decoder.start)[0]
+
+
+def serialize(game):
+    """
+    Encode the given game as a snapshot, which can be used to re-construct the game exactly as it is now
+
+    :param hearthbreaker.game_objects.Game game: The game to serialize
+    :rtype: bytes
+    """
+    return encode(game)
+
+
+def deserialize(data, agents):
+    """
+    Decode a game from a snapshot
+
+    :param bytes data: The snapshot of the game
+    :param list agents: The agents to play the game for each player
+    :rtype: :class:`hearthbreaker.game_objects.Game`
+    """
+    return Game.__from_json__(decode(data), agents)
@@ -0,0 +1,469 @@
+import abc
+import argparse
+import collections
+import math
+import multiprocessing
+import random
+import sys
+import timeit
+
+from hearthbreaker.agents import registry
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Game, Deck, card_lookup
+
+__doc__ = """
+Runs batches of games between two decks, spread across a pool of worker processes.
+
+Each game is given its own seed, derived from the seed of the batch, so the results of a batch do not depend on how
+many workers it was spread across, or which worker happened to play which game.  Results are streamed back to the
+caller as each game finishes.
+
+Rather than playing a fixed number of games, a batch can be stopped as soon as a :class:`StoppingRule` is satisfied,
+such as once the win rate is known precisely enough, or once a sequential test can tell which deck is favoured.
+Lopsided matchups are then decided after far fewer games than close ones.
+
+Running a simulation
+~~~~~~~~~~~~~~~~~~~~
+
+From the command line: ::
+
+    python -m hearthbreaker.sim example.hsdeck zoo.hsdeck --games 1000 --processes 8 --seed 42
+    python -m hearthbreaker.sim example.hsdeck zoo.hsdeck --games 10000 --sprt 0.05
+
+Or as a library: ::
+
+    decks = [DeckList.from_file("example.hsdeck"), DeckList.from_file("zoo.hsdeck")]
+    report = run_simulation(decks, 1000, processes=8, seed=42)
+    print(report)
+"""
+
+#: The outcome of a single simulated game.  ``winner`` is the index of the winning deck, or None for a draw
+GameResult = collections.namedtuple("GameResult", ["game_id", "seed", "winner", "turns", "duration"])
+
+
+class DeckList:
+    """
+    A description of a deck by the names of its cards, rather than by card instances.  Unlike a
+    :class:`hearthbreaker.game_objects.Deck`, a DeckList can be sent to another process, and used to create any number
+    of fresh decks.
+    """
+
+    def __init__(self, name, card_names, character_class):
+        """
+        :param str name: The name used to refer to this deck in reports
+        :param list[str] card_names: The names of the 30 cards in this deck
+        :param int character_class: A constant from :class:`hearthbreaker.constants.CHARACTER_CLASS`
+        """
+        self.name = name
+        self.card_names = card_names
+        self.character_class = character_class
+
+    def create_deck(self):
+        """
+        Create a new deck containing new instances of each card in this list
+
+        :rtype: hearthbreaker.game_objects.Deck
+        """
+        return Deck([card_lookup(card_name) for card_name in self.card_names], self.character_class)
+
+    @staticmethod
+    def from_file(filename, name=None):
+        """
+        Read a deck file in cockatrice format, with a count and a card name in English on each line.  The character
+        class is inferred from the cards present, or defaults to mage.
+
+        :param str filename: The file to read the deck from
+        :param str name: The name of the deck.  If None (the default), the filename is used.
+        :rtype: DeckList
+        """
+        card_names = []
+        character_class = CHARACTER_CLASS.MAGE
+        with open(filename, "r") as deck_file:
+            for line in deck_file.read().splitlines():
+                if not line.strip():
+                    continue
+                parts = line.split(" ", 1)
+                card = card_lookup(parts[1])
+                if card.character_class != CHARACTER_CLASS.ALL:
+                    character_class = card.character_class
+                card_names.extend([card.ref_name] * int(parts[0]))
+
+        if name is None:
+            name = filename
+        return DeckList(name, card_names, character_class)
+
+
+class SimulationReport:
+    """
+    Aggregates the results of a batch of games between two decks
+    """
+
+    def __init__(self, deck_names, seed=None):
+        """
+        :param list[str] deck_names: The names of the two decks being played against each other
+        :param int seed: The seed the batch was run with, if any
+        """
+        self.deck_names = deck_names
+        self.seed = seed
+        self.games = 0
+        self.wins = [0, 0]
+        self.draws = 0
+        self.total_turns = 0
+        self.total_duration = 0.0
+
+    def add_result(self, result):
+        """
+        Add the result of a single game to this report
+
+        :param GameResult result: The result to add
+        """
+        self.games += 1
+        if result.winner is None:
+            self.draws += 1
+        else:
+            self.wins[result.winner] += 1
+        self.total_turns += result.turns
+        self.total_duration += result.duration
+
+    def win_rate(self, deck_index):
+        """
+        The fraction of games won by the given deck, with draws counting as losses
+
+        :param int deck_index: The index of the deck (0 or 1)
+        :rtype: float
+        """
+        if self.games == 0:
+            return 0.0
+        return self.wins[deck_index] / self.games
+
+    def average_turns(self):
+        if self.games == 0:
+            return 0.0
+        return self.total_turns / self.games
+
+    def average_duration(self):
+        if self.games == 0:
+            return 0.0
+        return self.total_duration / self.games
+
+    def __str__(self):
+        lines = ["{0} games (seed {1})".format(self.games, self.seed)]
+        for index in range(0, 2):
+            lines.append("  {0}: {1} wins ({2:.1%})".format(self.deck_names[index], self.wins[index],
+                                                            self.win_rate(index)))
+        lines.append("  draws: {0}".format(self.draws))
+        lines.append("  average turns: {0:.1f}".format(self.average_turns()))
+        lines.append("  average game time: {0:.2f}ms".format(self.average_duration() * 1000))
+        return "\n".join(lines)
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    Find the Wilson score interval for the chance of success, given the number of successes in a number of trials
+
+    :param int successes: The number of successes, such as games won
+    :param int trials: The number of trials, such as games played
+    :param float z: The number of standard deviations the interval covers.  The default gives a 95% interval.
+    :return: The lower and upper bounds of the interval
+    :rtype: (float, float)
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+class StoppingRule(metaclass=abc.ABCMeta):
+    """
+    Decides when enough games have been played between two decks to know how well the first deck does, so that a
+    batch of games can be stopped early.  Draws count as losses for the first deck.
+    """
+
+    @abc.abstractmethod
+    def is_decided(self, wins, games):
+        """
+        Check whether enough games have been played
+
+        :param int wins: The number of games won by the first deck
+        :param int games: The number of games played
+        :rtype: bool
+        """
+        pass
+
+
+class IntervalStoppingRule(StoppingRule):
+    """
+    Stops once the Wilson score interval for the win rate of the first deck is narrow enough
+    """
+
+    def __init__(self, width, z=1.96):
+        """
+        :param float width: The widest the interval can be, as a fraction.  0.1 stops once the win rate is known to
+                            within about five percent either way.
+        :param float z: The number of standard deviations the interval covers.  The default gives a 95% interval.
+        """
+        self.width = width
+        self.z = z
+
+    def is_decided(self, wins, games):
+        low, high = wilson_interval(wins, games, self.z)
+        return high - low <= self.width
+
+    def __repr__(self):
+        return "interval(width={0}, z={1})".format(self.width, self.z)
+
+
+class SequentialStoppingRule(StoppingRule):
+    """
+    Stops once a sequential probability ratio test can tell whether the first deck is favoured or not.  The test
+    compares the hypothesis that the first deck wins ``0.5 - margin`` of its games against the hypothesis that it wins
+    ``0.5 + margin`` of them, so lopsided matchups are decided within a few dozen games, while close ones run on.
+    """
+
+    def __init__(self, margin=0.05, alpha=0.05, beta=0.05):
+        """
+        :param float margin: How far from even the win rates in the two hypotheses are
+        :param float alpha: The chance of deciding the first deck is favoured when it is not
+        :param float beta: The chance of deciding the first deck is not favoured when it is
+        """
+        self.margin = margin
+        self.alpha = alpha
+        self.beta = beta
+        low = 0.5 - margin
+        high = 0.5 + margin
+        self.__win_ratio = math.log(high / low)
+        self.__loss_ratio = math.log((1 - high) / (1 - low))
+        self.__upper_bound = math.log((1 - beta) / alpha)
+        self.__lower_bound = math.log(beta / (1 - alpha))
+
+    def is_decided(self, wins, games):
+        log_likelihood_ratio = wins * self.__win_ratio + (games - wins) * self.__loss_ratio
+        return log_likelihood_ratio >= self.__upper_bound or log_likelihood_ratio <= self.__lower_bound
+
+    def __repr__(self):
+        return "sprt(margin={0}, alpha={1}, beta={2})".format(self.margin, self.alpha, self.beta)
+
+
+def add_stopping_arguments(parser):
+    """
+    Add the command line options for stopping batches of games early to an argument parser
+
+    :param argparse.ArgumentParser parser: The parser to add the options to
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--precision", type=float, default=None, metavar="WIDTH",
+                       help="Stop once the 95%% interval of the win rate is narrower than this")
+    group.add_argument("--sprt", type=float, default=None, metavar="MARGIN",
+                       help="Stop once a sequential test decides whether the first deck wins more than half its "
+                            "games, with this margin either side of even")
+
+
+def stopping_rule_from_args(args):
+    """
+    Create the stopping rule chosen by the options added with :func:`add_stopping_arguments`
+
+    :param argparse.Namespace args: The parsed command line
+    :return: The stopping rule, or None if games should not be stopped early
+    :rtype: StoppingRule
+    """
+    if args.precision is not None:
+        return IntervalStoppingRule(args.precision)
+    if args.sprt is not None:
+        return SequentialStoppingRule(args.sprt)
+    return None
+
+
+def game_seed(seed, game_id):
+    """
+    Derive the seed for a single game from the seed for the whole batch.
+
+    :param int seed: The seed of the batch
+    :param int game_id: The index of the game within the batch
+    :rtype: int
+    """
+    return random.Random(seed * 1000003 + game_id).getrandbits(32)
+
+
+def play_game(game_id, seed, deck_lists, agent_names):
+    """
+    Play a single game to completion
+
+    :param int game_id: The index of this game within its batch
+    :param int seed: The seed to use for this game's random numbers
+    :param list[DeckList] deck_lists: The two decks to play against each other
+    :param list[str] agent_names: The names of the agents playing each deck, from
+                                  :data:`hearthbreaker.agents.registry`
+    :rtype: GameResult
+    """
+    decks = [deck_list.create_deck() for deck_list in deck_lists]
+    game = Game(decks, [registry.create_agent(name) for name in agent_names], seed)
+    turns = 0
+
+    def turn_started():
+        nonlocal turns
+        turns += 1
+
+    for player in game.players:
+        player.bind("turn_started", turn_started)
+
+    start_time = timeit.default_timer()
+    game.start()
+    duration = timeit.default_timer() - start_time
+
+    winner = None
+    for player in game.players:
+        if not player.hero.dead and player.opponent.hero.dead:
+            winner = decks.index(player.deck)
+    return GameResult(game_id, seed, winner, turns, duration)
+
+
+def _play_game_task(task):
+    return play_game(*task)
+
+
+def simulate(deck_lists, game_count, processes=None, seed=None, agent_names=("Random", "Random"), chunk_size=None,
+             stopping_rule=None):
+    """
+    Play a batch of games between two decks, yielding the result of each game as soon as it is available.  Results
+    are not necessarily yielded in the order of their game id, unless a stopping rule is given.
+
+    :param list[DeckList] deck_lists: The two decks to play against each other
+    :param int game_count: The number of games to play
+    :param int processes: The number of worker processes to use.  If None, one per CPU is used.  If 1, the games
+                          are played in this process.
+    :param int seed: The seed for the batch.  Each game's seed is derived from it with :func:`game_seed`
+    :param list[str] agent_names: The names of the agents playing each deck
+    :param int chunk_size: How many games to send to a worker at a time.  If None, a size is chosen which gives each
+                           worker several chunks.
+    :param StoppingRule stopping_rule: If present, the batch stops as soon as this rule is satisfied, and may play
+                                       fewer than ``game_count`` games.  Results are then yielded in the order of their
+                                       game id, and the rule is checked after each one, so the games played do not
+                                       depend on the number of workers.
+    :rtype: generator of GameResult
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    results = _simulate(deck_lists, game_count, processes, seed, agent_names, chunk_size)
+    if stopping_rule is None:
+        for result in results:
+            yield result
+        return
+
+    waiting = {}
+    next_id = 0
+    wins = 0
+    try:
+        for result in results:
+            waiting[result.game_id] = result
+            while next_id in waiting:
+                result = waiting.pop(next_id)
+                next_id += 1
+                if result.winner == 0:
+                    wins += 1
+                yield result
+                if stopping_rule.is_decided(wins, next_id):
+                    return
+    finally:
+        # Stops the workers playing any games after the last one needed
+        results.close()
+
+
+def _simulate(deck_lists, game_count, processes, seed, agent_names, chunk_size):
+    tasks = ((game_id, game_seed(seed, game_id), deck_lists, agent_names) for game_id in range(game_count))
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    if processes == 1:
+        for task in tasks:
+            yield _play_game_task(task)
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, game_count // (processes * 8))
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap_unordered(_play_game_task, tasks, chunk_size):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run_simulation(deck_lists, game_count, processes=None, seed=None, agent_names=("Random", "Random"),
+                   callback=None, stopping_rule=None):
+    """
+    Play a batch of games between two decks, and aggregate the results.
+
+    :param list[DeckList] deck_lists: The two decks to play against each other
+    :param int game_count: The number of games to play, at most
+    :param int processes: The number of worker processes to use.  See :func:`simulate`
+    :param int seed: The seed for the batch.  If None, a seed is chosen and stored in the report.
+    :param list[str] agent_names: The names of the agents playing each deck
+    :param function callback: If present, called with each :class:`GameResult` as it arrives
+    :param StoppingRule stopping_rule: If present, the batch stops as soon as this rule is satisfied.  See
+                                       :func:`simulate`
+    :rtype: SimulationReport
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    report = SimulationReport([deck_list.name for deck_list in deck_lists], seed)
+    for result in simulate(deck_lists, game_count, processes, seed, agent_names, stopping_rule=stopping_rule):
+        report.add_result(result)
+        if callback:
+            callback(result)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hearthbreaker.sim",
+                                     description="Play a batch of games between two decks")
+    parser.add_argument("deck1", help="The deck file for the first player")
+    parser.add_argument("deck2", help="The deck file for the second player")
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="The number of games to play, at most if stopping early")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="The number of worker processes (default: one per CPU)")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="The seed for the batch")
+    parser.add_argument("-a", "--agents", nargs=2, default=["Random", "Random"], metavar="AGENT",
+                        help="The agents playing each deck, one of: " + ", ".join(registry.get_names()))
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the result of each game")
+    parser.add_argument("--profile", default=None, metavar="FILE",
+                        help="Play the games in this process with a profiler enabled, print the most expensive "
+                             "events, cards and actions, and write collapsed stacks for a flame graph to FILE")
+    add_stopping_arguments(parser)
+    args = parser.parse_args(argv)
+
+    deck_lists = [DeckList.from_file(args.deck1), DeckList.from_file(args.deck2)]
+
+    def print_result(result):
+        if result.winner is None:
+            winner = "draw"
+        else:
+            winner = deck_lists[result.winner].name
+        print("game {0}: {1} in {2} turns ({3:.2f}ms)".format(result.game_id, winner, result.turns,
+                                                              result.duration * 1000))
+
+    callback = print_result if args.verbose else None
+    start_time = timeit.default_timer()
+    if args.profile is None:
+        report = run_simulation(deck_lists, args.games, args.processes, args.seed, args.agents, callback,
+                                stopping_rule_from_args(args))
+    else:
+        from hearthbreaker.profiling import Profiler
+        with Profiler() as profiler:
+            report = run_simulation(deck_lists, args.games, 1, args.seed, args.agents, callback,
+                                    stopping_rule_from_args(args))
+    print(report)
+    print("  wall time: {0:.2f}s".format(timeit.default_timer() - start_time))
+    if args.profile is not None:
+        print(profiler.report(limit=30))
+        with open(args.profile, "w") as collapsed:
+            profiler.write_collapsed(collapsed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -74,6 +74,10 @@ class GiveEffect(Action):
         }
 
 
+# GiveEffect is written out with the same name as Give, which loads it when it finds effects rather than auras
+Action.registry.register("give", Give)
+
+
 class Take(Action):
     def __init__(self, aura):
         if isinstance(aura, Action):
@@ -83,9 +87,8 @@ class Take(Action):
             self.aura = aura
 
     def act(self, actor, target):
-        aura_json = str(self.aura)
         for aura in target.auras:
-            if str(aura) == aura_json:
+            if aura.eq(self.aura):
                 target.remove_aura(aura)
                 break
 
@@ -176,6 +179,10 @@ class MinimumHealth(MinionAction):
         }
 
 
+# The name is misspelled in the JSON, and is kept so that games saved before can still be loaded
+Action.registry.register("minimun_health", MinimumHealth)
+
+
 class SetAttack(ReversibleAction):
     def __init__(self, attack):
         self.attack = attack
@@ -408,9 +415,11 @@ class Taunt(MinionAction):
 class Stealth(MinionAction):
     def act(self, actor, target):
         target.stealth += 1
+        target.player.game.board_version += 1
 
     def unact(self, actor, target):
         target.stealth -= 1
+        target.player.game.board_version += 1
 
     def __to_json__(self):
         return {
@@ -514,9 +523,11 @@ class NoSpellTarget(MinionAction):
 
     def act(self, actor, target):
         target.can_be_targeted_by_spells = False
+        target.player.game.board_version += 1
 
     def unact(self, actor, target):
         target.can_be_targeted_by_spells = True
+        target.player.game.board_version += 1
 
     def __to_json__(self):
         return {
@@ -725,6 +736,11 @@ class Duplicate(Action):
         if not self.minion:
             self.minion = hearthbreaker.proxies.TrackingProxyCharacter(self.__min_ref, player.game)
 
+    def copy(self):
+        new_duplicate = super().copy()
+        new_duplicate.minion = copy.copy(self.minion)
+        return new_duplicate
+
     def act(self, actor, target):
         minion = self.minion.resolve(target.game)
         if minion:
@@ -1,6 +1,8 @@
 import abc
+import importlib
 import json
 import string
+import types
 import hearthbreaker.constants
 
 
@@ -16,13 +18,134 @@ class JSONObject(metaclass=abc.ABCMeta):
         pass
 
     def eq(self, other):
-        return str(self) == str(other)
+        """
+        Check whether this tag is the same as another, meaning that both would be written out as the same JSON.
+
+        :param JSONObject other: The tag to compare with
+        :rtype: bool
+        """
+        return _same_json(self, other)
+
+    def copy(self):
+        """
+        Create a copy of this tag which can be given to a copy of the game.
+
+        Any tags and lists this tag holds are copied in turn.  State which refers to the game this tag was applied in,
+        such as its target or the functions it has bound, is not copied, since it is recreated when the copy is
+        applied.  This avoids :func:`copy.deepcopy`, which would follow those references through the entire game.
+
+        :rtype: JSONObject
+        """
+        new_tag = type(self).__new__(type(self))
+        new_tag.__dict__.update((key, _copy_tag_state(value)) for key, value in self.__dict__.items())
+        return new_tag
 
     def __str__(self):
         return json.dumps(self.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
 
 
+def _same_json(first, second):
+    # Compares the JSON that two values would be written out as, without building the strings.  The comparison stops
+    # at the first difference.
+    if first is second:
+        return True
+    if hasattr(first, "__to_json__"):
+        first = first.__to_json__()
+    if hasattr(second, "__to_json__"):
+        second = second.__to_json__()
+    if isinstance(first, dict):
+        return isinstance(second, dict) and first.keys() == second.keys() and \
+            all(_same_json(value, second[key]) for key, value in first.items())
+    if isinstance(first, (list, tuple)):
+        return isinstance(second, (list, tuple)) and len(first) == len(second) and \
+            all(_same_json(value, other_value) for value, other_value in zip(first, second))
+    # The type is checked as well, since 1, 1.0 and True are equal but are written out differently
+    return type(first) is type(second) and first == second
+
+
+def _copy_tag_state(value):
+    if value is None or isinstance(value, (int, str, float, Player)):
+        return value
+    elif isinstance(value, JSONObject):
+        return value.copy()
+    elif isinstance(value, list):
+        return [_copy_tag_state(item) for item in value]
+    elif isinstance(value, tuple):
+        return tuple(_copy_tag_state(item) for item in value)
+    elif isinstance(value, dict):
+        # Dictionaries on tags hold the state for each character they have been applied to
+        return {}
+    shared_types, game_types = _tag_state_types()
+    if isinstance(value, shared_types):
+        return value
+    elif isinstance(value, game_types):
+        return None
+    raise TypeError("Tags holding a {0} can't be copied".format(type(value).__name__))
+
+
+_state_types = None
+
+
+def _tag_state_types():
+    # Cards and classes are only definitions, so they are shared with the copy.  Characters, the proxies tracking them
+    # and the functions bound to their events belong to the game the tag was applied in, and are set again when the
+    # copy is applied.  The game objects are imported here, since they import the tags themselves.
+    global _state_types
+    if _state_types is None:
+        from hearthbreaker.game_objects import Card, Character
+        from hearthbreaker.proxies import ProxyCharacter
+        _state_types = ((Card, type), (Character, ProxyCharacter, types.MethodType, types.FunctionType))
+    return _state_types
+
+
+class TagRegistry:
+    """
+    Finds the classes of tags from the names they are written out with in JSON.
+
+    A name such as ``change_attack`` is normally that of the ``ChangeAttack`` class in the module for that kind of
+    tag.  Each name is looked up there the first time it is loaded, and kept for every load after that.  Tags which
+    are written out with some other name are registered with :meth:`register`.
+    """
+
+    def __init__(self, module_name, suffix=""):
+        """
+        :param str module_name: The name of the module holding the tags
+        :param str suffix: The end of each class name which is not part of the name in the JSON, such as "Selector"
+        """
+        self.module_name = module_name
+        self.suffix = suffix
+        self.__classes = {}
+
+    def register(self, name, cls):
+        """
+        Load tags with the given name as instances of the given class
+
+        :param str name: The name in the JSON
+        :param type cls: The class of the tags
+        """
+        self.__classes[name] = cls
+
+    def find(self, name):
+        """
+        Find the class of tags with the given name
+
+        :param str name: The name in the JSON
+        :rtype: type
+        """
+        try:
+            return self.__classes[name]
+        except KeyError:
+            module = importlib.import_module(self.module_name)
+            cls = getattr(module, string.capwords(name, '_').replace("_", "") + self.suffix)
+            self.__classes[name] = cls
+            return cls
+
+
 class Aura(JSONObject):
+    #: The number of times :meth:`match` has been called on any aura, so that benchmarks can count how many checks
+    #: keeping auras up to date takes
+    match_count = 0
+
     def __init__(self, action, selector):
         self.target = None
         self.action = action
@@ -42,6 +165,7 @@ class Aura(JSONObject):
             self.action.unact(self.target, target)
 
     def match(self, obj):
+        Aura.match_count += 1
         return self.selector.match(self.target, obj)
 
     def __to_json__(self):
@@ -140,6 +264,9 @@ class Picker(JSONObject, metaclass=abc.ABCMeta):
 
 
 class Selector(JSONObject, metaclass=abc.ABCMeta):
+    #: The classes of each selector, by the name they are written out with in JSON
+    registry = TagRegistry("hearthbreaker.tags.selector", "Selector")
+
     @abc.abstractmethod
     def get_targets(self, source, target=None):
         pass
@@ -148,12 +275,19 @@ class Selector(JSONObject, metaclass=abc.ABCMeta):
     def match(self, source, obj):
         pass
 
+    def match_depends_on_board(self):
+        """
+        Check whether :meth:`match` could give a different answer for a minion when another minion is added to or
+        removed from the board.  If not, then auras using this selector only need to be checked against the minion
+        which was added.
+
+        :rtype: bool
+        """
+        return True
+
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.selector as selector_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "") + "Selector"
-        cls = getattr(selector_mod, cls_name)
+        cls = Selector.registry.find(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -163,6 +297,8 @@ class Selector(JSONObject, metaclass=abc.ABCMeta):
 
 
 class Action(JSONObject, metaclass=abc.ABCMeta):
+    #: The classes of each action, by the name they are written out with in JSON
+    registry = TagRegistry("hearthbreaker.tags.action")
 
     @abc.abstractmethod
     def act(self, actor, target):
@@ -170,10 +306,7 @@ class Action(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.action as action_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "")
-        cls = getattr(action_mod, cls_name)
+        cls = Action.registry.find(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -225,6 +358,9 @@ class MinionAction(ReversibleAction, metaclass=abc.ABCMeta):
 
 
 class Event(JSONObject, metaclass=abc.ABCMeta):
+    #: The classes of each event, by the name they are written out with in JSON
+    registry = TagRegistry("hearthbreaker.tags.event")
+
     def __init__(self, event_name, condition=None):
         self.event_name = event_name
         self.condition = condition
@@ -245,10 +381,7 @@ class Event(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(event_name, **kwargs):
-        import hearthbreaker.tags.event as event_mod
-
-        cls_name = string.capwords(event_name, '_').replace("_", "")
-        cls = getattr(event_mod, cls_name)
+        cls = Event.registry.find(event_name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -365,16 +498,30 @@ class Effect(JSONObject):
 
 
 class Condition(JSONObject, metaclass=abc.ABCMeta):
+    #: The classes of each condition, by the name they are written out with in JSON
+    registry = TagRegistry("hearthbreaker.tags.condition")
+
+    #: Whether this condition could change for a minion when another minion is added to or removed from the board,
+    #: for example because it depends on where the minion is or how many minions there are
+    depends_on_board = True
+
     @abc.abstractmethod
     def evaluate(self, target, *args):
         pass
 
+    def collection_key(self):
+        """
+        Get the key which :class:`hearthbreaker.game_objects.CardCollection` can use to find the cards meeting this
+        condition.  This is only possible for conditions which depend on nothing but the card itself.
+
+        :return: A pair of the name of a property and the value a card must have for it, or None if the cards meeting
+                 this condition have to be checked one at a time
+        """
+        return None
+
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.condition as action_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "")
-        cls = getattr(action_mod, cls_name)
+        cls = Condition.registry.find(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -461,18 +608,23 @@ class CardQuery(JSONObject):
         self.make_copy = make_copy
 
     def get_card(self, player):
-        from hearthbreaker.game_objects import card_lookup, get_cards
+        from hearthbreaker.game_objects import card_lookup, get_collection
         if self.name:
             return card_lookup(self.name)
 
+        conditions = self.conditions
         if self.source == CARD_SOURCE.COLLECTION:
-            card_list = get_cards()
+            # The cards meeting the conditions which the collection is indexed by are looked up directly, and only
+            # the other conditions are checked for each card
+            keys = [condition.collection_key() for condition in conditions]
+            card_list = get_collection().find([key for key in keys if key is not None])
+            conditions = [condition for condition, key in zip(conditions, keys) if key is None]
         elif self.source == CARD_SOURCE.MY_DECK:
-            card_list = filter(lambda c: not c.drawn, player.deck.cards)
+            card_list = player.deck.undrawn_cards()
         elif self.source == CARD_SOURCE.MY_HAND:
             card_list = player.hand
         elif self.source == CARD_SOURCE.OPPONENT_DECK:
-            card_list = filter(lambda c: not c.drawn, player.opponent.deck.cards)
+            card_list = player.opponent.deck.undrawn_cards()
         elif self.source == CARD_SOURCE.OPPONENT_HAND:
             card_list = player.opponent.hand
         elif self.source == CARD_SOURCE.LIST:
@@ -486,7 +638,7 @@ class CardQuery(JSONObject):
         def check_condition(condition):
             return lambda c: condition.evaluate(player, c)
 
-        for condition in self.conditions:
+        for condition in conditions:
             card_list = filter(check_condition(condition), card_list)
 
         card_list = [card for card in card_list]
@@ -498,7 +650,9 @@ class CardQuery(JSONObject):
         else:
             chosen_card = player.game.random_choice(card_list)
 
-        if self.source == CARD_SOURCE.COLLECTION or self.source == CARD_SOURCE.LIST or self.make_copy:
+        if self.source == CARD_SOURCE.COLLECTION:
+            return type(chosen_card)()
+        elif self.source == CARD_SOURCE.LIST or self.make_copy:
             return chosen_card
         elif self.source == CARD_SOURCE.MY_DECK:
             chosen_card.drawn = True
@@ -515,6 +669,12 @@ class CardQuery(JSONObject):
             player.opponent.hand.remove(chosen_card)
             return chosen_card
 
+    def copy(self):
+        query = super().copy()
+        if self.source_list:
+            query.source_list = [type(card)() for card in self.source_list]
+        return query
+
     def __to_json__(self):
         json_obj = {}
         if self.name:
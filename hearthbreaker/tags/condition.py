@@ -17,6 +17,9 @@ class IsSecret(Condition):
     def evaluate(self, target, obj, *args):
         return obj.is_secret()
 
+    def collection_key(self):
+        return ("is_secret", True)
+
     def __to_json__(self):
         return {
             'name': 'is_secret'
@@ -27,6 +30,9 @@ class IsSpell(Condition):
     def evaluate(self, target, obj, *args):
         return obj.is_spell()
 
+    def collection_key(self):
+        return ("is_spell", True)
+
     def __to_json__(self):
         return {
             'name': 'is_spell'
@@ -71,6 +77,9 @@ class ManaCost(Condition):
     def evaluate(self, target, obj, *args):
         return obj.mana == self.cost
 
+    def collection_key(self):
+        return ("mana", self.cost)
+
     def __to_json__(self):
         return {
             'name': 'mana_cost',
@@ -79,9 +88,14 @@ class ManaCost(Condition):
 
 
 class IsMinion(Condition):
+    depends_on_board = False
+
     def evaluate(self, target, minion, *args):
         return minion.is_minion()
 
+    def collection_key(self):
+        return ("is_minion", True)
+
     def __to_json__(self):
         return {
             "name": 'is_minion'
@@ -92,6 +106,9 @@ class IsWeapon(Condition):
     def evaluate(self, target, weapon, *args):
         return weapon.is_weapon()
 
+    def collection_key(self):
+        return ("is_weapon", True)
+
     def __to_json__(self):
         return {
             "name": 'is_weapon'
@@ -99,6 +116,8 @@ class IsWeapon(Condition):
 
 
 class MinionIsTarget(Condition):
+    depends_on_board = False
+
     def evaluate(self, target, minion, *args):
         return minion is target
 
@@ -109,6 +128,8 @@ class MinionIsTarget(Condition):
 
 
 class MinionIsNotTarget(Condition):
+    depends_on_board = False
+
     def evaluate(self, target, minion, *args):
         return minion is not target
 
@@ -129,6 +150,8 @@ class CardIsNotTarget(Condition):
 
 
 class MinionIsType(Condition):
+    depends_on_board = False
+
     def __init__(self, minion_type, include_self=False):
         super().__init__()
         self.minion_type = minion_type
@@ -144,6 +167,9 @@ class MinionIsType(Condition):
                 return minion.minion_type == self.minion_type
         return False
 
+    def collection_key(self):
+        return ("minion_type", self.minion_type)
+
     def __to_json__(self):
         return {
             'name': 'minion_is_type',
@@ -158,6 +184,8 @@ class MinionIsType(Condition):
 
 
 class MinionHasDeathrattle(Condition):
+    depends_on_board = False
+
     def __to_json__(self):
         return {
             'name': 'minion_has_deathrattle'
@@ -321,6 +321,9 @@ class MinionSelector(Selector):
         else:
             return obj.is_minion() and self.players.match(source, obj)
 
+    def match_depends_on_board(self):
+        return self.condition is not None and self.condition.depends_on_board
+
     def __to_json__(self):
         if self.condition:
             return {
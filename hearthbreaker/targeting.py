@@ -1,6 +1,44 @@
 import copy
+import functools
 
+__doc__ = """
+Functions for finding the characters a card, battlecry or hero power could target.  Each takes the game and a filter
+function, and returns the characters which pass the filter.
 
+Target lists found with one of the filters below, which only depend on which characters are on the board and whether
+they can be targeted, are remembered until :attr:`hearthbreaker.game_objects.Game.board_version` changes.  Target
+lists found with any other filter are found again each time.
+"""
+
+
+def is_spell_targetable(target):
+    return target.spell_targetable()
+
+
+def is_not_stealthed(target):
+    return not target.stealth
+
+
+_board_filters = {is_spell_targetable, is_not_stealthed}
+
+
+def _cache_by_board_version(find_targets):
+    @functools.wraps(find_targets)
+    def find_cached_targets(game, filter_function):
+        if filter_function not in _board_filters:
+            return find_targets(game, filter_function)
+        key = (find_targets, filter_function)
+        cached = game._target_cache.get(key)
+        if cached is None or cached[0] != game.board_version:
+            cached = (game.board_version, find_targets(game, filter_function))
+            game._target_cache[key] = cached
+        if cached[1] is None:
+            return None
+        return list(cached[1])
+    return find_cached_targets
+
+
+@_cache_by_board_version
 def find_spell_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
     targets.extend(game.current_player.minions)
@@ -11,6 +49,7 @@ def find_spell_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_battlecry_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
     targets.extend(game.current_player.minions)
@@ -21,6 +60,7 @@ def find_battlecry_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_enemy_spell_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
     targets.append(game.other_player.hero)
@@ -29,6 +69,7 @@ def find_enemy_spell_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_friendly_spell_target(game, filter_function):
     targets = copy.copy(game.current_player.minions)
     targets.append(game.current_player.hero)
@@ -37,6 +78,7 @@ def find_friendly_spell_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_minion_spell_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
     targets.extend(game.current_player.minions)
@@ -45,6 +87,7 @@ def find_minion_spell_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_minion_battlecry_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
     targets.extend(game.current_player.minions)
@@ -56,6 +99,7 @@ def find_minion_battlecry_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_enemy_minion_spell_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
 
@@ -63,6 +107,7 @@ def find_enemy_minion_spell_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_friendly_minion_spell_target(game, filter_function):
     targets = copy.copy(game.current_player.minions)
 
@@ -70,6 +115,7 @@ def find_friendly_minion_spell_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_enemy_minion_battlecry_target(game, filter_function):
     targets = copy.copy(game.other_player.minions)
 
@@ -79,6 +125,7 @@ def find_enemy_minion_battlecry_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_friendly_minion_battlecry_target(game, filter_function):
     targets = copy.copy(game.current_player.minions)
 
@@ -88,6 +135,7 @@ def find_friendly_minion_battlecry_target(game, filter_function):
     return targets
 
 
+@_cache_by_board_version
 def find_hero_target(game, filter_function):
     targets = []
     targets.append(game.current_player.hero)
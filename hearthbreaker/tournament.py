@@ -0,0 +1,454 @@
+import argparse
+import collections
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import timeit
+import zlib
+
+from hearthbreaker.agents import registry
+from hearthbreaker.game_objects import card_lookup
+from hearthbreaker.sim import DeckList, game_seed, play_game, wilson_interval, add_stopping_arguments, \
+    stopping_rule_from_args
+
+__doc__ = """
+Runs a round-robin tournament between a directory of decks, playing every deck against every other deck across a pool
+of worker processes, and reports how often each deck beats each of the others.
+
+Each pair of decks is played in both seatings, and each seating is a matchup of its own.  Matchups are split into
+batches of games, each played by one worker, and the matchup with the fewest games handed out so far is given the next
+free worker.  The longest matchups are started first, so that the pool isn't left waiting on a long matchup at the end
+of the run.  Each game's seed is derived from the seed of the tournament and the names of the decks, so the results
+of a matchup don't depend on the other decks in the tournament or on the order matchups are played in.
+
+With a :class:`hearthbreaker.sim.StoppingRule`, a matchup finishes as soon as the rule is satisfied, and the workers
+move on to the matchups which are still uncertain.  Lopsided matchups are usually decided within a few batches.  The
+rule is checked after each batch, taken in order, so the games played in a matchup still only depend on the seed.
+
+Completed matchups can be saved to a checkpoint file as they finish.  When a tournament is run again with the same
+checkpoint, seed, number of games, agents and stopping rule, the matchups already in the checkpoint are not played
+again.
+
+Running a tournament
+~~~~~~~~~~~~~~~~~~~~
+
+From the command line: ::
+
+    python -m hearthbreaker.tournament decks/ --games 200 --processes 8 --checkpoint nightly.jsonl \\
+        --output nightly.csv
+    python -m hearthbreaker.tournament decks/ --games 10000 --sprt 0.05 --batch-size 50
+
+Or as a library: ::
+
+    report = run_tournament(load_decks("decks/"), 200, processes=8, checkpoint="nightly.jsonl")
+    print(report)
+"""
+
+#: The outcome of a batch of games between two decks.  ``decks`` holds the names of the decks in the order they
+#: were seated, ``games`` the number of games played, and ``wins`` the number of games each of them won.
+MatchupResult = collections.namedtuple("MatchupResult", ["decks", "games", "wins", "draws", "turns", "duration"])
+
+
+def load_decks(directory):
+    """
+    Load every deck file (ending in ``.hsdeck``) in a directory, naming each deck after its file
+
+    :param str directory: The directory holding the decks
+    :rtype: list[hearthbreaker.sim.DeckList]
+    """
+    return [DeckList.from_file(os.path.join(directory, filename), os.path.splitext(filename)[0])
+            for filename in sorted(os.listdir(directory)) if filename.endswith(".hsdeck")]
+
+
+def estimate_game_length(deck_lists):
+    """
+    Estimate how long a game between two decks will take, relative to other games.  Decks with more expensive cards
+    play longer games, so the estimate is the average mana cost of the cards in both decks.
+
+    :param list[hearthbreaker.sim.DeckList] deck_lists: The two decks
+    :rtype: float
+    """
+    costs = [card_lookup(name).mana for deck_list in deck_lists for name in deck_list.card_names]
+    return sum(costs) / len(costs)
+
+
+def matchup_seed(seed, deck_names):
+    """
+    Derive the seed for a matchup from the seed of the tournament and the names of the decks, in the order they
+    are seated
+
+    :param int seed: The seed of the tournament
+    :param list[str] deck_names: The names of the two decks
+    :rtype: int
+    """
+    return game_seed(seed, zlib.crc32("\n".join(deck_names).encode("utf-8")))
+
+
+def play_matchup(deck_lists, games, seed, agent_names=("Random", "Random"), first_game=0):
+    """
+    Play a batch of games between two decks
+
+    :param list[hearthbreaker.sim.DeckList] deck_lists: The two decks, in the order they are seated
+    :param int games: The number of games to play
+    :param int seed: The seed of the tournament.  The seed of each game is derived from it.
+    :param list[str] agent_names: The names of the agents playing each deck, from
+                                  :data:`hearthbreaker.agents.registry`
+    :param int first_game: The id of the first game in the batch, when a matchup is played in several batches
+    :rtype: MatchupResult
+    """
+    deck_names = tuple(deck_list.name for deck_list in deck_lists)
+    seed = matchup_seed(seed, deck_names)
+    wins = [0, 0]
+    draws = 0
+    turns = 0
+    duration = 0.0
+    for game_id in range(first_game, first_game + games):
+        result = play_game(game_id, game_seed(seed, game_id), deck_lists, agent_names)
+        if result.winner is None:
+            draws += 1
+        else:
+            wins[result.winner] += 1
+        turns += result.turns
+        duration += result.duration
+    return MatchupResult(deck_names, games, tuple(wins), draws, turns, duration)
+
+
+def _play_matchup_task(task):
+    return task[4], play_matchup(*task)
+
+
+def _add_results(first, second):
+    return MatchupResult(first.decks, first.games + second.games,
+                         (first.wins[0] + second.wins[0], first.wins[1] + second.wins[1]), first.draws + second.draws,
+                         first.turns + second.turns, first.duration + second.duration)
+
+
+def read_checkpoint(filename, seed, games, agent_names, stopping_rule=None):
+    """
+    Read the matchups completed by an earlier run of the same tournament from a checkpoint file.  Matchups played
+    with a different seed, number of games, agents or stopping rule are left out, as is a last line which was cut off
+    before it was finished.
+
+    :param str filename: The name of the checkpoint file, which need not exist
+    :param int seed: The seed of the tournament, or None to use the seed of the first matchup in the checkpoint
+    :param int games: The most games played in each matchup
+    :param list[str] agent_names: The names of the agents playing each deck
+    :param hearthbreaker.sim.StoppingRule stopping_rule: The rule used to stop matchups early, if any
+    :return: The seed of the tournament, and the completed matchups
+    :rtype: (int, list[MatchupResult])
+    """
+    results = []
+    if not os.path.exists(filename):
+        return seed, results
+    with open(filename, "r") as checkpoint:
+        for line in checkpoint:
+            # Each record ends with a new line, so a line without one was being written when the run was stopped
+            if not line.endswith("\n") or not line.strip():
+                continue
+            entry = json.loads(line)
+            if seed is None:
+                seed = entry["seed"]
+            if entry["seed"] != seed or entry["limit"] != games or entry["agents"] != list(agent_names) or \
+                    entry["stopping"] != _stopping_name(stopping_rule):
+                continue
+            results.append(MatchupResult(tuple(entry["decks"]), entry["games"], tuple(entry["wins"]), entry["draws"],
+                                         entry["turns"], entry["duration"]))
+    return seed, results
+
+
+def _stopping_name(stopping_rule):
+    if stopping_rule is None:
+        return None
+    return repr(stopping_rule)
+
+
+def _trim_checkpoint(filename):
+    """
+    Cut off a last line which was being written when an earlier run was stopped, so that the next record written to
+    the checkpoint starts on a new line
+    """
+    if not os.path.exists(filename):
+        return
+    with open(filename, "r+b") as checkpoint:
+        data = checkpoint.read()
+        if data and not data.endswith(b"\n"):
+            checkpoint.truncate(data.rfind(b"\n") + 1)
+
+
+def _write_checkpoint(checkpoint, result, seed, games, agent_names, stopping_rule):
+    entry = result._asdict()
+    entry.update({"seed": seed, "limit": games, "agents": list(agent_names),
+                  "stopping": _stopping_name(stopping_rule)})
+    checkpoint.write(json.dumps(entry, sort_keys=True) + "\n")
+    # Each matchup is on disk before the next is reported, so that at most the matchups in progress are lost
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+
+
+class TournamentReport:
+    """
+    Aggregates the results of the matchups in a tournament into a table of how often each deck beats each other deck
+    """
+
+    def __init__(self, deck_names, seed=None):
+        """
+        :param list[str] deck_names: The names of the decks in the tournament
+        :param int seed: The seed the tournament was run with, if any
+        """
+        self.deck_names = deck_names
+        self.seed = seed
+        #: The result of each matchup, by the names of the decks in the order they were seated
+        self.results = {}
+
+    def add_result(self, result):
+        """
+        Add the result of a matchup to this report
+
+        :param MatchupResult result: The result to add
+        """
+        self.results[result.decks] = result
+
+    def record(self, deck_name, opponent_name):
+        """
+        Count the games one deck won against another, in either seating
+
+        :param str deck_name: The name of the deck
+        :param str opponent_name: The name of its opponent
+        :return: The number of games the deck won, and the number of games played
+        :rtype: (int, int)
+        """
+        wins = 0
+        games = 0
+        for decks, deck_index in [((deck_name, opponent_name), 0), ((opponent_name, deck_name), 1)]:
+            if decks in self.results:
+                wins += self.results[decks].wins[deck_index]
+                games += self.results[decks].games
+        return wins, games
+
+    def win_rate(self, deck_name, opponent_name):
+        """
+        The fraction of games one deck won against another, in either seating, with draws counting as losses
+
+        :param str deck_name: The name of the deck
+        :param str opponent_name: The name of its opponent
+        :rtype: float
+        """
+        wins, games = self.record(deck_name, opponent_name)
+        if games == 0:
+            return 0.0
+        return wins / games
+
+    def interval(self, deck_name, opponent_name, z=1.96):
+        """
+        Find the confidence interval for how often one deck beats another
+
+        :param str deck_name: The name of the deck
+        :param str opponent_name: The name of its opponent
+        :param float z: The number of standard deviations the interval covers.  The default gives a 95% interval.
+        :return: The lower and upper bounds of the interval
+        :rtype: (float, float)
+        """
+        return wilson_interval(*self.record(deck_name, opponent_name), z=z)
+
+    def write_csv(self, file):
+        """
+        Write the win rate of each deck against each other deck as CSV, with one row for each pair of decks
+
+        :param file: An IO object, opened for writing
+        :type file: :class:`io.TextIOBase`
+        """
+        writer = csv.writer(file)
+        writer.writerow(["deck", "opponent", "games", "wins", "win_rate", "interval_low", "interval_high"])
+        for deck_name in self.deck_names:
+            for opponent_name in self.deck_names:
+                if deck_name == opponent_name:
+                    continue
+                wins, games = self.record(deck_name, opponent_name)
+                low, high = self.interval(deck_name, opponent_name)
+                writer.writerow([deck_name, opponent_name, games, wins, "{0:.4f}".format(self.win_rate(
+                    deck_name, opponent_name)), "{0:.4f}".format(low), "{0:.4f}".format(high)])
+
+    def __str__(self):
+        width = max([len(name) for name in self.deck_names] + [15])
+        lines = ["{0} matchups (seed {1}), win rate of each row against each column with 95% interval".format(
+            len(self.results), self.seed)]
+        lines.append(" " * width + "".join([" {0:>15}".format(name[:15]) for name in self.deck_names]))
+        for deck_name in self.deck_names:
+            cells = []
+            for opponent_name in self.deck_names:
+                if deck_name == opponent_name or self.record(deck_name, opponent_name)[1] == 0:
+                    cells.append(" {0:>15}".format("-"))
+                else:
+                    low, high = self.interval(deck_name, opponent_name)
+                    win_rate = self.win_rate(deck_name, opponent_name)
+                    cells.append(" {0:>7.1%} {1:>3.0f}-{2:<3.0f}".format(win_rate, low * 100, high * 100))
+            lines.append("{0:<{1}}".format(deck_name, width) + "".join(cells))
+        return "\n".join(lines)
+
+
+class _Matchup:
+    """
+    Tracks the batches of games handed out for a matchup, and combines their results in the order of their first game
+    """
+
+    def __init__(self, deck_lists):
+        self.deck_lists = deck_lists
+        self.scheduled = 0
+        self.result = MatchupResult(tuple(deck_list.name for deck_list in deck_lists), 0, (0, 0), 0, 0, 0.0)
+        self.waiting = {}
+        self.finished = False
+
+
+def run_tournament(deck_lists, games, processes=None, seed=None, agent_names=("Random", "Random"), checkpoint=None,
+                   callback=None, stopping_rule=None, batch_size=None):
+    """
+    Play every deck against every other deck, in both seatings, and aggregate the results
+
+    :param list[hearthbreaker.sim.DeckList] deck_lists: The decks in the tournament, which must have different names
+    :param int games: The number of games in each matchup, at most if a stopping rule is given
+    :param int processes: The number of worker processes to use.  If None, one per CPU is used.  If 1, the games
+                          are played in this process.
+    :param int seed: The seed for the tournament.  If None, the seed of the checkpoint is used if there is one, or a
+                     seed is chosen and stored in the report.
+    :param list[str] agent_names: The names of the agents playing each deck
+    :param str checkpoint: The name of a file to save each matchup to as it finishes, and to read the matchups
+                           already finished from.  If None, nothing is saved.
+    :param function callback: If present, called with each :class:`MatchupResult` as it finishes
+    :param hearthbreaker.sim.StoppingRule stopping_rule: If present, each matchup finishes as soon as this rule is
+                                                         satisfied by the win rate of the first deck
+    :param int batch_size: How many games of a matchup to give a worker at a time.  If None, each matchup is played
+                           in one batch, or in batches of 20 games if there is a stopping rule.
+    :rtype: TournamentReport
+    """
+    done = []
+    if checkpoint is not None:
+        seed, done = read_checkpoint(checkpoint, seed, games, agent_names, stopping_rule)
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if batch_size is None:
+        batch_size = games if stopping_rule is None else 20
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    report = TournamentReport([deck_list.name for deck_list in deck_lists], seed)
+    for result in done:
+        report.add_result(result)
+
+    matchups = [[first, second] for first in deck_lists for second in deck_lists
+                if first is not second and (first.name, second.name) not in report.results]
+    matchups.sort(key=estimate_game_length, reverse=True)
+    matchups = [_Matchup(matchup) for matchup in matchups]
+    by_decks = dict((matchup.result.decks, matchup) for matchup in matchups)
+
+    def next_task():
+        unscheduled = [matchup for matchup in matchups if not matchup.finished and matchup.scheduled < games]
+        if not unscheduled:
+            return None
+        # Ties go to the first matchup, which is the longest
+        matchup = min(unscheduled, key=lambda m: m.scheduled)
+        count = min(batch_size, games - matchup.scheduled)
+        task = (matchup.deck_lists, count, seed, agent_names, matchup.scheduled)
+        matchup.scheduled += count
+        return task
+
+    def add_batch(first_game, result):
+        matchup = by_decks[result.decks]
+        if matchup.finished:
+            return
+        matchup.waiting[first_game] = result
+        while matchup.result.games in matchup.waiting:
+            matchup.result = _add_results(matchup.result, matchup.waiting.pop(matchup.result.games))
+            played = matchup.result.games
+            decided = stopping_rule is not None and stopping_rule.is_decided(matchup.result.wins[0], played)
+            if decided or played >= games:
+                matchup.finished = True
+                if checkpoint_file is not None:
+                    _write_checkpoint(checkpoint_file, matchup.result, seed, games, agent_names, stopping_rule)
+                report.add_result(matchup.result)
+                if callback:
+                    callback(matchup.result)
+                return
+
+    # Finished batches are collected from the pool's result thread, so that a worker can be given a new batch as soon
+    # as it finishes one, chosen from the matchups which are still undecided
+    finished_batches = queue.Queue()
+    checkpoint_file = None
+    if checkpoint is not None:
+        _trim_checkpoint(checkpoint)
+        checkpoint_file = open(checkpoint, "a")
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        in_flight = 0
+        while True:
+            while in_flight < (processes * 2 if pool is not None else 1):
+                task = next_task()
+                if task is None:
+                    break
+                if pool is None:
+                    finished_batches.put(_play_matchup_task(task))
+                else:
+                    pool.apply_async(_play_matchup_task, (task,), callback=finished_batches.put,
+                                     error_callback=finished_batches.put)
+                in_flight += 1
+            if in_flight == 0:
+                break
+            batch = finished_batches.get()
+            in_flight -= 1
+            if isinstance(batch, Exception):
+                raise batch
+            add_batch(*batch)
+        if pool is not None:
+            pool.close()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hearthbreaker.tournament",
+                                     description="Play every deck in a directory against every other deck")
+    parser.add_argument("directory", help="The directory holding the deck files")
+    parser.add_argument("-n", "--games", type=int, default=100,
+                        help="The number of games between each pair of decks in each seating, at most if stopping "
+                             "early")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="The number of worker processes (default: one per CPU)")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="The seed for the tournament")
+    parser.add_argument("-a", "--agents", nargs=2, default=["Random", "Random"], metavar="AGENT",
+                        help="The agents playing each deck, one of: " + ", ".join(registry.get_names()))
+    parser.add_argument("-c", "--checkpoint", default=None,
+                        help="A file to save finished matchups to, and to resume the tournament from")
+    parser.add_argument("-o", "--output", default=None, help="A CSV file to write the win rates to")
+    parser.add_argument("-b", "--batch-size", type=int, default=None,
+                        help="The number of games of a matchup to give a worker at a time")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the result of each matchup")
+    add_stopping_arguments(parser)
+    args = parser.parse_args(argv)
+
+    deck_lists = load_decks(args.directory)
+
+    def print_result(result):
+        print("{0} vs {1}: {2}-{3}, {4} draws ({5:.2f}s)".format(result.decks[0], result.decks[1], result.wins[0],
+                                                                 result.wins[1], result.draws, result.duration))
+
+    callback = print_result if args.verbose else None
+    start_time = timeit.default_timer()
+    report = run_tournament(deck_lists, args.games, args.processes, args.seed, args.agents, args.checkpoint,
+                            callback, stopping_rule_from_args(args), args.batch_size)
+    print(report)
+    print("  wall time: {0:.2f}s".format(timeit.default_timer() - start_time))
+    if args.output is not None:
+        with open(args.output, "w", newline="") as output:
+            report.write_csv(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
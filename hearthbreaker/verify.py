@@ -0,0 +1,248 @@
+import argparse
+import collections
+import hashlib
+import json
+import multiprocessing
+import sys
+import timeit
+
+from hearthbreaker.replay import Replay, playback
+from hearthbreaker.serialization.move import TurnStartMove
+
+__doc__ = """
+Checks that recorded replays still play out the same way, so that changes to the engine can be tested against a
+large collection of games.
+
+The final state of each replay (the heroes, their weapons, the minions on the board, the cards in hand and the number
+of cards left in each deck) is summarized by a checksum.  Checksums are first recorded in a JSON manifest, and later
+checked against the replays again, with the replays spread across a pool of worker processes.  Any replay which ends
+differently, or fails to play back at all, is reported.
+
+Verifying replays
+~~~~~~~~~~~~~~~~~
+
+From the command line: ::
+
+    python -m hearthbreaker.verify record checksums.json replays/*.hsreplay
+    # ... change the engine ...
+    python -m hearthbreaker.verify check checksums.json --processes 8
+
+Or as a library: ::
+
+    checksums = record_checksums(filenames, processes=8)
+    for result in check_replays(checksums, processes=8):
+        if not result.matched:
+            print(result.filename, result.error)
+"""
+
+
+class VerifyResult(collections.namedtuple("VerifyResult", ["filename", "expected", "actual", "error", "duration"])):
+    """
+    The outcome of checking a single replay.  ``actual`` is None if the replay could not be played back, in which
+    case ``error`` describes why.
+    """
+    __slots__ = ()
+
+    @property
+    def matched(self):
+        """
+        Whether the replay played back to the checksum which was expected
+        """
+        return self.actual is not None and self.actual == self.expected
+
+
+def final_state(game):
+    """
+    Summarize the state of a game which has been played, in enough detail to notice if it ended differently
+
+    :param hearthbreaker.game_objects.Game game: The game
+    :rtype: dict
+    """
+    players = []
+    for player in game.players:
+        hero = player.hero
+        weapon = None
+        if hero.weapon is not None:
+            weapon = [hero.weapon.card.name, hero.weapon.base_attack, hero.weapon.durability]
+        players.append({
+            "health": hero.health,
+            "armor": hero.armor,
+            "dead": hero.dead,
+            "weapon": weapon,
+            "minions": [[minion.card.name, minion.calculate_attack(), minion.health] for minion in player.minions],
+            "hand": [card.name for card in player.hand],
+            "deck_left": player.deck.left,
+        })
+    return {"players": players}
+
+
+def state_checksum(game):
+    """
+    Find the checksum of the final state of a game, as summarized by :func:`final_state`
+
+    :param hearthbreaker.game_objects.Game game: The game
+    :rtype: str
+    """
+    return hashlib.sha1(json.dumps(final_state(game), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_replay(filename):
+    """
+    Load a replay in the compact format (for files ending in ``.rep``), the line format (for files ending in
+    ``.gz``, or any file which isn't a single json document) or the complete json format.
+
+    :param str filename: The name of the replay file
+    :rtype: hearthbreaker.replay.Replay
+    """
+    replay = Replay()
+    if filename.endswith(".rep"):
+        replay.read(filename)
+    elif filename.endswith(".gz"):
+        replay.read_lines(filename)
+    else:
+        try:
+            replay.read_json(filename)
+        except ValueError:
+            replay = Replay()
+            replay.read_lines(filename)
+    return replay
+
+
+def play_replay(replay):
+    """
+    Play a replay back to the end of its last turn
+
+    :param hearthbreaker.replay.Replay replay: The replay to play back
+    :return: The game, in the state the replay ended in
+    :rtype: hearthbreaker.game_objects.Game
+    """
+    # Replays can stop before the game is over, so only the turns which were recorded are played
+    turns = len([move for move in replay._moves if isinstance(move, TurnStartMove)])
+    game = playback(replay)
+    game.start(turns)
+    return game
+
+
+def replay_checksum(filename):
+    """
+    Play a replay back to the end of its last turn, and find the checksum of the state it ended in
+
+    :param str filename: The name of the replay file
+    :rtype: str
+    """
+    return state_checksum(play_replay(load_replay(filename)))
+
+
+def verify_replay(filename, expected):
+    """
+    Play a replay back and compare the state it ends in with the one expected
+
+    :param str filename: The name of the replay file
+    :param str expected: The checksum of the expected state, or None if it isn't known
+    :rtype: VerifyResult
+    """
+    start_time = timeit.default_timer()
+    try:
+        actual = replay_checksum(filename)
+        error = None
+    except Exception as e:
+        actual = None
+        error = "{0}: {1}".format(type(e).__name__, e)
+    return VerifyResult(filename, expected, actual, error, timeit.default_timer() - start_time)
+
+
+def _verify_replay_task(task):
+    return verify_replay(*task)
+
+
+def check_replays(checksums, processes=None, chunk_size=None):
+    """
+    Play back a set of replays, yielding the result for each one as soon as it is available.  Results are not
+    necessarily yielded in the order the replays were given.
+
+    :param dict checksums: The checksum expected for each replay, by filename
+    :param int processes: The number of worker processes to use.  If None, one per CPU is used.  If 1, the replays
+                          are played in this process.
+    :param int chunk_size: How many replays to send to a worker at a time.  If None, a size is chosen which gives
+                           each worker several chunks.
+    :rtype: generator of VerifyResult
+    """
+    tasks = sorted(checksums.items())
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    if processes == 1:
+        for task in tasks:
+            yield _verify_replay_task(task)
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, len(tasks) // (processes * 8))
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap_unordered(_verify_replay_task, tasks, chunk_size):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def record_checksums(filenames, processes=None, callback=None):
+    """
+    Play back a set of replays, and record the checksum of the state each one ends in.  Replays which can't be
+    played back are left out.
+
+    :param list[str] filenames: The names of the replay files
+    :param int processes: The number of worker processes to use.  See :func:`check_replays`
+    :param function callback: If present, called with the :class:`VerifyResult` of each replay as it arrives
+    :return: The checksum for each replay, by filename
+    :rtype: dict
+    """
+    checksums = {}
+    for result in check_replays(dict.fromkeys(filenames), processes):
+        if result.actual is not None:
+            checksums[result.filename] = result.actual
+        if callback:
+            callback(result)
+    return checksums
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hearthbreaker.verify",
+                                     description="Check that replays still end in the same state")
+    parser.add_argument("command", choices=["record", "check"],
+                        help="Whether to record the checksums of the replays, or check the replays against them")
+    parser.add_argument("manifest", help="The JSON file holding the checksum of each replay")
+    parser.add_argument("replays", nargs="*", help="The replay files to record checksums for")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="The number of worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    def print_failure(result):
+        if result.actual is None:
+            print("{0}: {1}".format(result.filename, result.error))
+
+    start_time = timeit.default_timer()
+    if args.command == "record":
+        checksums = record_checksums(args.replays, args.processes, print_failure)
+        with open(args.manifest, "w") as manifest:
+            json.dump(checksums, manifest, indent=2, sort_keys=True)
+        print("recorded {0} of {1} replays".format(len(checksums), len(args.replays)))
+        print("  wall time: {0:.2f}s".format(timeit.default_timer() - start_time))
+        return 0
+
+    with open(args.manifest) as manifest:
+        checksums = json.load(manifest)
+    diverged = 0
+    for result in check_replays(checksums, args.processes):
+        if not result.matched:
+            diverged += 1
+            print("{0}: {1}".format(result.filename, result.error or "ended in a different state"))
+    print("checked {0} replays, {1} diverged".format(len(checksums), diverged))
+    print("  wall time: {0:.2f}s".format(timeit.default_timer() - start_time))
+    return 1 if diverged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,17 @@
 import random
+import timeit
 import unittest
-from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents import registry
+from hearthbreaker.agents.basic_agents import RandomAgent, DoNothingAgent, PredictableAgent
+from hearthbreaker.agents.mcts_agent import MCTSAgent
 from hearthbreaker.cards import GoldshireFootman, MurlocRaider, BloodfenRaptor, FrostwolfGrunt, RiverCrocolisk, \
     IronfurGrizzly, MagmaRager, SilverbackPatriarch, ChillwindYeti, SenjinShieldmasta, BootyBayBodyguard, \
     FenCreeper, BoulderfistOgre, WarGolem, Shieldbearer, FlameImp, YoungPriestess, DarkIronDwarf, DireWolfAlpha, \
     Voidwalker, HarvestGolem, KnifeJuggler, ShatteredSunCleric, ArgentSquire, Doomguard, Soulfire, DefenderOfArgus, \
-    AbusiveSergeant, NerubianEgg, KeeperOfTheGrove
+    AbusiveSergeant, NerubianEgg, KeeperOfTheGrove, Wisp
 from hearthbreaker.constants import CHARACTER_CLASS
-from hearthbreaker.game_objects import Deck, Game
+from hearthbreaker.game_objects import Deck, Game, card_lookup, TurnTimeout
+from tests.testing_utils import generate_game_for
 
 
 class TestAgents(unittest.TestCase):
@@ -115,3 +119,100 @@ class TestAgents(unittest.TestCase):
         self.assertEqual(3, game.other_player.hero.health)
 
         self.assertTrue(game.game_ended)
+
+    def test_MCTSAgent_finds_lethal(self):
+        game = generate_game_for(Wisp, Wisp, DoNothingAgent, DoNothingAgent)
+        BloodfenRaptor().summon(game.players[0], game, 0)
+        BloodfenRaptor().summon(game.players[0], game, 1)
+        Wisp().summon(game.players[1], game, 0)
+        Wisp().summon(game.players[1], game, 1)
+        game.players[1].hero.health = 6
+        game.play_single_turn()
+        game.play_single_turn()
+
+        # The raptors could attack the wisps or the hero, but only attacking the hero with both wins the game
+        agent = MCTSAgent(iterations=40, rollout_turns=0)
+        agent.set_game(game)
+        game.players[0].agent = agent
+        game.play_single_turn()
+        self.assertTrue(game.players[1].hero.dead)
+        self.assertGreater(agent.playouts, 0)
+
+    def test_MCTSAgent_parallel_search(self):
+        game = generate_game_for(Wisp, Wisp, DoNothingAgent, DoNothingAgent)
+        BloodfenRaptor().summon(game.players[0], game, 0)
+        BloodfenRaptor().summon(game.players[0], game, 1)
+        Wisp().summon(game.players[1], game, 0)
+        Wisp().summon(game.players[1], game, 1)
+        game.players[1].hero.health = 6
+        game.play_single_turn()
+        game.play_single_turn()
+
+        agent = MCTSAgent(iterations=40, rollout_turns=0, processes=2)
+        agent.set_game(game)
+        game.players[0].agent = agent
+        try:
+            game.play_single_turn()
+        finally:
+            agent.close()
+        self.assertTrue(game.players[1].hero.dead)
+        # Each worker runs half of the playouts for each move
+        self.assertEqual(0, agent.playouts % 40)
+
+    def test_turn_time_limit(self):
+        game = generate_game_for(BloodfenRaptor, BloodfenRaptor, PredictableAgent, PredictableAgent)
+        game.turn_time_limit = 0
+        for turn in range(0, 6):
+            game.play_single_turn()
+            self.assertIsNone(game.turn_deadline)
+
+        # Every move is refused, so neither player has done anything but draw cards
+        self.assertEqual(0, len(game.players[0].minions))
+        self.assertEqual(0, len(game.players[1].minions))
+        self.assertFalse(game.players[0].hero.power.used)
+        self.assertEqual(6, len(game.players[0].hand))
+        self.assertIsNone(game.copy().turn_time_limit)
+
+        game.turn_time_limit = None
+        game.play_single_turn()
+        self.assertEqual(1, len(game.players[0].minions))
+
+        game.turn_deadline = timeit.default_timer() - 1
+        self.assertRaises(TurnTimeout, game.check_turn_time)
+
+    def test_MCTSAgent_turn_time_limit(self):
+        game = generate_game_for(Wisp, Wisp, DoNothingAgent, DoNothingAgent)
+        BloodfenRaptor().summon(game.players[0], game, 0)
+        BloodfenRaptor().summon(game.players[0], game, 1)
+        game.play_single_turn()
+        game.play_single_turn()
+
+        agent = MCTSAgent(iterations=1000000, rollout_turns=0)
+        agent.set_game(game)
+        game.players[0].agent = agent
+        self.assertIsNone(agent.time_left())
+        self.assertFalse(agent.out_of_time())
+        game.turn_time_limit = 0.2
+        start_time = timeit.default_timer()
+        game.play_single_turn()
+        self.assertLess(timeit.default_timer() - start_time, 2)
+
+        statistics = agent.statistics()
+        self.assertGreater(statistics["nodes"], 0)
+        self.assertLess(statistics["nodes"], 1000000)
+        self.assertLessEqual(statistics["time"], 1)
+        self.assertIsNone(agent.time_left())
+
+    def test_MCTSAgent_game(self):
+        def play_game():
+            decks = [Deck([card_lookup(name) for name in ["Bloodfen Raptor", "Argent Squire", "Knife Juggler",
+                                                          "Shattered Sun Cleric", "Fireball"] * 6],
+                          CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+            game = Game(decks, [MCTSAgent(iterations=5, rollout_turns=2), RandomAgent()], 1857)
+            game.start()
+            return [(player.hero.health, len(player.minions), len(player.hand)) for player in game.players]
+
+        result = play_game()
+        self.assertTrue(result[0][0] <= 0 or result[1][0] <= 0)
+        self.assertEqual(result, play_game())
+        self.assertIn("MCTS", registry.get_names())
@@ -3,6 +3,8 @@ from hearthbreaker.cards import Wisp, WarGolem, BloodfenRaptor, RiverCrocolisk,
 from tests.agents.trade.test_helpers import TestHelpers
 from tests.agents.trade.test_case_mixin import TestCaseMixin
 from hearthbreaker.agents.trade.possible_play import PossiblePlays
+from hearthbreaker.agents.trade_agent import BattlecryType
+from hearthbreaker.cards import Soulfire, Fireball
 
 
 class TestTradeAgent(TestCaseMixin, unittest.TestCase):
@@ -42,3 +44,7 @@ class TestTradeAgent(TestCaseMixin, unittest.TestCase):
         possible_plays = PossiblePlays(cards, 10, allow_hero_power=True)
 
         self.assertEqual(1, len(possible_plays.plays()))
+
+    def test_spell_target_type(self):
+        self.assertIsNone(BattlecryType.target_type_for_card(Soulfire()))
+        self.assertIsNone(BattlecryType.target_type_for_card(Fireball()))
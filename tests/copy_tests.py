@@ -1,13 +1,15 @@
 import copy
+import json
 import random
 import unittest
 
 from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
 from hearthbreaker.constants import MINION_TYPE
-from hearthbreaker.game_objects import MinionCard
+from hearthbreaker.game_objects import MinionCard, WeaponCard, card_lookup, get_cards
+from hearthbreaker.tags.base import Effect, JSONObject
 from tests.agents.testing_agents import CardTestingAgent, OneCardPlayingAgent, PlayAndAttackAgent, \
     EnemyMinionSpellTestingAgent
-from tests.testing_utils import generate_game_for
+from tests.testing_utils import generate_game_for, mock
 from hearthbreaker.cards import *
 
 
@@ -2169,3 +2171,83 @@ class TestMinionCopying(unittest.TestCase):
         game = game.copy()
         game.play_single_turn()
         self.assertEqual(29, game.current_player.hero.health)
+
+
+class TestTagCopying(unittest.TestCase):
+    def card_tags(self, card, player):
+        objects = [card]
+        if isinstance(card, MinionCard):
+            objects.append(card.create_minion(player))
+        elif isinstance(card, WeaponCard):
+            objects.append(card.create_weapon(player))
+        tags = []
+        for obj in objects:
+            names = set(getattr(obj, "__dict__", {}))
+            for cls in type(obj).__mro__:
+                names.update(cls.__dict__.get("__slots__", ()))
+            for name in sorted(names):
+                value = getattr(obj, name, None)
+                tags.extend(tag for tag in (value if isinstance(value, list) else [value])
+                            if isinstance(tag, JSONObject))
+        return tags
+
+    def test_copy_card_tags(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        tag_count = 0
+        for card in get_cards():
+            for tag in self.card_tags(card, game.players[0]):
+                tag_count += 1
+                new_tag = tag.copy()
+                self.assertEqual(str(tag), str(new_tag), card.name)
+                if isinstance(tag, Effect):
+                    loaded = Effect.from_json(game, **json.loads(str(new_tag)))
+                else:
+                    loaded = type(tag).from_json(**json.loads(str(new_tag)))
+                self.assertTrue(loaded.eq(tag), card.name)
+        self.assertGreater(tag_count, 200)
+
+        choice = card_lookup("Keeper of the Grove").choices[0]
+        self.assertIs(choice.card, choice.copy().card)
+        choice.unknown = object()
+        self.assertRaises(TypeError, choice.copy)
+
+
+class TestCopyPerformance(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+        self.game = generate_game_for([RaidLeader, KnifeJuggler, DireWolfAlpha, FlesheatingGhoul, StormwindChampion,
+                                       CultMaster, Abomination],
+                                      [ScavengingHyena, TimberWolf, StarvingBuzzard, HarvestGolem, SludgeBelcher,
+                                       Houndmaster], CardTestingAgent, CardTestingAgent)
+        for turn in range(0, 12):
+            self.game.play_single_turn()
+
+    def tags(self, game):
+        return [tag for player in game.players for minion in player.minions
+                for tag in minion.effects + minion.auras + minion.deathrattle]
+
+    def test_copy_does_not_reference_original(self):
+        new_game = self.game.copy()
+        self.assertEqual(len(self.tags(self.game)), len(self.tags(new_game)))
+        for player in new_game.players:
+            for minion in player.minions:
+                for tag in minion.effects + minion.auras:
+                    self.assertIs(minion, tag.target)
+        for tag in self.tags(new_game):
+            self.assertNotIn(tag, self.tags(self.game))
+        for player, new_player in zip(self.game.players, new_game.players):
+            self.assertEqual([card.name for card in player.deck.cards], [card.name for card in new_player.deck.cards])
+            self.assertEqual([card.drawn for card in player.deck.cards],
+                             [card.drawn for card in new_player.deck.cards])
+            for card in new_player.deck.cards + new_player.hand:
+                self.assertNotIn(card, player.deck.cards)
+                self.assertNotIn(card, player.hand)
+
+    def test_copy_avoids_deep_copy(self):
+        # Deep copying the effects, auras and deathrattles of the minions on the board follows their references
+        # through the entire game, which is what made copying slow.  See benchmarks/copying.py for the timings.
+        self.assertGreater(len(self.tags(self.game)), 5)
+        with mock.patch("copy.deepcopy", wraps=copy.deepcopy) as deep_copy:
+            new_game = self.game.copy()
+        self.assertEqual(0, deep_copy.call_count)
+        self.assertEqual(len(self.tags(self.game)), len(self.tags(new_game)))
@@ -1,13 +1,20 @@
+import json
 import random
 import unittest
 
-from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
+from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent, RandomAgent
 from hearthbreaker.cards.minions.rogue import AnubarAmbusher
 from tests.agents.testing_agents import CardTestingAgent, OneCardPlayingAgent, PlayAndAttackAgent
-from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.constants import CHARACTER_CLASS, ACTION_TYPE, MINION_TYPE
 from tests.testing_utils import generate_game_for, mock
 from hearthbreaker.cards import StonetuskBoar, ArcaneIntellect, Naturalize, Abomination, NerubianEgg, SylvanasWindrunner
-from hearthbreaker.game_objects import Game, Deck, Bindable, card_lookup, SecretCard
+from hearthbreaker.game_objects import Game, Deck, Bindable, card_lookup, SecretCard, GameException, get_cards, \
+    get_collection
+from hearthbreaker.tags.action import ChangeAttack, MinimumHealth, Give
+from hearthbreaker.tags.base import Aura, AuraUntil, CardQuery, Action, Selector
+from hearthbreaker.tags.condition import Adjacent, ManaCost, IsMinion
+from hearthbreaker.tags.event import TurnEnded, TurnStarted
+from hearthbreaker.tags.selector import SelfSelector, MinionSelector
 
 
 class TestGame(unittest.TestCase):
@@ -50,8 +57,10 @@ class TestGame(unittest.TestCase):
         game = Game([deck1, deck2], [agent1, agent2])
         game.pre_game()
 
-        self.assertEqual(agent1.method_calls[0][0], "do_card_check", "Agent not asked to select cards")
-        self.assertEqual(agent2.method_calls[0][0], "do_card_check", "Agent not asked to select cards")
+        self.assertEqual(agent1.method_calls[0][0], "set_game", "Agent not given the game")
+        self.assertEqual(agent2.method_calls[0][0], "set_game", "Agent not given the game")
+        self.assertEqual(agent1.method_calls[1][0], "do_card_check", "Agent not asked to select cards")
+        self.assertEqual(agent2.method_calls[1][0], "do_card_check", "Agent not asked to select cards")
 
         self.assertTrue(game.players[0].deck == deck1, "Deck not assigned to player")
         self.assertTrue(game.players[1].deck == deck2, "Deck not assigned to player")
@@ -165,6 +174,269 @@ class TestGame(unittest.TestCase):
 
         self.assertEqual(1, len(game.current_player.minions))
 
+    def test_seeded_game(self):
+        def play_seeded_game(seed):
+            deck1 = Deck([card_lookup("Arcane Missiles") for i in range(0, 30)], CHARACTER_CLASS.MAGE)
+            deck2 = Deck([card_lookup("Murloc Raider") for i in range(0, 30)], CHARACTER_CLASS.ROGUE)
+            game = Game([deck1, deck2], [RandomAgent(), RandomAgent()], seed)
+            game.start()
+            return [(player.hero.health, len(player.minions), len(player.hand)) for player in game.players]
+
+        random.seed(1)
+        first = play_seeded_game(2015)
+        random_state = random.getstate()
+        random.seed(2)
+        second = play_seeded_game(2015)
+        self.assertEqual(first, second)
+        random.seed(1)
+        self.assertEqual(random_state, random.getstate(), "Seeded games should not use the global random module")
+
+        self.assertNotEqual(first, play_seeded_game(2016))
+
+    def test_copy_random_generator(self):
+        decks = [Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+        game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 1857)
+        copied_game = game.copy()
+        self.assertIsNot(game.random_generator, copied_game.random_generator)
+        copied_numbers = [copied_game.random_amount(0, 100) for i in range(0, 10)]
+        self.assertEqual(copied_numbers, [game.random_amount(0, 100) for i in range(0, 10)])
+
+    def test_playing_copy_leaves_original(self):
+        def game_state(game):
+            return json.dumps(game.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
+
+        def new_game():
+            card_names = ["Raid Leader", "Knife Juggler", "Dire Wolf Alpha", "Flesheating Ghoul", "Harvest Golem",
+                          "Arcane Missiles"]
+            decks = [Deck([card_lookup(name) for name in card_names * 5], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+            game = Game(decks, [RandomAgent(), RandomAgent()], 1857)
+            game.pre_game()
+            game.current_player = game.players[1]
+            for turn in range(0, 6):
+                game.play_single_turn()
+            return game
+
+        game = new_game()
+        untouched_game = new_game()
+        copied_game = game.copy()
+        for player, copied_player in zip(game.players, copied_game.players):
+            self.assertIsNot(player.agent, copied_player.agent)
+            self.assertIs(copied_game, copied_player.agent.game)
+            self.assertIs(game, player.agent.game)
+        for turn in range(0, 4):
+            copied_game.play_single_turn()
+
+        while not game.game_ended:
+            game.play_single_turn()
+            untouched_game.play_single_turn()
+        self.assertEqual(game_state(untouched_game), game_state(game))
+
+    def test_checkpoint_rollback(self):
+        def game_state(game):
+            return json.dumps(game.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
+
+        def play_out(game, seed):
+            game.random_generator.seed(seed)
+            while not game.game_ended:
+                game.play_single_turn()
+            return game_state(game)
+
+        card_names = ["Raid Leader", "Knife Juggler", "Dire Wolf Alpha", "Flesheating Ghoul", "Harvest Golem",
+                      "Arcane Missiles"]
+        decks = [Deck([card_lookup(name) for name in card_names * 5], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+        game = Game(decks, [RandomAgent(), RandomAgent()], 1857)
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, 10):
+            game.play_single_turn()
+        minions = game.players[0].minions
+        first_minion = minions[0]
+
+        before = game_state(game)
+        checkpoint = game.checkpoint()
+        first = play_out(game, 1)
+        self.assertNotEqual(before, first)
+
+        game.rollback(checkpoint)
+        self.assertEqual(before, game_state(game))
+        self.assertIs(minions, game.players[0].minions)
+        self.assertIs(first_minion, game.players[0].minions[0])
+
+        self.assertNotEqual(first, play_out(game, 2))
+        game.rollback(checkpoint)
+        self.assertEqual(first, play_out(game, 1))
+
+        other_game = game.copy()
+        self.assertRaises(GameException, other_game.rollback, checkpoint)
+
+    def test_start_turn_limit(self):
+        decks = [Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+        game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 1857)
+        game.start(5)
+        self.assertFalse(game.game_ended)
+        self.assertEqual(3, game.players[0].max_mana)
+        self.assertEqual(2, game.players[1].max_mana)
+
+    def test_rollback_copy_leaves_original(self):
+        def game_state(game):
+            return json.dumps(game.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
+
+        def new_game():
+            card_names = ["Raid Leader", "Knife Juggler", "Dire Wolf Alpha", "Flesheating Ghoul", "Harvest Golem",
+                          "Arcane Missiles"]
+            decks = [Deck([card_lookup(name) for name in card_names * 5], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+            game = Game(decks, [RandomAgent(), RandomAgent()], 1857)
+            game.pre_game()
+            game.current_player = game.players[1]
+            for turn in range(0, 10):
+                game.play_single_turn()
+            return game
+
+        game = new_game()
+        untouched_game = new_game()
+        copied_game = game.copy()
+        checkpoint = copied_game.checkpoint()
+        for turn in range(0, 3):
+            game.play_single_turn()
+            untouched_game.play_single_turn()
+        before = game_state(game)
+
+        copied_game.rollback(checkpoint)
+        self.assertEqual(before, game_state(game))
+        while not game.game_ended:
+            game.play_single_turn()
+            untouched_game.play_single_turn()
+        self.assertEqual(game_state(untouched_game), game_state(game))
+
+    def test_legal_actions(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        for turn in range(0, 3):
+            game.play_single_turn()
+
+        # Two mana is enough to play any boar in hand, or to use the fireblast on either hero
+        player = game.players[0]
+        actions = game.legal_actions()
+        expected = [(ACTION_TYPE.PLAY, index, 0, -1) for index in range(0, len(player.hand))]
+        expected.extend([(ACTION_TYPE.POWER, 0), (ACTION_TYPE.POWER, 1)])
+        self.assertEqual(expected, actions)
+
+        game.apply((ACTION_TYPE.PLAY, 0, 0, -1))
+        self.assertEqual(1, len(player.minions))
+        self.assertEqual(1, player.mana)
+        expected = [(ACTION_TYPE.ATTACK, 0, 0)]
+        expected.extend([(ACTION_TYPE.PLAY, index, position, -1) for index in range(0, len(player.hand))
+                         for position in range(0, 2)])
+        self.assertEqual(expected, game.legal_actions())
+
+        game.apply((ACTION_TYPE.ATTACK, 0, 0))
+        self.assertEqual(29, game.players[1].hero.health)
+        self.assertRaises(GameException, game.apply, (ACTION_TYPE.ATTACK, 0, 0))
+        self.assertRaises(GameException, game.apply, (ACTION_TYPE.POWER, 0))
+
+        game.play_single_turn()
+        game.play_single_turn()
+        # The agent would choose the first target, but the one in the action is used instead
+        targets = player.hero.power.find_targets()
+        game.apply((ACTION_TYPE.POWER, targets.index(game.players[1].hero)))
+        self.assertEqual(28, game.players[1].hero.health)
+        self.assertEqual(30, player.hero.health)
+        self.assertIsInstance(player.agent, DoNothingAgent)
+
+    def test_target_cache(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        game.play_single_turn()
+        fireball = card_lookup("Fireball")
+        fireball.can_use(game.current_player, game)
+        self.assertEqual(2, len(fireball.targets))
+
+        worgen = card_lookup("Worgen Infiltrator")
+        worgen.summon(game.other_player, game, 0)
+        boar = card_lookup("Stonetusk Boar")
+        boar.summon(game.other_player, game, 1)
+        fireball.can_use(game.current_player, game)
+        self.assertEqual(3, len(fireball.targets))
+        self.assertNotIn(game.other_player.minions[0], fireball.targets)
+
+        game.other_player.minions[0]._remove_stealth()
+        fireball.can_use(game.current_player, game)
+        self.assertEqual(4, len(fireball.targets))
+
+        game.other_player.minions[1].die(None)
+        game.check_delayed()
+        fireball.can_use(game.current_player, game)
+        self.assertEqual(3, len(fireball.targets))
+
+        # Changing the list of targets doesn't change the remembered list
+        fireball.targets.clear()
+        fireball.can_use(game.current_player, game)
+        self.assertEqual(3, len(fireball.targets))
+
+    def test_tag_eq(self):
+        aura = AuraUntil(ChangeAttack(2), SelfSelector(), TurnEnded())
+        self.assertTrue(aura.eq(AuraUntil(ChangeAttack(2), SelfSelector(), TurnEnded())))
+        self.assertFalse(aura.eq(AuraUntil(ChangeAttack(2.0), SelfSelector(), TurnEnded())))
+        self.assertFalse(aura.eq(AuraUntil(ChangeAttack(2), SelfSelector(), TurnStarted())))
+        self.assertFalse(aura.eq(Aura(ChangeAttack(2), SelfSelector())))
+        self.assertFalse(Aura(ChangeAttack(1), MinionSelector(Adjacent())).eq(Aura(ChangeAttack(1), MinionSelector())))
+
+    def test_tag_registry(self):
+        self.assertIs(ChangeAttack, Action.registry.find("change_attack"))
+        self.assertIs(MinionSelector, Selector.registry.find("minion"))
+        self.assertIs(Give, Action.registry.find("give"))
+
+        aura = AuraUntil(MinimumHealth(1), MinionSelector(), TurnEnded())
+        loaded = AuraUntil.from_json(**json.loads(str(aura)))
+        self.assertIsInstance(loaded.action, MinimumHealth)
+        self.assertTrue(aura.eq(loaded))
+
+    def test_aura_depends_on_board(self):
+        self.assertFalse(MinionSelector().match_depends_on_board())
+        self.assertFalse(MinionSelector(None).match_depends_on_board())
+        self.assertTrue(MinionSelector(Adjacent()).match_depends_on_board())
+        self.assertTrue(SelfSelector().match_depends_on_board())
+
+    def test_card_collection(self):
+        collection = get_collection()
+        beasts = collection.find([("minion_type", MINION_TYPE.BEAST)])
+        all_beasts = [card for card in get_cards() if card.is_minion() and card.minion_type == MINION_TYPE.BEAST]
+        self.assertEqual([card.name for card in all_beasts], [card.name for card in beasts])
+        two_mana_minions = collection.find([("mana", 2), ("is_minion", True)])
+        self.assertEqual([card for card in collection.find([("mana", 2)]) if card.is_minion()], list(two_mana_minions))
+
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        card = CardQuery(conditions=[ManaCost(2), IsMinion()]).get_card(game.players[0])
+        self.assertIn(type(card), [type(minion) for minion in two_mana_minions])
+        self.assertNotIn(card, collection.cards)
+
+    def test_deck_undrawn_cards(self):
+        def undrawn(deck):
+            return [card for card in deck.cards if not card.drawn]
+
+        cards = [card_lookup(name) for name in ["Stonetusk Boar", "Arcane Intellect", "Naturalize"] * 10]
+        deck = Deck(cards, CHARACTER_CLASS.MAGE)
+        game = Game([deck, Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.DRUID)],
+                    [DoNothingAgent(), DoNothingAgent()], 1857)
+        game.random_generator = random.Random(1857)
+        expected_random = random.Random(1857)
+        for i in range(0, 10):
+            expected = undrawn(deck)[expected_random.randint(0, deck.left - 1)]
+            self.assertIs(expected, deck.draw(game))
+        self.assertEqual(undrawn(deck), deck.undrawn_cards())
+
+        # Cards taken from the deck by setting their flags, or put back, are noticed
+        taken = undrawn(deck)[3]
+        taken.drawn = True
+        deck.left -= 1
+        self.assertEqual(undrawn(deck), deck.undrawn_cards())
+        deck.put_back(taken)
+        self.assertEqual(undrawn(deck), deck.undrawn_cards())
+
+        copied = deck.copy()
+        self.assertEqual(undrawn(copied), copied.undrawn_cards())
+        copied.draw(game)
+        self.assertEqual(19, len(copied.undrawn_cards()))
+        self.assertEqual(20, len(deck.undrawn_cards()))
+
 
 class TestBinding(unittest.TestCase):
     def test_bind(self):
@@ -189,3 +461,42 @@ class TestBinding(unittest.TestCase):
         binder.trigger("test")
         event.assert_called_once_with(1, 5, 6)
         self.assertEqual(event2.call_count, 2)
+
+    def test_bind_during_trigger(self):
+        binder = Bindable()
+        calls = []
+
+        def first():
+            calls.append("first")
+            binder.unbind("test", second)
+            binder.bind("test", third)
+            binder.trigger("test")
+
+        def second():
+            calls.append("second")
+
+        def third():
+            calls.append("third")
+
+        binder.bind("test", first)
+        binder.bind("test", second)
+        binder.trigger("test")
+        # second was unbound before it was called, third was only called by the nested trigger, and first was not
+        # called again by the nested trigger because it was still running
+        self.assertEqual(["first", "third"], calls)
+        binder.unbind("test", first)
+        binder.unbind("test", third)
+        self.assertNotIn("test", binder.events)
+
+    def test_events_shared_until_bound(self):
+        event = mock.Mock()
+        binder = Bindable()
+        other_binder = Bindable()
+        self.assertIs(binder.events, other_binder.events)
+        self.assertEqual(0, len(binder.events))
+        binder.bind("test", event)
+        other_binder.trigger("test")
+        self.assertEqual(0, event.call_count)
+        self.assertEqual(0, len(other_binder.events))
+        binder.trigger("test")
+        event.assert_called_once_with()
@@ -0,0 +1,68 @@
+import io
+import unittest
+
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.game_objects import Bindable, Game, Minion
+from hearthbreaker.profiling import Profiler
+from hearthbreaker.sim import DeckList
+from hearthbreaker.tags.action import Damage
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.decks = [DeckList.from_file("example.hsdeck"), DeckList.from_file("zoo.hsdeck")]
+
+    def play_game(self):
+        game = Game([deck_list.create_deck() for deck_list in self.decks], [RandomAgent(), RandomAgent()], 12)
+        game.start()
+        return game
+
+    def test_profile_game(self):
+        expected = self.play_game()
+        with Profiler() as profiler:
+            game = self.play_game()
+
+        # Profiling doesn't change how the game is played
+        self.assertEqual([player.hero.health for player in expected.players],
+                         [player.hero.health for player in game.players])
+        self.assertEqual([len(player.deck.cards) - player.deck.left for player in expected.players],
+                         [len(player.deck.cards) - player.deck.left for player in game.players])
+
+        self.assertIn("event:turn_started", profiler.stats)
+        self.assertIn("act:Damage", profiler.stats)
+        self.assertTrue(any(label.startswith("play_card:") for label in profiler.stats))
+        self.assertTrue(any(label.startswith("attack:") for label in profiler.stats))
+        self.assertTrue(any(label.startswith("add_to_board:") for label in profiler.stats))
+        for stats in profiler.stats.values():
+            self.assertGreater(stats.calls, 0)
+            self.assertGreaterEqual(stats.total_time, stats.own_time)
+
+        # Each stack ends in a label, and the time spent in the stacks adds up to the time spent in the labels
+        self.assertAlmostEqual(sum([stats.own_time for stats in profiler.stats.values()]),
+                               sum(profiler.stacks.values()))
+        collapsed = io.StringIO()
+        profiler.write_collapsed(collapsed)
+        for line in collapsed.getvalue().splitlines():
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertIn(stack.split(";")[-1], profiler.stats)
+            self.assertGreater(int(microseconds), 0)
+
+        report = profiler.report(limit=5).splitlines()
+        self.assertEqual(6, len(report))
+        self.assertIn("label", report[0])
+
+    def test_disable(self):
+        trigger = Bindable.trigger
+        add_to_board = Minion.add_to_board
+        act = Damage.act
+        profiler = Profiler()
+        profiler.enable()
+        self.assertIsNot(trigger, Bindable.trigger)
+        self.assertRaises(RuntimeError, Profiler().enable)
+        profiler.disable()
+
+        self.assertIs(trigger, Bindable.trigger)
+        self.assertIs(add_to_board, Minion.add_to_board)
+        self.assertIs(act, Damage.act)
+        self.play_game()
+        self.assertEqual({}, profiler.stats)
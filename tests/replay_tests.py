@@ -1,14 +1,17 @@
 import json
+import os
+import tempfile
 import unittest
 from io import StringIO
 from os import listdir
 from os.path import isdir
 import re
 import random
-from hearthbreaker.game_objects import Game, Deck
+from hearthbreaker.game_objects import Game, Deck, card_lookup
 
-from hearthbreaker.replay import Replay, record, playback
+from hearthbreaker.replay import Replay, ReplayArchive, ReplayReader, record, playback
 from hearthbreaker.agents.basic_agents import PredictableAgent, RandomAgent
+from hearthbreaker.agents.mcts_agent import MCTSAgent
 from hearthbreaker.constants import CHARACTER_CLASS
 from hearthbreaker.cards import *
 import hearthbreaker.game_objects
@@ -120,6 +123,23 @@ class TestReplay(unittest.TestCase):
         self.assertTrue(dif)
         f.close()
 
+    def test_recording_applied_actions(self):
+        def game_state(game):
+            return json.dumps(game.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
+
+        card_names = ["Bloodfen Raptor", "Argent Squire", "Knife Juggler", "Dire Wolf Alpha", "Stonetusk Boar"]
+        decks = [Deck([card_lookup(name) for name in card_names * 6], CHARACTER_CLASS.MAGE) for i in range(0, 2)]
+        # The searching agent takes its actions through Game.apply, which chooses the positions of its minions
+        game = Game(decks, [MCTSAgent(iterations=5, rollout_turns=1), RandomAgent()], 1857)
+        replay = record(game)
+        game.start()
+
+        output = StringIO()
+        replay.write_json(output)
+        new_game = playback(Replay(StringIO(output.getvalue())))
+        new_game.start()
+        self.assertEqual(game_state(game), game_state(new_game))
+
     def test_option_replay(self):
         game = playback(Replay("tests/replays/stonetusk_power.hsreplay"))
         game.start()
@@ -177,6 +197,109 @@ class TestReplay(unittest.TestCase):
         new_replay.write_json(other_output)
         self.assertEqual(other_output.getvalue(), old_output)
 
+    def test_line_saving(self):
+        deck1 = hearthbreaker.game_objects.Deck([RagnarosTheFirelord() for i in range(0, 30)], CHARACTER_CLASS.MAGE)
+        deck2 = hearthbreaker.game_objects.Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.DRUID)
+        game = Game([deck1, deck2], [PlayAndAttackAgent(), OneCardPlayingAgent()], 4879)
+        replay = record(game)
+        game.start()
+
+        output = StringIO()
+        replay.write_lines(output)
+        lines = output.getvalue().split("\n")
+        self.assertEqual(len(replay._moves) + 2, len(lines))
+        self.assertEqual(4879, json.loads(lines[0])['seed'])
+
+        json_output = StringIO()
+        replay.write_json(json_output)
+        new_replay = Replay()
+        new_replay.read_lines(StringIO(output.getvalue()))
+        new_json_output = StringIO()
+        new_replay.write_json(new_json_output)
+        self.assertEqual(json_output.getvalue(), new_json_output.getvalue())
+
+        with ReplayReader(StringIO(output.getvalue())) as reader:
+            self.assertEqual(json.loads(lines[0]), reader.header)
+            moves = reader.moves()
+            self.assertEqual(replay._moves[0].to_output_string(), next(moves).to_output_string())
+            self.assertEqual(len(replay._moves) - 1, len(list(moves)))
+
+        self.assertRaises(ValueError, ReplayReader, StringIO(""))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "replay.hsreplay.gz")
+            replay.write_lines(filename)
+            with open(filename, 'rb') as compressed:
+                self.assertEqual(b"\x1f\x8b", compressed.read(2))
+            new_replay = Replay()
+            new_replay.read_lines(filename)
+
+        new_game = playback(new_replay)
+        new_game.start()
+        self.assertEqual(game.players[0].hero.health, new_game.players[0].hero.health)
+        self.assertEqual(game.players[1].hero.health, new_game.players[1].hero.health)
+
+    def test_archive(self):
+        replays = []
+        for seed in range(0, 3):
+            deck1 = Deck([RagnarosTheFirelord() for i in range(0, 30)], CHARACTER_CLASS.MAGE)
+            deck2 = Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.DRUID)
+            game = Game([deck1, deck2], [PlayAndAttackAgent(), OneCardPlayingAgent()], seed)
+            replays.append(record(game))
+            game.start()
+
+        def to_json(replay):
+            output = StringIO()
+            replay.write_json(output)
+            return output.getvalue()
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "games.hsarchive")
+            with ReplayArchive(filename) as archive:
+                self.assertEqual(0, archive.append(replays[0], ("Ragnaros", "Boars"), 0))
+                self.assertEqual(1, archive.append(replays[1], ("Boars", "Ragnaros"), None))
+                self.assertEqual(to_json(replays[1]), to_json(archive.get(1)))
+
+            with ReplayArchive(filename) as archive:
+                self.assertEqual(2, archive.append(replays[2], ("Ragnaros", "Boars"), 1))
+                self.assertEqual(3, len(archive))
+                for game_id in range(0, 3):
+                    self.assertEqual(to_json(replays[game_id]), to_json(archive.get(game_id)))
+                self.assertEqual(("Boars", "Ragnaros"), archive.deck_names(1))
+                self.assertEqual(None, archive.winner(1))
+                self.assertEqual([0, 2], archive.find(("Ragnaros", "Boars")))
+                self.assertEqual([2], archive.find(("Ragnaros", "Boars"), 1))
+                self.assertEqual([1], archive.find(winner=None))
+                self.assertEqual([], archive.find(("Boars", "Boars")))
+                self.assertEqual([0, 1, 2], archive.find())
+
+                with archive.reader(2) as reader:
+                    self.assertEqual(len(replays[2]._moves), len(list(reader.moves())))
+
+            # An archive whose last replay was only partly written can't be opened until it is repaired
+            with open(filename, "r+b") as file:
+                file.truncate(os.path.getsize(filename) - 10)
+            self.assertRaises(ValueError, ReplayArchive, filename)
+            with ReplayArchive(filename, repair=True) as archive:
+                self.assertEqual(2, len(archive))
+                self.assertEqual(to_json(replays[1]), to_json(archive.get(1)))
+            repaired_size = os.path.getsize(filename)
+            with ReplayArchive(filename) as archive:
+                self.assertEqual(2, archive.append(replays[2], ("Ragnaros", "Boars"), 1))
+                self.assertEqual(to_json(replays[2]), to_json(archive.get(2)))
+
+            # Cut off partway through the header of the last record
+            with open(filename, "r+b") as file:
+                file.truncate(repaired_size + 3)
+            self.assertRaises(ValueError, ReplayArchive, filename)
+            with ReplayArchive(filename, repair=True) as archive:
+                self.assertEqual(2, len(archive))
+
+            not_archive = os.path.join(directory, "not_archive")
+            with open(not_archive, "w") as file:
+                file.write("Not an archive")
+            self.assertRaises(ValueError, ReplayArchive, not_archive)
+
     # Due to bug #55 (thanks to dur3x)
     def test_deck_shortening(self):
         deck1 = Deck([RagnarosTheFirelord(), RagnarosTheFirelord(), RagnarosTheFirelord(), RagnarosTheFirelord(),
@@ -192,3 +315,29 @@ class TestReplay(unittest.TestCase):
         replay = record(game)
         game.start()
         replay.write(StringIO())
+
+    def test_seed_recording(self):
+        deck1 = hearthbreaker.game_objects.Deck([RagnarosTheFirelord() for i in range(0, 30)], CHARACTER_CLASS.MAGE)
+        deck2 = hearthbreaker.game_objects.Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.DRUID)
+        game = Game([deck1, deck2], [PlayAndAttackAgent(), OneCardPlayingAgent()], 4879)
+        replay = record(game)
+        game.start()
+        self.assertEqual(4879, replay.random_seed)
+
+        output = StringIO()
+        replay.write_json(output)
+        self.assertEqual(4879, json.loads(output.getvalue())['header']['seed'])
+        new_replay = Replay(StringIO(output.getvalue()))
+        self.assertEqual(4879, new_replay.random_seed)
+
+        output = StringIO()
+        replay.write(output)
+        new_replay = Replay()
+        new_replay.read(StringIO(output.getvalue()))
+        self.assertEqual(4879, new_replay.random_seed)
+
+        new_game = playback(new_replay)
+        new_game.start()
+        self.assertEqual(4879, new_game.random_seed)
+        self.assertEqual(game.players[0].hero.health, new_game.players[0].hero.health)
+        self.assertEqual(game.players[1].hero.health, new_game.players[1].hero.health)
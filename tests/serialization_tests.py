@@ -1,5 +1,9 @@
 import json
+import unittest
+from hearthbreaker.agents.basic_agents import RandomAgent
 from hearthbreaker.game_objects import Game
+from hearthbreaker.serialization import snapshot
+from hearthbreaker.sim import DeckList
 import tests.copy_tests
 
 
@@ -43,3 +47,67 @@ class TestMinionSerialization(tests.copy_tests.TestMinionCopying):
     def tearDown(self):
         super().tearDown()
         Game.copy = self._old_copy
+
+
+def _snapshot_copy(old_game):
+    game = snapshot.deserialize(snapshot.serialize(old_game), [player.agent for player in old_game.players])
+    game._has_turn_ended = old_game._has_turn_ended
+    return game
+
+
+class TestGameSnapshot(tests.copy_tests.TestGameCopying):
+    def setUp(self):
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = _snapshot_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestMinionSnapshot(tests.copy_tests.TestMinionCopying):
+    def setUp(self):
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = _snapshot_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestSnapshotFormat(unittest.TestCase):
+    def test_matches_json(self):
+        def _save_object(o):
+            return o.__to_json__()
+
+        decks = [DeckList.from_file("example.hsdeck"), DeckList.from_file("zoo.hsdeck")]
+        for seed in range(0, 5):
+            game = Game([deck.create_deck() for deck in decks], [RandomAgent(), RandomAgent()], seed)
+            game.pre_game()
+            for turn in range(0, 8):
+                game.play_single_turn()
+                if game.game_ended:
+                    break
+            data = snapshot.serialize(game)
+            game_json = json.dumps(game, default=_save_object)
+            self.assertEqual(json.loads(game_json), snapshot.decode(data))
+            self.assertLess(len(data), len(game_json) / 2)
+
+            # Sets, such as each player's graveyard, may not be saved in the same order once the game is loaded, so
+            # the game loaded from the snapshot is compared with the game loaded from JSON instead
+            agents = [player.agent for player in game.players]
+            from_snapshot = snapshot.deserialize(data, agents)
+            from_json = Game.__from_json__(json.loads(game_json), agents)
+            self.assertEqual(json.dumps(from_json, default=_save_object),
+                             json.dumps(from_snapshot, default=_save_object))
+
+    def test_values(self):
+        values = [None, True, False, 0, 1, 127, 128, -1, -129, 2 ** 70, -2 ** 70, 0.5, "", "caf\u00e9",
+                  ["a", [1, 2, {"b": [None]}], (3, 4)], {"x": {"y": "z"}, "w": ["x", "y", "z", "x", "y", "z"]},
+                  ["s{0}".format(i) for i in range(0, 300)], [{"repeated": [1, 2, 3]}] * 4]
+        for value in values:
+            self.assertEqual(json.loads(json.dumps(value)), snapshot.decode(snapshot.encode(value)))
+        self.assertRaises(ValueError, snapshot.decode, b"not a snapshot")
+        self.assertRaises(TypeError, snapshot.encode, {1: "one"})
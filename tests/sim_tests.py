@@ -0,0 +1,103 @@
+import unittest
+
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.sim import DeckList, SimulationReport, GameResult, simulate, run_simulation, play_game, \
+    wilson_interval, StoppingRule, IntervalStoppingRule, SequentialStoppingRule
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.decks = [DeckList.from_file("example.hsdeck"), DeckList.from_file("zoo.hsdeck", "Zoo")]
+
+    def test_deck_list_from_file(self):
+        self.assertEqual("example.hsdeck", self.decks[0].name)
+        self.assertEqual(30, len(self.decks[0].card_names))
+        self.assertEqual(CHARACTER_CLASS.MAGE, self.decks[0].character_class)
+        self.assertEqual("Zoo", self.decks[1].name)
+        self.assertEqual(CHARACTER_CLASS.WARLOCK, self.decks[1].character_class)
+
+        deck = self.decks[1].create_deck()
+        self.assertEqual(30, len(deck.cards))
+        self.assertEqual("Shieldbearer", deck.cards[0].name)
+        self.assertFalse(deck.cards[0].drawn)
+
+    def test_play_game(self):
+        result = play_game(3, 1234, self.decks, ["Random", "Random"])
+        self.assertEqual(3, result.game_id)
+        self.assertEqual(1234, result.seed)
+        self.assertIn(result.winner, [0, 1, None])
+        self.assertGreater(result.turns, 0)
+        self.assertEqual(result, play_game(3, 1234, self.decks, ["Random", "Random"])._replace(
+            duration=result.duration))
+
+    def test_results_independent_of_processes(self):
+        def strip_time(results):
+            return sorted([result._replace(duration=0) for result in results])
+
+        serial = strip_time(simulate(self.decks, 6, processes=1, seed=42))
+        parallel = strip_time(simulate(self.decks, 6, processes=2, seed=42))
+
+        self.assertEqual([game_id for game_id in range(6)], [result.game_id for result in serial])
+        self.assertEqual(serial, parallel)
+        self.assertNotEqual(serial, strip_time(simulate(self.decks, 6, processes=1, seed=43)))
+
+    def test_report(self):
+        results = []
+        report = run_simulation(self.decks, 5, processes=1, seed=7, callback=results.append)
+        self.assertEqual(5, report.games)
+        self.assertEqual(5, len(results))
+        self.assertEqual(7, report.seed)
+        self.assertEqual(["example.hsdeck", "Zoo"], report.deck_names)
+        self.assertEqual(5, report.wins[0] + report.wins[1] + report.draws)
+        self.assertEqual(sum([result.turns for result in results]) / 5, report.average_turns())
+
+        report = SimulationReport(["one", "two"])
+        report.add_result(GameResult(0, 0, 0, 10, 0.5))
+        report.add_result(GameResult(1, 0, 1, 20, 0.5))
+        report.add_result(GameResult(2, 0, 0, 30, 0.5))
+        report.add_result(GameResult(3, 0, None, 40, 0.5))
+        self.assertEqual(0.5, report.win_rate(0))
+        self.assertEqual(0.25, report.win_rate(1))
+        self.assertEqual(1, report.draws)
+        self.assertEqual(25, report.average_turns())
+        self.assertEqual(0.5, report.average_duration())
+
+    def test_wilson_interval(self):
+        self.assertEqual((0.0, 1.0), wilson_interval(0, 0))
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(0.4038, low, 4)
+        self.assertAlmostEqual(0.5962, high, 4)
+        self.assertEqual(0.0, wilson_interval(0, 10)[0])
+        self.assertEqual(1.0, wilson_interval(10, 10)[1])
+
+    def test_stopping_rules(self):
+        rule = SequentialStoppingRule(0.1)
+        self.assertFalse(rule.is_decided(0, 0))
+        self.assertFalse(rule.is_decided(10, 20))
+        self.assertTrue(rule.is_decided(15, 15))
+        self.assertTrue(rule.is_decided(0, 15))
+        self.assertFalse(rule.is_decided(500, 1000))
+
+        rule = IntervalStoppingRule(0.2)
+        self.assertFalse(rule.is_decided(0, 0))
+        self.assertFalse(rule.is_decided(50, 90))
+        self.assertTrue(rule.is_decided(50, 100))
+        self.assertTrue(rule.is_decided(30, 30))
+
+        self.assertRaises(TypeError, StoppingRule)
+
+    def test_stop_early(self):
+        def strip_time(results):
+            return [result._replace(duration=0) for result in results]
+
+        rule = IntervalStoppingRule(0.7)
+        serial = strip_time(simulate(self.decks, 50, processes=1, seed=42, stopping_rule=rule))
+        parallel = strip_time(simulate(self.decks, 50, processes=2, seed=42, stopping_rule=rule))
+
+        self.assertLess(len(serial), 50)
+        self.assertEqual([game_id for game_id in range(len(serial))], [result.game_id for result in serial])
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial, strip_time(simulate(self.decks, len(serial), processes=1, seed=42)))
+
+        report = run_simulation(self.decks, 50, processes=1, seed=42, stopping_rule=rule)
+        self.assertEqual(len(serial), report.games)
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hearthbreaker.sim import IntervalStoppingRule
+from hearthbreaker.tournament import load_decks, run_tournament, play_matchup, read_checkpoint, TournamentReport, \
+    MatchupResult
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for filename in ["example.hsdeck", "zoo.hsdeck"]:
+            shutil.copy(filename, self.directory)
+        shutil.copy("zoo.hsdeck", os.path.join(self.directory, "zoo2.hsdeck"))
+        with open(os.path.join(self.directory, "notes.txt"), "w") as notes:
+            notes.write("Not a deck")
+        self.decks = load_decks(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load_decks(self):
+        self.assertEqual(["example", "zoo", "zoo2"], [deck.name for deck in self.decks])
+
+    def test_play_matchup(self):
+        result = play_matchup(self.decks[0:2], 4, 42)
+        self.assertEqual(("example", "zoo"), result.decks)
+        self.assertEqual(4, result.games)
+        self.assertEqual(4, sum(result.wins) + result.draws)
+        self.assertEqual(result, play_matchup(self.decks[0:2], 4, 42)._replace(duration=result.duration))
+
+    def test_tournament(self):
+        checkpoint = os.path.join(self.directory, "checkpoint.jsonl")
+        played = []
+        report = run_tournament(self.decks, 2, processes=1, seed=7, checkpoint=checkpoint, callback=played.append)
+        self.assertEqual(6, len(played))
+        self.assertEqual(6, len(report.results))
+        wins, games = report.record("example", "zoo")
+        self.assertEqual(4, games)
+        self.assertEqual(wins / games, report.win_rate("example", "zoo"))
+        low, high = report.interval("example", "zoo")
+        self.assertTrue(0 <= low <= report.win_rate("example", "zoo") <= high <= 1)
+
+        # A second run with the same checkpoint resumes without playing anything, and picks up the seed
+        played = []
+        resumed = run_tournament(self.decks, 2, processes=1, checkpoint=checkpoint, callback=played.append)
+        self.assertEqual([], played)
+        self.assertEqual(7, resumed.seed)
+        self.assertEqual(sorted(report.results.items()), sorted(resumed.results.items()))
+
+        # A matchup which was being written when the run was stopped is played again, on a line of its own
+        with open(checkpoint, "r+b") as checkpoint_file:
+            data = checkpoint_file.read()
+            checkpoint_file.truncate(len(data) - 20)
+        self.assertEqual(5, len(read_checkpoint(checkpoint, 7, 2, ["Random", "Random"])[1]))
+        played = []
+        resumed = run_tournament(self.decks, 2, processes=1, checkpoint=checkpoint, callback=played.append)
+        self.assertEqual([report.results[played[0].decks]._replace(duration=0)], [played[0]._replace(duration=0)])
+        self.assertEqual(sorted(report.results), sorted(resumed.results))
+        self.assertEqual(6, len(read_checkpoint(checkpoint, 7, 2, ["Random", "Random"])[1]))
+
+        # Matchups played with different settings are not resumed, and the results don't depend on the workers
+        self.assertEqual((7, []), read_checkpoint(checkpoint, 7, 3, ["Random", "Random"]))
+        parallel = run_tournament(self.decks, 2, processes=2, seed=7)
+
+        def strip_time(results):
+            return sorted([(decks, result._replace(duration=0)) for decks, result in results.items()])
+
+        self.assertEqual(strip_time(report.results), strip_time(parallel.results))
+
+    def test_stop_early(self):
+        def strip_time(results):
+            return sorted([(decks, result._replace(duration=0)) for decks, result in results.items()])
+
+        checkpoint = os.path.join(self.directory, "checkpoint.jsonl")
+        rule = IntervalStoppingRule(0.7)
+        report = run_tournament(self.decks, 40, processes=1, seed=7, checkpoint=checkpoint, stopping_rule=rule,
+                                batch_size=2)
+        self.assertEqual(6, len(report.results))
+        for result in report.results.values():
+            self.assertLess(result.games, 40)
+            self.assertEqual(0, result.games % 2)
+            self.assertEqual(result._replace(duration=0), play_matchup(
+                [deck for name in result.decks for deck in self.decks if deck.name == name], result.games, 7)._replace(
+                duration=0))
+
+        parallel = run_tournament(self.decks, 40, processes=2, seed=7, stopping_rule=rule, batch_size=2)
+        self.assertEqual(strip_time(report.results), strip_time(parallel.results))
+
+        # The checkpoint is only resumed with the same stopping rule
+        self.assertEqual(6, len(read_checkpoint(checkpoint, 7, 40, ["Random", "Random"], rule)[1]))
+        self.assertEqual([], read_checkpoint(checkpoint, 7, 40, ["Random", "Random"])[1])
+        self.assertEqual([], read_checkpoint(checkpoint, 7, 40, ["Random", "Random"], IntervalStoppingRule(0.5))[1])
+
+    def test_report(self):
+        report = TournamentReport(["a", "b"], 1)
+        report.add_result(MatchupResult(("a", "b"), 10, (6, 3), 1, 100, 1.0))
+        report.add_result(MatchupResult(("b", "a"), 10, (2, 8), 0, 100, 1.0))
+        self.assertEqual((14, 20), report.record("a", "b"))
+        self.assertEqual((5, 20), report.record("b", "a"))
+        self.assertIn("70.0%", str(report))
@@ -0,0 +1,40 @@
+import unittest
+
+from hearthbreaker.replay import Replay, playback
+from hearthbreaker.verify import record_checksums, check_replays, verify_replay, final_state, state_checksum
+
+
+class TestVerify(unittest.TestCase):
+    def setUp(self):
+        self.filenames = ["tests/replays/example.hsreplay", "tests/replays/stonetusk_power.hsreplay",
+                          "tests/replays/card_tests/Shadowform.hsreplay"]
+
+    def test_final_state(self):
+        game = playback(Replay("tests/replays/stonetusk_power.hsreplay"))
+        game.start()
+        state = final_state(game)
+        self.assertEqual(2, len(state["players"]))
+        self.assertIn(["Panther", 4, 3], state["players"][1]["minions"] + state["players"][0]["minions"])
+        self.assertEqual(40, len(state_checksum(game)))
+
+    def test_record_and_check(self):
+        results = []
+        checksums = record_checksums(self.filenames + ["tests/replays/missing.hsreplay"], 1, results.append)
+        self.assertEqual(sorted(self.filenames), sorted(checksums))
+        self.assertEqual(4, len(results))
+        self.assertIn("FileNotFoundError", [result for result in results if result.actual is None][0].error)
+
+        for processes in [1, 2]:
+            results = list(check_replays(checksums, processes))
+            self.assertEqual(sorted(self.filenames), sorted([result.filename for result in results]))
+            self.assertTrue(all([result.matched for result in results]))
+
+        checksums[self.filenames[0]] = "0" * 40
+        mismatched = [result.filename for result in check_replays(checksums, 1) if not result.matched]
+        self.assertEqual([self.filenames[0]], mismatched)
+
+    def test_verify_replay(self):
+        result = verify_replay("tests/replays/example.hsreplay", None)
+        self.assertFalse(result.matched)
+        self.assertIsNone(result.error)
+        self.assertTrue(verify_replay(result.filename, result.actual).matched)
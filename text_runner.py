@@ -54,6 +54,9 @@ def render_game(stdscr):
             curses.init_pair(5, curses.COLOR_WHITE, curses.COLOR_CYAN)
             curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_GREEN)
 
+        def set_game(self, game):
+            pass
+
         def do_turn(self, player):
             renderer.draw_game()
             index = 0